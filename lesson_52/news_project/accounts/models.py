@@ -8,6 +8,8 @@ class Profile(models.Model):
   location = models.CharField(max_length=30, blank=True)
   birth_date = models.DateField(null=True, blank=True)
   avatar = models.ImageField(upload_to='profile_photos/', null=True, blank=True)
+  # Avatarning kichraytirilgan nusxalari (news_app/images.py)
+  avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
 
 
   def __str__(self):
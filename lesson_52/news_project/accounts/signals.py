@@ -16,4 +16,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     # Profil mavjud bo'lsa saqlaydi, aks holda xato bermaydi
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+@receiver(post_save, sender=Profile)
+def build_avatar_variants(sender, instance, **kwargs):
+    # Avatar o'zgargan bo'lsa kichik nusxalari fonda yaratiladi
+    from news_app.images import schedule_variants
+    schedule_variants(instance)
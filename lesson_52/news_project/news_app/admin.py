@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import News, Category, Contact, Comment
+from .models import News, Category, Contact, Comment, TranslationJob, TranslationMemory, PopularNews
+from .comments import refresh_comment_counts
+from .page_cache import bump_content_version
 
 # Register your models here.
 @admin.register(News)
@@ -27,20 +29,66 @@ class ContactAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ("author", "short_text", "created_at", "active")
+    list_select_related = ("author",)
     list_filter = ("active", "created_at", "author")
     search_fields = ("author__username", "text", "news__title")
-    actions = ["approve_comments", "disapprove_comments"]
+    actions = ["approve_comments", "disapprove_comments", "delete_as_spam"]
+
+    def _moderate(self, queryset, **changes):
+        """Bulk moderatsiya: bitta UPDATE, keyin izohlar soni va sahifa keshi yangilanadi."""
+        news_ids = set(queryset.values_list("news_id", flat=True))
+        if changes:
+            count = queryset.update(**changes)
+        else:
+            count, _ = queryset.delete()
+        # update()/delete() signallarni chaqirmaydi (yoki har qator uchun chaqiradi)
+        refresh_comment_counts(news_ids)
+        bump_content_version()
+        return count
 
     def approve_comments(self, request, queryset):
-        queryset.update(active=True)
+        count = self._moderate(queryset, active=True)
+        self.message_user(request, f"{count} ta izoh tasdiqlandi")
     approve_comments.short_description = "Approve selected comments"
 
     def disapprove_comments(self, request, queryset):
-        queryset.update(active=False)
+        count = self._moderate(queryset, active=False)
+        self.message_user(request, f"{count} ta izoh yashirildi")
     disapprove_comments.short_description = "Disapprove selected comments"
 
+    def delete_as_spam(self, request, queryset):
+        count = self._moderate(queryset)
+        self.message_user(request, f"{count} ta spam izoh o'chirildi")
+    delete_as_spam.short_description = "Delete selected comments as spam"
+
     def short_text(self, obj):
         return obj.text[:50]  # faqat birinchi 50 ta belgini chiqaradi
     short_text.short_description = "Comment"
 
-    
+
+@admin.register(TranslationJob)
+class TranslationJobAdmin(admin.ModelAdmin):
+    list_display = ("model", "object_id", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status", "model")
+    readonly_fields = ("created_at", "updated_at")
+    ordering = ("-created_at",)
+
+
+@admin.register(TranslationMemory)
+class TranslationMemoryAdmin(admin.ModelAdmin):
+    list_display = ("source_lang", "target_lang", "short_source", "hits", "created_at")
+    list_filter = ("source_lang", "target_lang")
+    search_fields = ("source_text", "translated_text")
+    ordering = ("-hits",)
+
+    def short_source(self, obj):
+        return obj.source_text[:60]
+    short_source.short_description = "Segment"
+
+
+@admin.register(PopularNews)
+class PopularNewsAdmin(admin.ModelAdmin):
+    list_display = ("news", "category", "score", "computed_at")
+    list_filter = ("category",)
+    list_select_related = ("news", "category")
+    ordering = ("-score",)
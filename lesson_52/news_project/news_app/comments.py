@@ -0,0 +1,224 @@
+"""
+Detail sahifadagi izohlar.
+
+Avval SinglePageView barcha faol izohlarni (har biri uchun author so'rovi
+bilan) render qilardi. Endi sahifada faqat birinchi PAGE_SIZE ta izoh
+chiqadi, qolganlari JSON endpoint orqali cursor bilan yuklanadi. Izohlar
+soni News.comment_count da saqlanadi va signallar orqali yangilanadi.
+
+Yangi izohlar (submit_comment):
+  - forma to'g'ri bo'lgandan keyin foydalanuvchi va IP bo'yicha cheklanadi
+    (kesh orqali, atomik add/incr);
+  - shubhali matn (spam.needs_moderation) active=False bilan moderatsiyaga tushadi;
+  - PendingComment navbatiga bitta kichik INSERT bilan yoziladi (signal,
+    izohlar sonini qayta sanash va kesh versiyasi yo'q). Navbat bazada -
+    restart/OOM da yo'qolmaydi va istalgan process uni bo'shata oladi;
+  - CommentQueue har NEWS_COMMENT_FLUSH_INTERVAL soniyada (fon oqimi yoki
+    `manage.py flush_comments`) navbatni bitta bulk_create bilan Comment ga
+    ko'chiradi, keyin izohlar soni va sahifa keshini bir marta yangilaydi.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Comment, News, PendingComment
+from .page_cache import bump_content_version
+from .pagination import CursorPaginator
+from .spam import needs_moderation
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 20
+COMMENT_ORDERING = ('created_at', 'id')
+
+# (tokenlar soni, necha soniyada to'ladi)
+USER_RATE = getattr(settings, 'NEWS_COMMENT_USER_RATE', (5, 60))
+IP_RATE = getattr(settings, 'NEWS_COMMENT_IP_RATE', (20, 60))
+# 0 - fon oqimi yo'q, navbatni faqat flush_comments buyrug'i bo'shatadi
+FLUSH_INTERVAL = getattr(settings, 'NEWS_COMMENT_FLUSH_INTERVAL', 2)
+FLUSH_BATCH = 500
+
+
+def active_comments(news):
+    return Comment.objects.filter(news=news, active=True).select_related('author')
+
+
+def comment_page(news, cursor=None, size=PAGE_SIZE):
+    """Faol izohlarning bitta sahifasi (created_at, id bo'yicha keyset)."""
+    return CursorPaginator(active_comments(news), size, COMMENT_ORDERING).page(cursor)
+
+
+def refresh_comment_counts(news_ids):
+    """Berilgan yangiliklarning comment_count ini bitta UPDATE bilan qayta hisoblaydi."""
+    news_ids = list(news_ids)
+    if not news_ids:
+        return
+    active = (
+        Comment.objects.filter(news=OuterRef('pk'), active=True)
+        .order_by()
+        .values('news')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    News.objects.filter(pk__in=news_ids).update(
+        comment_count=Coalesce(Subquery(active, output_field=IntegerField()), Value(0))
+    )
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.pk,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+class TokenBucket:
+    """
+    Kesh asosidagi cheklov: har `period` soniyalik oynada `capacity` ta token.
+    Hisoblagich cache.add + cache.incr bilan atomik oshiriladi - barcha
+    processlar uchun umumiy va parallel so'rovlar chegaradan o'tib ketmaydi.
+    """
+
+    def __init__(self, prefix, capacity, period):
+        self.prefix = prefix
+        self.capacity = capacity
+        self.period = period
+
+    def cache_key(self, key):
+        window = int(time.time() // self.period)
+        return f'news:ratelimit:{self.prefix}:{key}:{window}'
+
+    def allow(self, key, cost=1):
+        cache_key = self.cache_key(key)
+        cache.add(cache_key, 0, self.period + 1)
+        try:
+            used = cache.incr(cache_key, cost)
+        except ValueError:
+            # add va incr orasida kalit o'chib ketgan (culling)
+            cache.add(cache_key, cost, self.period + 1)
+            used = cost
+        if used > self.capacity:
+            # Rad etilgan urinish tokenni yemaydi
+            self.refund(key, cost)
+            return False
+        return True
+
+    def refund(self, key, cost=1):
+        try:
+            cache.decr(self.cache_key(key), cost)
+        except ValueError:
+            pass
+
+
+user_bucket = TokenBucket('comment:user', *USER_RATE)
+ip_bucket = TokenBucket('comment:ip', *IP_RATE)
+
+
+def comment_allowed(request):
+    """
+    Foydalanuvchi va IP chegaralari; ikkalasi ham token bersagina True.
+    Forma tekshirilgandan keyin chaqiriladi; IP rad etsa foydalanuvchi tokeni qaytariladi.
+    """
+    ip = request.META.get('REMOTE_ADDR', '')
+    if not user_bucket.allow(request.user.pk):
+        return False
+    if not ip_bucket.allow(ip):
+        user_bucket.refund(request.user.pk)
+        return False
+    return True
+
+
+class CommentQueue:
+    """PendingComment navbatini Comment jadvaliga to'plab ko'chiradi."""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        self._used = False
+
+    def add(self, news, user, text, active):
+        PendingComment.objects.create(news=news, author=user, text=text, active=active)
+        self._used = True
+        if self.flush_interval:
+            self._ensure_worker()
+
+    def _ensure_worker(self):
+        with self._lock:
+            # fork'dan keyin (gunicorn --preload) oqim bola processga o'tmaydi
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='news-comment-queue', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # Navbat bazada qoladi - keyingi safar qayta urinamiz
+                logger.exception("Izohlar navbatini yozib bo'lmadi")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Navbatni bo'shatadi, ko'chirilgan izohlar sonini qaytaradi."""
+        total = 0
+        while True:
+            moved = self._flush_batch()
+            total += moved
+            if moved < self.batch_size:
+                return total
+
+    def _flush_batch(self):
+        with transaction.atomic():
+            pending = PendingComment.objects.order_by('pk')
+            if connection.features.has_select_for_update_skip_locked:
+                # Bir nechta process bir xil izohni ko'chirmasligi uchun
+                pending = pending.select_for_update(skip_locked=True)
+            rows = list(pending[:self.batch_size])
+            if not rows:
+                return 0
+            Comment.objects.bulk_create([
+                Comment(news_id=row.news_id, author_id=row.author_id, text=row.text, active=row.active)
+                for row in rows
+            ])
+            PendingComment.objects.filter(pk__in=[row.pk for row in rows]).delete()
+            # bulk_create signallarni chaqirmaydi: son va kesh bir marta yangilanadi
+            refresh_comment_counts({row.news_id for row in rows if row.active})
+            bump_content_version()
+        return len(rows)
+
+
+    def flush_at_exit(self):
+        # Faqat izoh qabul qilgan processlar (migrate kabi buyruqlar jadvalga tegmaydi)
+        if self._used:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Izohlar navbatini yozib bo'lmadi")
+
+
+comment_queue = CommentQueue()
+atexit.register(comment_queue.flush_at_exit)
+
+
+def submit_comment(news, user, text):
+    """Izohni moderatsiya navbatiga qo'yadi; True - ko'chirilganda ko'rinadi, False - moderatsiyada."""
+    active = not needs_moderation(text)
+    comment_queue.add(news, user, text, active)
+    return active
@@ -0,0 +1,120 @@
+"""
+Shartli GET (ETag / Last-Modified) - 304 javobi shablon render qilinmasdan.
+
+Validatorlar bitta aggregate so'rov bilan hisoblanadi:
+
+  - detail: yangilikning updated_at, comment_count va eng oxirgi izoh vaqti;
+  - ro'yxatlar: validator kontent versiyasining o'zi (News saqlanganda/
+    o'chirilganda oshadi), Last-Modified esa har versiyada bir marta
+    indeks bo'yicha LIMIT 1 bilan olinib keshlanadi - har GET da jadval
+    skan qilinmaydi.
+
+ETag ga yana quyidagilar qo'shiladi (bazaga so'rovsiz, keshdan):
+kontent versiyasi (kategoriya, izoh moderatsiyasi, yon panellardagi
+ro'yxatlar), ommabop yangiliklar versiyasi, til, URL (sahifa/cursor) va
+foydalanuvchi (login qilganlarning sahifasi boshqacha; qobiq sahifa esa
+hamma uchun bir xil). Ko'rishlar soni ETag ga kirmaydi - aks holda har
+ko'rishda 304 imkonsiz bo'lardi.
+
+Javobga Cache-Control: no-cache qo'yiladi: brauzer sahifani saqlaydi, lekin
+har safar tekshiradi - shuning uchun 304 da ham ko'rish hisoblanadi
+(not_modified() hook). Qobiq sahifalarning kesh sarlavhalarini
+page_shell.PageShellMiddleware qo'yadi.
+"""
+import hashlib
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .page_cache import get_content_version
+from .page_shell import is_page_shell
+from .snapshots import is_snapshot_request
+
+LAST_MODIFIED_KEY = 'news:published_last_modified'
+
+
+def published_last_modified():
+    """Chop etilgan yangiliklarning eng so'nggi updated_at (kontent versiyasi bo'yicha keshlangan)."""
+    from .models import News
+
+    version = get_content_version()
+    cached = cache.get(LAST_MODIFIED_KEY, version=version)
+    if cached is None:
+        # (status, -updated_at) indeksi: ORDER BY updated_at DESC LIMIT 1
+        latest = News.published.order_by('-updated_at').values_list('updated_at', flat=True).first()
+        cached = (latest,)
+        cache.set(LAST_MODIFIED_KEY, cached, None, version=version)
+    return cached[0]
+
+
+class ConditionalGetMixin:
+    """
+    View'lar get_validator_state() ni qaytaradi: (state, last_modified) yoki
+    None (obyekt topilmadi - odatdagi 404 yo'li).
+    """
+
+    def get_validator_state(self):
+        raise NotImplementedError
+
+    def get_etag(self, state):
+        from .trending import get_popular_version
+
+        parts = [
+            translation.get_language(),
+            self.request.get_full_path(),
+            self.get_etag_user(),
+            str(get_content_version()),
+            str(get_popular_version()),
+            repr(state),
+        ]
+        return '"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def get_etag_user(self):
+        if is_page_shell(self.request):
+            # Sessiyaga tegilmaydi - javob hamma uchun bir xil
+            return 'shell'
+        user = self.request.user
+        return f'{user.pk}:{int(user.is_staff)}' if user.is_authenticated else 'anon'
+
+    def not_modified(self, request, response):
+        """304 qaytishidan oldin: view'ning yon ta'sirlari (masalan ko'rishlar)."""
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or is_snapshot_request(request)
+            # Navbatdagi xabarlar sahifada bir marta ko'rsatilishi kerak (qobiqda ular JS orqali)
+            or (not is_page_shell(request) and len(messages.get_messages(request)))
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        # dispatch() dan oldin kwargs hali o'rnatilmagan
+        self.args, self.kwargs = args, kwargs
+        validators = self.get_validator_state()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        state, last_modified = validators
+        etag = self.get_etag(state)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            response = self.not_modified(request, response)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers.setdefault('ETag', etag)
+                if timestamp:
+                    response.headers.setdefault('Last-Modified', http_date(timestamp))
+        if is_page_shell(request):
+            # Kesh sarlavhalari PageShellMiddleware da
+            return response
+        if request.user.is_authenticated:
+            patch_cache_control(response, no_cache=True, private=True)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -1,11 +1,15 @@
-from .models import News, Category
+from .front_page import get_latest_news, get_categories
+from .page_shell import is_page_shell
 
 def latest_news(request):
-    latest_news = News.published.order_by('-published_at')[:10]
-    categories = Category.objects.all()
+    # View allaqachon hisoblagan bo'lsa (masalan bosh sahifa) o'sha natija qaytariladi
+    latest_news = get_latest_news(request)
+    categories = get_categories(request)
 
     context = {
         'latest_news': latest_news,
         'categories': categories,
+        # Qobiq sahifa: foydalanuvchiga xos qismlar, CSRF token va ko'rish beacon'i JS orqali
+        'page_shell': is_page_shell(request),
     }
     return context
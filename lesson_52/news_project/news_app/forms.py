@@ -1,5 +1,6 @@
 from django import forms
 from .models import Contact, News, Comment
+from .spam import contains_spam, is_blocked_email
 
 class ContactForm(forms.ModelForm):
 
@@ -37,13 +38,13 @@ class ContactForm(forms.ModelForm):
   
   def clean_email(self):
     email = self.cleaned_data.get('email')
-    if email and email.split('@')[1].lower() in ['spam.com', 'fake.com']:
+    if email and is_blocked_email(email):
         raise forms.ValidationError('Emails from this domain are not allowed.')
     return email
   
   def clean_message(self):
     message = self.cleaned_data.get('message')
-    if 'spam' in message.lower():
+    if contains_spam(message):
       raise forms.ValidationError('Message contains inappropriate content.')
     return message
   
@@ -89,4 +90,11 @@ class CommentForm(forms.ModelForm):
     }
     labels = {
             "text": "Izoh qoldirish"
-        }
\ No newline at end of file
+        }
+
+  def clean_text(self):
+    # ContactForm.clean_message bilan bir xil spam qoidalari (spam.py)
+    text = self.cleaned_data.get('text')
+    if contains_spam(text):
+      raise forms.ValidationError("Izohda taqiqlangan so'zlar bor.")
+    return text
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Bosh sahifa uchun yagona "front page" yuklovchi.
+
+Avval HomePageView har bir bo'lim (Mahalliy, Xorij, Sport, Texnologiya,
+slider, so'nggi yangiliklar) uchun alohida so'rov yuborardi, context processor
+esa latest_news va categories ni yana qayta hisoblardi. Endi barcha bo'limlar
+bitta so'rov bilan olinadi va natija request ichida context processor bilan
+bo'lishiladi.
+
+Kategoriyalar va so'nggi yangiliklar (base.html uchun) request_memo orqali
+lazy hisoblanadi: view ham, context processor ham bir xil obyektni oladi va
+shablon ularni ishlatmasa so'rov yuborilmaydi.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import translation
+from django.utils.functional import SimpleLazyObject
+
+from .models import News, Category
+from .page_cache import get_content_version
+
+# context kaliti -> kategoriya nomi (katta-kichik harf farqlanmaydi)
+FRONT_PAGE_SECTIONS = {
+    'local_news': 'Mahalliy',
+    'xorij_news': 'Xorij',
+    'sport': 'Sport',
+    'texnologiya': 'Texnologiya',
+}
+
+SECTION_SIZE = 5   # har bir kategoriya bo'limidagi yangiliklar soni
+SLIDER_SIZE = 6    # slider (news_list) uchun
+LATEST_SIZE = 10   # "So'nggi yangiliklar" ticker uchun
+
+# Kategoriyalar va so'nggi yangiliklar requestlar orasida ham keshlanadi;
+# News/Category o'zgarganda kontent versiyasi oshadi va kesh eskiradi
+CONTEXT_CACHE_TIMEOUT = getattr(settings, 'NEWS_CONTEXT_CACHE_TIMEOUT', 60 * 10)
+
+
+def request_memo(request, name, factory):
+    """
+    Request ichida bitta lazy qiymat: factory faqat shablon (yoki view)
+    uni birinchi marta ishlatganda chaqiriladi, keyin shu request da qayta
+    ishlatiladi. View va context processor bir xil obyektni oladi.
+    """
+    if request is None:
+        return SimpleLazyObject(factory)
+    memo = request.__dict__.setdefault('_news_memo', {})
+    if name not in memo:
+        memo[name] = SimpleLazyObject(factory)
+    return memo[name]
+
+
+def cached_list(name, build):
+    """Tilga bog'liq ro'yxatni kontent versiyasi bilan keshlaydi."""
+    key = f'news:context:{name}:{translation.get_language() or settings.LANGUAGE_CODE}'
+    version = get_content_version()
+    items = cache.get(key, version=version)
+    if items is None:
+        items = list(build())
+        cache.set(key, items, CONTEXT_CACHE_TIMEOUT, version=version)
+    return items
+
+
+def get_categories(request=None):
+    """Kategoriyalar ro'yxati - request ichida bir marta, shablon ishlatsagina."""
+    return request_memo(request, 'categories', lambda: cached_list('categories', Category.objects.translated))
+
+
+def get_latest_news(request=None):
+    """
+    So'nggi yangiliklar (ticker). Shablon uni ishlatmasa (admin, ro'yxatdan
+    o'tish sahifalari) so'rov umuman bajarilmaydi.
+    """
+    return request_memo(request, 'latest_news', lambda: cached_list(
+        'latest_news',
+        lambda: News.published.cards().order_by('-published_at')[:LATEST_SIZE],
+    ))
+
+
+def get_recent_news(request, size):
+    """So'nggi yangiliklarning birinchi `size` tasi (sidebar) - qo'shimcha so'rovsiz."""
+    latest = get_latest_news(request)
+    return SimpleLazyObject(lambda: list(latest)[:size])
+
+
+def load_front_page(request=None):
+    """
+    Bosh sahifaning barcha bo'limlarini bitta so'rov bilan yuklaydi.
+
+    Har bir bo'lim uchun alohida LIMIT li subquery (indeks bo'yicha, jadval
+    skan qilinmaydi) nomzod id larni beradi:
+      - har bir kategoriya bo'limi: (category, status, -published_at, -id);
+      - so'nggi yangiliklar: (status, -published_at, -id);
+      - slider: (status, -created_at, -id).
+    Tashqi so'rov faqat shu ~36 qatorni oladi, bo'limlarga ajratish va
+    saralash Python da. (Avvalgi ROW_NUMBER so'rovi butun jadvalni skan
+    qilib, vaqtinchalik B-tree da saralardi.)
+    """
+    memo = request.__dict__.setdefault('_news_memo', {}) if request is not None else {}
+    if 'front_page' in memo:
+        return memo['front_page']
+
+    # Kategoriyalar keshdan (base.html ham ularni ishlatadi)
+    category_ids = {category.name.lower(): category.pk for category in get_categories(request)}
+    sections = {
+        key: category_ids.get(name.lower()) for key, name in FRONT_PAGE_SECTIONS.items()
+    }
+
+    by_published = News.published.order_by('-published_at', '-id').values('pk')
+    candidates = (
+        Q(pk__in=by_published[:LATEST_SIZE])
+        | Q(pk__in=News.published.order_by('-created_at', '-id').values('pk')[:SLIDER_SIZE])
+    )
+    for category_id in filter(None, sections.values()):
+        candidates |= Q(pk__in=by_published.filter(category_id=category_id)[:SECTION_SIZE])
+    rows = list(News.published.cards().filter(candidates))
+
+    rows.sort(key=lambda item: (item.published_at, item.pk), reverse=True)
+    front_page = {
+        key: [item for item in rows if category_id and item.category_id == category_id][:SECTION_SIZE]
+        for key, category_id in sections.items()
+    }
+    latest_news = rows[:LATEST_SIZE]
+    front_page['news_list'] = sorted(rows, key=lambda item: (item.created_at, item.pk), reverse=True)[:SLIDER_SIZE]
+    front_page['latest_news'] = latest_news
+
+    memo['front_page'] = front_page
+    # context processor shu ro'yxatdan foydalanadi, qayta so'rov yubormaydi
+    memo['latest_news'] = latest_news
+    return front_page
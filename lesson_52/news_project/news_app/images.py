@@ -0,0 +1,146 @@
+"""
+Rasmlarning kichraytirilgan nusxalari (responsive images).
+
+Avval News.image va Profile.avatar asl o'lchamda yuborilardi - bosh sahifa
+kichik kartochkalar uchun bir necha MB yuklardi. Endi rasm yuklanganda
+fonda WIDTHS kengliklarida WebP, AVIF (Pillow qo'llasa) va JPEG nusxalar
+yaratiladi. Fayl nomi asl faylning sha1 hashidan olinadi:
+
+    derivatives/<hash>/<kenglik>.<format>
+
+shuning uchun bir xil rasm qayta ishlanmaydi va nusxalarni abadiy keshlash
+mumkin. Natija modelning JSON maydoniga yoziladi (News.image_variants,
+Profile.avatar_variants), shablonda {% responsive_image %} tegi srcset chiqaradi.
+"""
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 1024)
+DERIVATIVES_DIR = 'derivatives'
+IMAGE_ASYNC = getattr(settings, 'NEWS_IMAGE_ASYNC', True)
+
+# format -> (fayl kengaytmasi, Pillow saqlash parametrlari); tartib - <source> tartibi
+FORMATS = {
+    'avif': ('avif', {'quality': 60}),
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Qaysi model maydonlari qayta ishlanadi: model -> (rasm maydoni, variants maydoni)
+IMAGE_FIELDS = {
+    'news_app.news': ('image', 'image_variants'),
+    'accounts.profile': ('avatar', 'avatar_variants'),
+}
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='news-images')
+
+
+def available_formats():
+    return [name for name in FORMATS if name == 'jpeg' or features.check(name)]
+
+
+def flatten(image):
+    """JPEG uchun: shaffof fonni oq rangga aylantiradi."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_variants(field_file):
+    """
+    Asl rasmdan barcha nusxalarni yaratadi (mavjudlari qayta yozilmaydi) va
+    variants lug'atini qaytaradi.
+    """
+    with field_file.open('rb') as source:
+        data = source.read()
+    digest = hashlib.sha1(data).hexdigest()[:20]
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image.load()
+    # Asl rasmdan kattaroq nusxa yaratilmaydi
+    widths = [width for width in WIDTHS if width < image.width] or [image.width]
+
+    variants = {'source': field_file.name, 'hash': digest, 'width': image.width, 'formats': {}}
+    for name in available_formats():
+        extension, options = FORMATS[name]
+        base = image if name != 'jpeg' else flatten(image)
+        paths = {}
+        for width in widths:
+            path = f'{DERIVATIVES_DIR}/{digest}/{width}.{extension}'
+            if not default_storage.exists(path):
+                resized = base.copy()
+                resized.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                resized.save(buffer, format=name.upper(), **options)
+                default_storage.save(path, ContentFile(buffer.getvalue()))
+            paths[str(width)] = path
+        variants['formats'][name] = paths
+    return variants
+
+
+def needs_variants(instance, image_field, variants_field):
+    field_file = getattr(instance, image_field)
+    variants = getattr(instance, variants_field) or {}
+    if not field_file:
+        return bool(variants)
+    return variants.get('source') != field_file.name
+
+
+def process_instance(label, pk, force=False, bump=True):
+    """Bitta obyekt uchun nusxalarni yaratib, variants maydonini update() bilan yozadi."""
+    model = apps.get_model(label)
+    image_field, variants_field = IMAGE_FIELDS[label]
+    instance = model.objects.filter(pk=pk).only('pk', image_field, variants_field).first()
+    if instance is None or not (force or needs_variants(instance, image_field, variants_field)):
+        return False
+
+    field_file = getattr(instance, image_field)
+    variants = generate_variants(field_file) if field_file else {}
+    # update() - post_save signali qayta ishga tushmasligi uchun
+    model.objects.filter(pk=pk).update(**{variants_field: variants})
+    if label == 'news_app.news' and bump:
+        # Keshdagi sahifalar yangi srcset bilan qayta render qilinsin
+        from .page_cache import bump_content_version
+
+        bump_content_version()
+    return True
+
+
+def _run(label, pk):
+    try:
+        process_instance(label, pk)
+    except Exception:
+        logger.exception('Rasm nusxalarini yaratib bo\'lmadi: %s #%s', label, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance):
+    """post_save dan: rasm o'zgargan bo'lsa, tranzaksiyadan keyin fonda qayta ishlaydi."""
+    label = instance._meta.label_lower
+    image_field, variants_field = IMAGE_FIELDS[label]
+    if not needs_variants(instance, image_field, variants_field):
+        return
+    if IMAGE_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(_run, label, instance.pk))
+    else:
+        transaction.on_commit(lambda: process_instance(label, instance.pk))
+
+
+def srcset(variants, name):
+    paths = (variants or {}).get('formats', {}).get(name) or {}
+    return ', '.join(f'{default_storage.url(path)} {width}w' for width, path in paths.items())
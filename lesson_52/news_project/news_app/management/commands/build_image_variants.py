@@ -0,0 +1,40 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from news_app.images import IMAGE_FIELDS, needs_variants, process_instance
+from news_app.page_cache import bump_content_version
+
+MODELS = {
+    "news": "news_app.news",
+    "profiles": "accounts.profile",
+}
+
+
+class Command(BaseCommand):
+    help = "Mavjud rasmlar uchun srcset nusxalarini (AVIF/WebP/JPEG) yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=[*MODELS, "all"], default="all")
+        parser.add_argument("--force", action="store_true", help="Tayyor nusxalarni ham qayta yozish")
+
+    def handle(self, *args, **options):
+        labels = MODELS.values() if options["model"] == "all" else [MODELS[options["model"]]]
+        for label in labels:
+            model = apps.get_model(label)
+            image_field, variants_field = IMAGE_FIELDS[label]
+            rows = model.objects.exclude(**{image_field: ""}).only("pk", image_field, variants_field)
+
+            done = failed = 0
+            for instance in rows.iterator(chunk_size=200):
+                if not (options["force"] or needs_variants(instance, image_field, variants_field)):
+                    continue
+                try:
+                    process_instance(label, instance.pk, force=options["force"], bump=False)
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"  {label} #{instance.pk}: {exc}")
+            self.stdout.write(self.style.SUCCESS(f"✓ {label}: {done} ta tayyor, {failed} ta xato"))
+
+        # Keshdagi sahifalar bir marta yangilanadi
+        bump_content_version()
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news_app.models import News
+from news_app.related import BATCH_SIZE, TOP_K, build_related, load_index, update_related
+
+
+class Command(BaseCommand):
+    help = "O'xshash yangiliklar (RelatedNews) indeksini TF-IDF bo'yicha quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--new",
+            action="store_true",
+            help="Faqat indeksda hali yo'q chop etilgan yangiliklarni qo'shish (cron uchun)",
+        )
+        parser.add_argument("--top-k", type=int, default=TOP_K)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        index = load_index()
+        self.stdout.write(f"{index.size} ta yangilik, {len(index.idf)} ta so'z ({time.monotonic() - started:.1f}s)")
+
+        if options["new"]:
+            news_ids = list(News.published.filter(related_links__isnull=True).values_list("pk", flat=True))
+            count = update_related(news_ids, index=index, top_k=options["top_k"])
+            self.stdout.write(self.style.SUCCESS(f"✓ {count} ta yangi yangilik indeksga qo'shildi"))
+            return
+
+        for done, total in build_related(index, top_k=options["top_k"], batch_size=options["batch_size"]):
+            self.stdout.write(f"  {done}/{total}")
+        self.stdout.write(self.style.SUCCESS(f"✓ Indeks qayta qurildi ({time.monotonic() - started:.1f}s)"))
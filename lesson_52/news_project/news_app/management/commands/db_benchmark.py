@@ -0,0 +1,151 @@
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from news_app.models import News
+from news_project.database import sqlite_pragmas
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Bir vaqtda o'qish/yozish yuklamasida baza rejimlarini solishtiradi: SQLite uchun "
+        "bazaning nusxasida rollback journal va WAL, Postgres uchun ulanish rejimlari"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Yozuvlar ulushi (ko'rishlar UPDATE'i)")
+        parser.add_argument(
+            "--write-hold",
+            type=float,
+            default=0.002,
+            help="Yozuv tranzaksiyasi ichidagi qo'shimcha ish (soniya): sessiya, izoh va h.k.",
+        )
+
+    def handle(self, *args, **options):
+        default = connections["default"].settings_dict
+        if default["ENGINE"].endswith("sqlite3"):
+            # Nusxalar asl baza bilan bir diskda - fsync narxi haqiqiydek bo'lsin
+            tmp = Path(tempfile.mkdtemp(prefix="db-benchmark-", dir=Path(default["NAME"]).parent))
+            try:
+                profiles = self.sqlite_profiles(Path(default["NAME"]), tmp)
+                self.run_profiles(profiles, options)
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            self.run_profiles(self.postgres_profiles(default), options)
+
+    def sqlite_profiles(self, source, tmp):
+        """Har rejim uchun bazaning alohida nusxasi (asl bazaning journal rejimi o'zgarmaydi)."""
+        profiles = {}
+        for name, options in {
+            # Django default: rollback journal, DEFERRED tranzaksiyalar
+            "rollback": {"init_command": sqlite_pragmas("DELETE", "FULL", busy_timeout=5000)},
+            "wal": dict(connections["default"].settings_dict["OPTIONS"]),
+        }.items():
+            path = tmp / f"{name}.sqlite3"
+            with sqlite3.connect(source) as src, sqlite3.connect(path) as dst:
+                src.backup(dst)
+            profiles[name] = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(path), "OPTIONS": options}
+        return profiles
+
+    def postgres_profiles(self, default):
+        base = {key: value for key, value in default.items() if key in ("ENGINE", "NAME", "USER", "PASSWORD", "HOST", "PORT")}
+        profiles = {
+            # Har so'rovda yangi ulanish (CONN_MAX_AGE=0)
+            "per-request": {**base, "CONN_MAX_AGE": 0},
+            "persistent": {**base, "CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+        }
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            self.stdout.write("psycopg_pool o'rnatilmagan - pool rejimi o'tkazib yuborildi")
+        else:
+            profiles["pool"] = {**base, "CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"min_size": 2, "max_size": 10}}}
+        return profiles
+
+    def add_alias(self, alias, settings_dict):
+        configured = connections.configure_settings({"default": connections["default"].settings_dict, alias: settings_dict})
+        connections.settings[alias] = configured[alias]
+
+    def run_profiles(self, profiles, options):
+        self.stdout.write(
+            f"{options['threads']} oqim, {options['seconds']}s, yozuvlar {options['write_ratio']:.0%}\n"
+            f"{'rejim':<14}{'so`rov/s':>10}{'yozuv/s':>10}{'o`qish p50':>12}{'o`qish p95':>12}"
+            f"{'yozuv p95':>12}{'xatolar':>10}"
+        )
+        for name, settings_dict in profiles.items():
+            alias = f"benchmark_{name}"
+            self.add_alias(alias, settings_dict)
+            try:
+                stats = self.run(alias, options)
+            finally:
+                connections[alias].close()
+                if hasattr(connections[alias], "close_pool"):
+                    connections[alias].close_pool()
+                del connections.settings[alias]
+            elapsed = options["seconds"]
+            self.stdout.write(
+                f"{name:<14}"
+                f"{(len(stats['read']) + len(stats['write'])) / elapsed:>10.0f}"
+                f"{len(stats['write']) / elapsed:>10.0f}"
+                f"{statistics.median(stats['read'] or [0]):>10.1f}ms"
+                f"{percentile(stats['read'], 0.95):>10.1f}ms"
+                f"{percentile(stats['write'], 0.95):>10.1f}ms"
+                f"{stats['errors']:>10}"
+            )
+
+    def run(self, alias, options):
+        ids = list(News.objects.using(alias).values_list("pk", flat=True))
+        stats = {"read": [], "write": [], "errors": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["seconds"]
+
+        def worker(seed):
+            rng = random.Random(seed)
+            reads, writes, errors = [], [], 0
+            connection = connections[alias]
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    if ids and rng.random() < options["write_ratio"]:
+                        with transaction.atomic(using=alias):
+                            News.objects.using(alias).filter(pk=rng.choice(ids)).update(views=F("views") + 1)
+                            time.sleep(options["write_hold"])
+                        writes.append((time.perf_counter() - started) * 1000)
+                    else:
+                        list(News.published.using(alias).cards().order_by("-published_at")[:10])
+                        reads.append((time.perf_counter() - started) * 1000)
+                except OperationalError:
+                    errors += 1
+                # So'rov oxiridagi kabi: CONN_MAX_AGE=0 bo'lsa ulanish yopiladi
+                connection.close_if_unusable_or_obsolete()
+            connection.close()
+            with lock:
+                stats["read"].extend(reads)
+                stats["write"].extend(writes)
+                stats["errors"] += errors
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
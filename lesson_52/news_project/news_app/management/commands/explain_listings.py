@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+from news_app.models import Category
+from news_app.query_plans import bad_lines, capture_plans
+
+
+class Command(BaseCommand):
+    help = "Ro'yxat sahifalari haqiqatda yuboradigan so'rovlarning EXPLAIN rejasini tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strict", action="store_true", help="Skan yoki vaqtinchalik saralash bo'lsa xato bilan chiqish")
+        parser.add_argument("--language", default=settings.LANGUAGE_CODE)
+
+    def listing_urls(self):
+        urls = [reverse("news:home"), reverse("news:news_list"), reverse("news:news_list") + "?page=2"]
+        category = Category.objects.first()
+        if category is not None:
+            urls.append(category.get_absolute_url())
+        return urls
+
+    def handle(self, *args, **options):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        client = Client(HTTP_HOST=(hosts[0].lstrip('.') if hosts else 'localhost'))
+        problems = []
+        with translation.override(options["language"]):
+            urls = self.listing_urls()
+        for url in urls:
+            # Sahifa keshi bo'lsa so'rovlar umuman bajarilmaydi
+            cache.clear()
+            response, plans = capture_plans(client, url)
+            self.stdout.write(f"{url} ({response.status_code})")
+            for sql, plan in plans:
+                bad = bad_lines(plan)
+                style = self.style.ERROR if bad else self.style.SUCCESS
+                self.stdout.write(style(f"  {'✗' if bad else '✓'} {sql[:120]}"))
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+                if bad:
+                    problems.append(f"{url}: {', '.join(bad)}")
+
+        if problems and options["strict"]:
+            raise CommandError("Indeks ishlatilmagan so'rovlar:\n" + "\n".join(problems))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news_app.comments import FLUSH_INTERVAL, comment_queue
+
+
+class Command(BaseCommand):
+    help = "Moderatsiya navbatidagi izohlarni (PendingComment) bitta bulk_create bilan Comment ga ko'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="To'xtatilguncha har --interval soniyada takrorlash")
+        parser.add_argument("--interval", type=float, default=FLUSH_INTERVAL or 2)
+
+    def handle(self, *args, **options):
+        while True:
+            moved = comment_queue.flush()
+            if moved:
+                self.stdout.write(f"✅ {moved} ta izoh ko'chirildi")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,98 @@
+import tracemalloc
+import warnings
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+from news_app.models import Category, DeferredFieldWarning, News
+
+LIMIT = 10
+
+
+def row_bytes(queryset):
+    """So'rov natijasidagi barcha qiymatlarning taxminiy hajmi (bazadan uzatilgan baytlar)."""
+    sql, params = queryset.query.sql_with_params()
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            total += sum(len(str(value).encode('utf-8')) for value in row if value is not None)
+    return total
+
+
+def peak_memory(queryset):
+    """Querysetni obyektlarga aylantirishdagi eng yuqori xotira (bayt)."""
+    tracemalloc.start()
+    items = list(queryset.all())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return peak
+
+
+class Command(BaseCommand):
+    help = "Ro'yxat querysetlari (to'liq qatorlar va cards()) hajmini solishtiradi va kartochka shablonlarini tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--language", default=settings.LANGUAGE_CODE)
+        parser.add_argument("--no-render", action="store_true", help="Sahifalarni render qilib tekshirmaslik")
+
+    def listing_querysets(self):
+        category = Category.objects.first()
+        querysets = {
+            "latest_news": lambda qs: qs.order_by("-published_at")[:LIMIT],
+            "popular": lambda qs: qs.order_by("-views")[:LIMIT],
+        }
+        if category is not None:
+            querysets["category_detail"] = lambda qs: qs.filter(category=category)[:LIMIT]
+        return querysets
+
+    def listing_urls(self):
+        urls = [reverse("news:home"), reverse("news:news_list"), reverse("news:contact")]
+        category = Category.objects.first()
+        if category is not None:
+            urls.append(category.get_absolute_url())
+        news = News.published.first()
+        if news is not None:
+            urls.append(news.get_absolute_url())
+        return urls
+
+    def handle(self, *args, **options):
+        with translation.override(options["language"]):
+            self.compare_querysets()
+            if not options["no_render"]:
+                self.check_templates()
+
+    def compare_querysets(self):
+        self.stdout.write(f"{'queryset':<18}{'baytlar (to‘liq → cards)':>32}{'xotira (to‘liq → cards)':>32}")
+        for name, build in self.listing_querysets().items():
+            full = build(News.published.select_related("category"))
+            cards = build(News.published.cards())
+            self.stdout.write(
+                f"{name:<18}"
+                f"{row_bytes(full):>15,} → {row_bytes(cards):<14,}"
+                f"{peak_memory(full):>15,} → {peak_memory(cards):<14,}"
+            )
+
+    def check_templates(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        client = Client(HTTP_HOST=(hosts[0].lstrip('.') if hosts else 'localhost'))
+        problems = []
+        for url in self.listing_urls():
+            # Qo'shimcha parametr sahifa keshini chetlab o'tadi - shablon haqiqatda render qilinadi
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", DeferredFieldWarning)
+                response = client.get(url, {"footprint": 1})
+            loads = [str(w.message) for w in caught if issubclass(w.category, DeferredFieldWarning)]
+            style = self.style.ERROR if loads else self.style.SUCCESS
+            self.stdout.write(style(f"{'✗' if loads else '✓'} {url} ({response.status_code})"))
+            for message in loads:
+                self.stdout.write(f"    {message}")
+            problems.extend(f"{url}: {message}" for message in loads)
+
+        if problems:
+            raise CommandError("Kartochka shablonlari yuklanmagan ustunlarni so'ramoqda:\n" + "\n".join(problems))
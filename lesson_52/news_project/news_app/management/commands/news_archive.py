@@ -0,0 +1,236 @@
+import codecs
+import json
+import time
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.utils.text import slugify
+
+from news_app.models import News
+from news_app.page_cache import bump_content_version
+from news_app.search import get_search_backend
+
+DEFAULT_MODELS = ["news_app.category", "news_app.news"]
+READ_SIZE = 64 * 1024
+
+
+def detect_encoding(path):
+    """BOM yoki nol baytlar bo'yicha kodlashni aniqlaydi (dumpdata Windowsda UTF-16 yozadi)."""
+    with open(path, "rb") as fh:
+        head = fh.read(4)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    if len(head) >= 2 and head[1] == 0:
+        return "utf-16-le"
+    if len(head) >= 2 and head[0] == 0:
+        return "utf-16-be"
+    return "utf-8"
+
+
+def iter_fixture(fh):
+    """
+    `[ {...}, {...} ]` ko'rinishidagi fixture dan obyektlarni birma-bir o'qiydi.
+    Butun fayl xotiraga yuklanmaydi: bufer faqat navbatdagi obyektni saqlaydi.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    eof = False
+    while True:
+        stripped = buffer.lstrip()
+        if not started and stripped:
+            if stripped[0] != "[":
+                raise CommandError("Fixture '[' bilan boshlanishi kerak")
+            buffer = stripped[1:]
+            started = True
+            continue
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise CommandError("Fixture oxiri buzilgan")
+            else:
+                yield obj
+                buffer = buffer[end:]
+                continue
+        if eof:
+            return
+        chunk = fh.read(READ_SIZE)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+
+def iter_jsonl(fh):
+    for line in fh:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux da KB, macOS da baytlarda qaytadi
+    return peak / 1024 if peak < 1 << 32 else peak / (1024 * 1024)
+
+
+class Command(BaseCommand):
+    help = "Yangiliklar arxivini oqim (stream) tarzida eksport/import qiladi (fixture yoki JSON Lines)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["import", "export"])
+        parser.add_argument("path", help="Arxiv fayli (masalan news_backup.json yoki archive.jsonl)")
+        parser.add_argument("--format", choices=["auto", "fixture", "jsonl"], default="auto")
+        parser.add_argument("--encoding", default="auto", help="Import uchun kodlash (auto - BOM bo'yicha)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--models", default=",".join(DEFAULT_MODELS), help="Eksport qilinadigan modellar")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        fmt = options["format"]
+        if fmt == "auto":
+            fmt = "jsonl" if options["path"].endswith((".jsonl", ".ndjson")) else "fixture"
+
+        if options["action"] == "export":
+            count = self.export(options["path"], fmt, options)
+            summary = f"{count} ta obyekt"
+        else:
+            count = self.import_(options["path"], fmt, options)
+            summary = f"{count} ta obyekt yozildi, {self.skipped} tasi bazada bor edi"
+
+        elapsed = time.perf_counter() - started
+        rss = peak_rss_mb()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {summary}, {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} obyekt/s), "
+            f"peak RSS: {f'{rss:.0f} MB' if rss else 'n/a'}"
+        ))
+
+    # --- EXPORT ---
+    def export(self, path, fmt, options):
+        count = 0
+        with open(path, "w", encoding="utf-8") as fh:
+            if fmt == "fixture":
+                fh.write("[\n")
+            for label in options["models"].split(","):
+                model = apps.get_model(label.strip())
+                queryset = model._default_manager.order_by("pk")
+                for obj in queryset.iterator(chunk_size=options["batch_size"]):
+                    record = serializers.serialize("python", [obj])[0]
+                    line = json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False)
+                    if fmt == "fixture":
+                        fh.write((",\n" if count else "") + line)
+                    else:
+                        fh.write(line + "\n")
+                    count += 1
+            if fmt == "fixture":
+                fh.write("\n]\n")
+        return count
+
+    # --- IMPORT ---
+    def import_(self, path, fmt, options):
+        encoding = options["encoding"]
+        if encoding == "auto":
+            encoding = detect_encoding(path)
+        self.stdout.write(f"Kodlash: {encoding}, format: {fmt}")
+
+        batch_size = options["batch_size"]
+        model, batch = None, []
+        count = 0
+        self.skipped = 0
+        self.imported_models = set()
+        with open(path, encoding=encoding) as fh:
+            records = iter_fixture(fh) if fmt == "fixture" else iter_jsonl(fh)
+            for record in records:
+                # Deserializer sana, FK va boshqa maydonlarni to'g'ri turga o'giradi, lekin save() qilmaydi
+                for deserialized in serializers.deserialize("python", [record]):
+                    obj = deserialized.object
+                    # Model almashganda oldingisini yozamiz (masalan category -> news, FK tartibi uchun)
+                    if type(obj) is not model or len(batch) >= batch_size:
+                        count += self.flush(model, batch)
+                        model, batch = type(obj), []
+                    batch.append(obj)
+        count += self.flush(model, batch)
+
+        self.finish()
+        return count
+
+    def flush(self, model, objects):
+        if not objects:
+            return 0
+        self.clear_missing_relations(model, objects)
+        manager = model._default_manager
+        # ignore_conflicts bilan bulk_create qaysi qatorlar yozilganini aytmaydi:
+        # pk lar bo'yicha oldin va keyin sanaymiz
+        pks = [obj.pk for obj in objects if obj.pk is not None]
+        existing = manager.filter(pk__in=pks).count()
+        # bulk_create post_save signallarini yubormaydi: tarjima/profil signallari ishlamaydi
+        try:
+            with transaction.atomic():
+                manager.bulk_create(objects, batch_size=len(objects), ignore_conflicts=True)
+        except IntegrityError as error:
+            raise CommandError(
+                f"{model._meta.label} yozilmadi ({error}). Bog'langan obyektlar "
+                f"(masalan kategoriyalar) avval import qilinganini tekshiring."
+            )
+        inserted = manager.filter(pk__in=pks).count() - existing + (len(objects) - len(pks))
+        skipped = len(objects) - inserted
+        self.skipped += skipped
+        self.imported_models.add(model)
+        self.stdout.write(f"  {model._meta.label}: {inserted} ta yozildi, {skipped} ta o'tkazib yuborildi (bazada bor)")
+        return inserted
+
+    def clear_missing_relations(self, model, objects):
+        """Bazada mavjud bo'lmagan ixtiyoriy FK (masalan author) larni NULL qiladi."""
+        for field in model._meta.concrete_fields:
+            if not (field.is_relation and field.null):
+                continue
+            ids = {getattr(obj, field.attname) for obj in objects} - {None}
+            if not ids:
+                continue
+            existing = set(
+                field.related_model._default_manager.filter(pk__in=ids).values_list("pk", flat=True)
+            )
+            for obj in objects:
+                if getattr(obj, field.attname) not in existing:
+                    setattr(obj, field.attname, None)
+
+    def finish(self):
+        # pk lar aniq berilgan: Postgres sequence'lari loaddata kabi qayta o'rnatiladi,
+        # aks holda keyingi oddiy INSERT "duplicate key" bilan yiqiladi
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self.imported_models))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        # Bo'sh sluglarni tiklash, qidiruv indeksini qayta qurish va sahifa keshini eskirtirish
+        fixed = []
+        taken = set(News.objects.exclude(slug="").values_list("slug", flat=True))
+        for news in News.objects.filter(slug="").only("pk", "title", "slug").iterator(chunk_size=1000):
+            slug = slugify(news.title) or str(news.pk)
+            if slug in taken:
+                slug = f"{slug}-{news.pk}"
+            taken.add(slug)
+            news.slug = slug
+            fixed.append(news)
+        if fixed:
+            News.objects.bulk_update(fixed, ["slug"], batch_size=1000)
+            self.stdout.write(f"  {len(fixed)} ta slug tiklandi")
+
+        self.stdout.write("  Qidiruv indeksi qayta qurilmoqda...")
+        get_search_backend().rebuild()
+        bump_content_version()
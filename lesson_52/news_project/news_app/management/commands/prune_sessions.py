@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Muddati o'tgan sessiyalarni (va ixtiyoriy ravishda eski anonim sessiyalarni) "
+        "partiyalab o'chiradi - clearsessions'dan farqli ravishda jadvalni uzoq qulflamaydi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--anonymous-older-than",
+            type=int,
+            metavar="DAYS",
+            help="Shuncha kundan oldin yaratilgan, login qilinmagan sessiyalarni ham o'chirish",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.SESSION_ENGINE.endswith(("db", "cached_db")):
+            self.stdout.write(f"{settings.SESSION_ENGINE} bazada sessiya saqlamaydi - tozalash shart emas")
+            return
+
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        deleted = self.delete_in_batches(expired.values_list("pk", flat=True), options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Muddati o'tgan {deleted} ta sessiya o'chirildi"))
+
+        if options["anonymous_older_than"] is not None:
+            deleted = self.delete_in_batches(
+                self.anonymous_keys(options["anonymous_older_than"]),
+                options["batch_size"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"✓ {deleted} ta eski anonim sessiya o'chirildi"))
+
+    def anonymous_keys(self, days):
+        # expire_date = yaratilgan/o'zgargan vaqt + SESSION_COOKIE_AGE
+        cutoff = timezone.now() + timedelta(seconds=settings.SESSION_COOKIE_AGE) - timedelta(days=days)
+        rows = Session.objects.filter(expire_date__lt=cutoff).values_list("session_key", "session_data")
+        store = Session.get_session_store_class()()
+        for key, data in rows.iterator(chunk_size=BATCH_SIZE):
+            if SESSION_KEY not in store.decode(data):
+                yield key
+
+    def delete_in_batches(self, keys, batch_size):
+        # Kalitlar oldin yig'iladi: iterator ochiq turganda o'sha jadvaldan o'chirmaymiz
+        keys = list(keys)
+        deleted = 0
+        for start in range(0, len(keys), batch_size):
+            with transaction.atomic():
+                count, _ = Session.objects.filter(pk__in=keys[start:start + batch_size]).delete()
+            deleted += count
+        return deleted
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news_app.models import News
+from news_app.snapshots import SNAPSHOT_ROOT, current_root, publish, publish_release, targets_for_news
+
+
+class Command(BaseCommand):
+    help = (
+        "Anonimlar uchun statik sahifalarni (bosh sahifa, yangiliklar, kategoriyalar) "
+        "har bir til uchun NEWS_SNAPSHOT_ROOT ga yozadi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--news",
+            type=int,
+            nargs="+",
+            metavar="ID",
+            help="Faqat shu yangiliklar va ularga bog'liq ro'yxatlarni joriy release'da yangilash",
+        )
+
+    def handle(self, *args, **options):
+        if not SNAPSHOT_ROOT:
+            raise CommandError("NEWS_SNAPSHOT_ROOT sozlanmagan")
+        started = time.monotonic()
+
+        if options["news"]:
+            if not current_root().exists():
+                raise CommandError("Hali to'liq release yo'q - avval argumentsiz ishga tushiring")
+            targets = set()
+            for news in News.objects.filter(pk__in=options["news"]).select_related("category"):
+                targets |= targets_for_news(news)[0]
+            written = publish(current_root(), targets)
+        else:
+            written = publish_release(progress=lambda done: self.stdout.write(f"  {done} ta sahifa..."))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {written} ta fayl yozildi ({time.monotonic() - started:.1f}s) → {current_root().resolve()}"
+        ))
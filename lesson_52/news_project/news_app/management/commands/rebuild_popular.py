@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.db.models.functions import TruncHour
+
+from news_app.models import News, NewsViewBucket
+from news_app.trending import (
+    HALF_LIFE_HOURS,
+    PER_CATEGORY,
+    WINDOW_HOURS,
+    prune_buckets,
+    rebuild_popular,
+)
+
+
+class Command(BaseCommand):
+    help = "Soatlik ko'rishlar tarixidan ommabop yangiliklar (PopularNews) jadvalini qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--half-life", type=float, default=HALF_LIFE_HOURS, help="Ball necha soatda ikki marta kamayadi")
+        parser.add_argument("--window", type=int, default=WINDOW_HOURS, help="Necha soatlik tarix hisobga olinadi")
+        parser.add_argument("--per-category", type=int, default=PER_CATEGORY)
+        parser.add_argument(
+            "--seed-from-totals",
+            action="store_true",
+            help="Bucketlar bo'sh bo'lsa News.views jami sonini published_at soatiga yozish",
+        )
+        parser.add_argument("--prune", action="store_true", help="Oynadan eski bucketlarni o'chirish")
+
+    def handle(self, *args, **options):
+        if options["seed_from_totals"]:
+            self.seed_from_totals()
+
+        if options["prune"]:
+            deleted = prune_buckets(options["window"])
+            self.stdout.write(f"{deleted} ta eski bucket o'chirildi")
+
+        count = rebuild_popular(
+            half_life=options["half_life"],
+            window=options["window"],
+            per_category=options["per_category"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"✓ PopularNews: {count} ta yangilik"))
+
+    def seed_from_totals(self):
+        if NewsViewBucket.objects.exists():
+            self.stdout.write("Bucketlar allaqachon bor, seed o'tkazib yuborildi")
+            return
+        rows = (
+            News.published.filter(views__gt=0)
+            .annotate(hour=TruncHour("published_at"))
+            .values_list("pk", "hour", F("views"))
+        )
+        buckets = [NewsViewBucket(news_id=pk, hour=hour, views=views) for pk, hour, views in rows.iterator()]
+        NewsViewBucket.objects.bulk_create(buckets, batch_size=1000)
+        self.stdout.write(f"{len(buckets)} ta bucket News.views dan yaratildi")
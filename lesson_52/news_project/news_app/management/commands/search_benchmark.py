@@ -0,0 +1,79 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news_app.models import News, Category
+from news_app.search import SimpleSearchBackend, get_search_backend
+
+WORDS = (
+    "yangilik sport futbol iqtisod bozor narx texnologiya sun'iy intellekt "
+    "maktab talaba universitet prezident qaror hukumat loyiha qurilish yo'l "
+    "ob-havo yomg'ir qor issiq sovuq turizm sayohat madaniyat teatr kino "
+    "musiqa festival kitob ilm fan tibbiyot shifoxona dori bank kredit soliq"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Qidiruv indeksini eski icontains qidiruvi bilan solishtiradi (ma'lumotlar oxirida o'chiriladi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000, help="Yaratiladigan sinov maqolalari soni")
+        parser.add_argument("--repeat", type=int, default=5, help="Har bir so'rov necha marta bajariladi")
+        parser.add_argument("--query", action="append", dest="queries", help="Qidiruv so'zi (bir necha marta berish mumkin)")
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or ["futbol", "sun'iy intellekt", "kredit soliq", "festival"]
+        backend = get_search_backend()
+        simple = SimpleSearchBackend()
+
+        # Hammasi bitta tranzaksiyada - oxirida rollback, bazada hech narsa qolmaydi
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options["count"])
+            backend.rebuild()
+            self.stdout.write(f"{options['count']} ta maqola va indeks: {time.perf_counter() - started:.1f}s")
+            self.stdout.write(f"Backend: {backend.__class__.__name__}\n")
+
+            self.stdout.write(f"{'so`rov':<20}{'icontains (ms)':>16}{'indeks (ms)':>14}{'natija':>10}")
+            for query in queries:
+                slow, _ = self.measure(simple, query, options["repeat"])
+                fast, total = self.measure(backend, query, options["repeat"])
+                self.stdout.write(f"{query:<20}{slow:>16.1f}{fast:>14.1f}{total:>10}")
+
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(42)
+        # Haqiqiy matnga o'xshash lug'at: ko'p sun'iy so'zlar, chastotasi Zipf bo'yicha
+        syllables = ["ka", "lo", "mi", "ra", "tu", "se", "no", "bi", "zo", "qa", "sh", "o'"]
+        vocabulary = WORDS + ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(5000)]
+        rng.shuffle(vocabulary)
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        category = Category.objects.create(name="Benchmark", slug="benchmark-search")
+        batch = []
+        for i in range(count):
+            batch.append(News(
+                title=" ".join(rng.choices(vocabulary, weights, k=8)),
+                slug=f"benchmark-search-{i}",
+                content=" ".join(rng.choices(vocabulary, weights, k=300)),
+                category=category,
+                status=News.Status.PUBLISHED,
+            ))
+            if len(batch) >= 2000:
+                News.objects.bulk_create(batch)
+                batch = []
+        News.objects.bulk_create(batch)
+
+    def measure(self, backend, query, repeat):
+        # Paginator qiladigan ish: COUNT + birinchi sahifa (6 ta)
+        timings = []
+        total = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = backend.search(query, language="uz")
+            total = queryset.count()
+            list(queryset[:6])
+            timings.append((time.perf_counter() - started) * 1000)
+        return min(timings), total
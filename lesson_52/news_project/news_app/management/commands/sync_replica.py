@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from news_app.routers import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Lokal sinov uchun: primary SQLite bazasini replika fayllariga nusxalaydi "
+        "(haqiqiy replikatsiya o'rnida; Postgres'da replikatsiya server tomonida)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Shuncha soniyada bir takrorlash (replikatsiya kechikishini taqlid qiladi); 0 - bir marta",
+        )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS].settings_dict
+        if not primary["ENGINE"].endswith("sqlite3"):
+            raise CommandError("sync_replica faqat SQLite uchun")
+        replicas = replica_aliases()
+        if not replicas:
+            raise CommandError("DB_REPLICAS sozlanmagan")
+
+        while True:
+            started = time.monotonic()
+            for alias in replicas:
+                # Replikaning ochiq ulanishi bo'lsa yopamiz - backup butun faylni almashtiradi
+                connections[alias].close()
+                with sqlite3.connect(primary["NAME"]) as source, sqlite3.connect(connections[alias].settings_dict["NAME"]) as target:
+                    source.backup(target)
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {', '.join(replicas)} yangilandi ({time.monotonic() - started:.2f}s)"
+            ))
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from news_app.page_cache import bump_content_version
+from news_app.search import get_search_backend
+from news_app.translation_jobs import TARGET_LANGUAGES, TRANSLATABLE_FIELDS, translate_object
+from news_app.translators import get_translator
+
+MODELS = {"news": "news_app.news", "category": "news_app.category"}
+
+
+class Command(BaseCommand):
+    help = "Bo'sh *_en/*_ru tarjima ustunlarini to'ldiradi (to'xtatilgan joydan davom etadi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=[*MODELS, "all"], default="all")
+        parser.add_argument("--chunk-size", type=int, default=200, help="iterator() va bulk_update bo'lagi")
+        parser.add_argument("--workers", type=int, default=4, help="Parallel tarjima threadlari")
+        parser.add_argument("--rate", type=float, default=5.0, help="Tarjimonga soniyasiga maksimal so'rovlar")
+        parser.add_argument("--limit", type=int, default=0, help="Eng ko'pi bilan nechta yozuv (0 - cheklovsiz)")
+        parser.add_argument(
+            "--checkpoint",
+            default=str(settings.NEWS_DATA_DIR / "translate_backfill.json"),
+            help="Progress saqlanadigan fayl (standart: NEWS_DATA_DIR ichida)",
+        )
+        parser.add_argument("--reset", action="store_true", help="Checkpointni e'tiborsiz qoldirib boshidan boshlash")
+
+    def handle(self, *args, **options):
+        self.checkpoint_path = options["checkpoint"]
+        self.checkpoint = {} if options["reset"] else self.load_checkpoint()
+        # Threadlar faqat o'qiydi va tarjima qiladi; barcha yozuvlar asosiy ulanishdan
+        # (SQLite da ochiq iterator o'qishi boshqa ulanishlarning yozishini bloklaydi)
+        self.translator = get_translator(rate=options["rate"], autoflush=False)
+
+        labels = MODELS.values() if options["model"] == "all" else [MODELS[options["model"]]]
+        for label in labels:
+            self.backfill(label, options)
+
+        stats = getattr(self.translator, "stats", None)
+        if stats is not None:
+            self.stdout.write(f"Tarjima xotirasi: {stats}")
+
+    def backfill(self, label, options):
+        model = apps.get_model(label)
+        fields = TRANSLATABLE_FIELDS[label]
+        targets = [f"{field}_{lang}" for field in fields for lang in TARGET_LANGUAGES]
+
+        empty = Q()
+        for column in targets:
+            empty |= Q(**{f"{column}__isnull": True}) | Q(**{column: ""})
+        last_pk = self.checkpoint.get(label, 0)
+        queryset = (
+            model.objects.filter(empty, pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", *fields, *targets)
+        )
+        if options["limit"]:
+            queryset = queryset[:options["limit"]]
+
+        self.stdout.write(f"▶ {label}: pk > {last_pk} dan boshlab")
+        started = time.perf_counter()
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            chunk = []
+            for obj in queryset.iterator(chunk_size=options["chunk_size"]):
+                chunk.append(obj)
+                if len(chunk) >= options["chunk_size"]:
+                    done += self.process_chunk(executor, model, label, fields, targets, chunk)
+                    self.report(label, done, started)
+                    chunk = []
+            if chunk:
+                done += self.process_chunk(executor, model, label, fields, targets, chunk)
+                self.report(label, done, started)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {label}: {done} ta yozuv tarjima qilindi"))
+
+    def process_chunk(self, executor, model, label, fields, targets, chunk):
+        def translate(obj):
+            try:
+                return obj, translate_object(obj, fields, "uz", self.translator)
+            finally:
+                # Har bir thread o'z DB ulanishini ochadi (tarjima xotirasi uchun)
+                connection.close()
+
+        changed = []
+        for obj, values in executor.map(translate, chunk):
+            for column, value in values.items():
+                setattr(obj, column, value)
+            if values:
+                changed.append(obj)
+
+        if hasattr(self.translator, "flush"):
+            self.translator.flush()
+        if changed:
+            model.objects.bulk_update(changed, targets)
+            self.after_update(label, changed)
+
+        self.checkpoint[label] = chunk[-1].pk
+        self.save_checkpoint()
+        return len(changed)
+
+    def after_update(self, label, objects):
+        # bulk_update signal yubormaydi: kesh versiyasi va qidiruv indeksini yangilaymiz
+        bump_content_version()
+        search = get_search_backend()
+        if label == "news_app.news":
+            model = apps.get_model(label)
+            for news in model.objects.select_related("category").filter(pk__in=[obj.pk for obj in objects]):
+                search.index(news)
+        else:
+            for category in objects:
+                search.index_category(category)
+
+    def report(self, label, done, started):
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed else 0
+        self.stdout.write(f"  {label}: {done} ta, {elapsed:.1f}s, {rate:.1f} yozuv/s")
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_checkpoint(self):
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        with open(self.checkpoint_path, "w", encoding="utf-8") as fh:
+            json.dump(self.checkpoint, fh)
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news_app.translation_jobs import MAX_ATTEMPTS, process_jobs, requeue_stale_jobs
+from news_app.translators import get_translator
+
+
+class Command(BaseCommand):
+    help = "Tarjima navbatidagi (TranslationJob) vazifalarni bajaradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Navbatni bir marta bo'shatib chiqib ketish")
+        parser.add_argument("--batch-size", type=int, default=10, help="Bir marta olinadigan joblar soni")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Navbat bo'sh bo'lganda kutish (soniya)")
+
+    def handle(self, *args, **options):
+        translator = get_translator()
+        self.stdout.write(f"Tarjima worker ishga tushdi ({translator.__class__.__name__})")
+
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(self.style.WARNING(f"{requeued} ta qotib qolgan job qayta navbatga qo'yildi"))
+
+            done, retried, failed = process_jobs(options["batch_size"], translator)
+            worked = done or retried or failed
+            if worked:
+                message = f"✅ {done} ta bajarildi"
+                if retried:
+                    message += f", 🔁 {retried} ta xato (qayta urinish rejalashtirildi)"
+                if failed:
+                    message += f", ❌ {failed} ta FAILED ({MAX_ATTEMPTS} urinishdan keyin)"
+                self.stdout.write(message)
+                stats = getattr(translator, "stats", None)
+                if stats is not None:
+                    self.stdout.write(f"   Tarjima xotirasi: {stats}")
+
+            if options["once"] and not worked:
+                break
+            if not worked:
+                time.sleep(options["sleep"])
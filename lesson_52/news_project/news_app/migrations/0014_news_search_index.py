@@ -0,0 +1,50 @@
+# Qidiruv indeksi: SQLite da FTS5 virtual jadvali, Postgres da tsvector ustunlari + GIN
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS news_app_news_fts USING fts5("
+            "title, title_en, title_ru, content, content_en, content_ru, "
+            "category, category_en, category_ru, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == "postgresql":
+        for language in ("uz", "en", "ru"):
+            schema_editor.execute(
+                f"ALTER TABLE news_app_news ADD COLUMN IF NOT EXISTS search_{language} tsvector"
+            )
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS news_app_news_search_{language}_gin "
+                f"ON news_app_news USING gin (search_{language})"
+            )
+    else:
+        return
+
+    from news_app.search import get_search_backend
+
+    get_search_backend(using=schema_editor.connection.alias).rebuild()
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS news_app_news_fts")
+    elif vendor == "postgresql":
+        for language in ("uz", "en", "ru"):
+            schema_editor.execute(f"DROP INDEX IF EXISTS news_app_news_search_{language}_gin")
+            schema_editor.execute(f"ALTER TABLE news_app_news DROP COLUMN IF EXISTS search_{language}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0013_category_name_en_category_name_ru"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
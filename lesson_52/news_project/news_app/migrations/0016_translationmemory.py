@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0015_translationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationMemory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_lang', models.CharField(max_length=5)),
+                ('target_lang', models.CharField(max_length=5)),
+                ('segment_hash', models.CharField(max_length=64)),
+                ('source_text', models.TextField()),
+                ('translated_text', models.TextField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Translation memory',
+                'constraints': [models.UniqueConstraint(fields=('source_lang', 'target_lang', 'segment_hash'), name='unique_translation_segment')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0016_translationmemory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-published_at'], name='news_status_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['category', 'status', '-published_at'], name='news_cat_status_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-views'], name='news_status_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-created_at'], name='news_status_created_idx'),
+        ),
+    ]
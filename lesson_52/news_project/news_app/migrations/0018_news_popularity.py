@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0017_news_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='news_app.news')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='news_view_bucket_hour_idx')],
+                'constraints': [models.UniqueConstraint(fields=('news', 'hour'), name='unique_news_view_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PopularNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='popular_news', to='news_app.category')),
+                ('news', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='popularity', to='news_app.news')),
+            ],
+            options={
+                'verbose_name_plural': 'Popular news',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['-score'], name='popular_news_score_idx'), models.Index(fields=['category', '-score'], name='popular_news_cat_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0018_news_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='news_app.news')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='news_app.news')),
+            ],
+            options={
+                'verbose_name_plural': 'Related news',
+                'ordering': ['news', 'rank'],
+                'indexes': [models.Index(fields=['news', 'rank'], name='related_news_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('news', 'related'), name='unique_related_news')],
+            },
+        ),
+    ]
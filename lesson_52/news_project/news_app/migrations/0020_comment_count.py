@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    News = apps.get_model("news_app", "News")
+    Comment = apps.get_model("news_app", "Comment")
+    active = (
+        Comment.objects.filter(news=OuterRef("pk"), active=True)
+        .order_by()
+        .values("news")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    News.objects.update(comment_count=Coalesce(Subquery(active, output_field=IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0019_related_news'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['news', 'active', 'created_at'], name='comment_news_active_idx'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
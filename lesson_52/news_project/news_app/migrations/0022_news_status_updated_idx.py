@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0021_news_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-updated_at'], name='news_status_updated_idx'),
+        ),
+    ]
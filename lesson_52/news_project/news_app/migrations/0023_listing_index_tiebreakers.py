@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_app', '0022_news_status_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='news',
+            name='news_status_published_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='news',
+            name='news_cat_status_pub_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='news',
+            name='news_status_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-published_at', '-id'], name='news_status_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['category', 'status', '-published_at', '-id'], name='news_cat_status_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='news_status_created_idx'),
+        ),
+    ]
@@ -1,10 +1,41 @@
+import warnings
+
 from django.urls import reverse
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, NullIf, Substr
 from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from django.utils import translation
 
+# Tarjima ustunlari bor tillar (o'zbekcha - asosiy ustunlar)
+TRANSLATED_LANGUAGES = ('en', 'ru')
+
+# Ro'yxat sahifalarida kontentdan faqat shuncha belgi olinadi (truncatewords:20 uchun yetarli)
+EXCERPT_LENGTH = 400
+
+
+def _active_language(language=None):
+    return (language or translation.get_language() or '')[:2]
+
+
+def translated_expression(field, language=None):
+    """
+    Joriy til uchun ustun ifodasi: title_en bo'sh/NULL bo'lsa title ga qaytadi.
+    get_translated_title() dagi Python shartlarining SQL ko'rinishi.
+    """
+    language = _active_language(language)
+    if language not in TRANSLATED_LANGUAGES:
+        return F(field)
+    return Coalesce(NullIf(F(f'{field}_{language}'), Value('')), F(field))
+
+
+class CategoryQuerySet(models.QuerySet):
+    def translated(self, language=None):
+        """display_name - joriy tildagi nom (get_translate_name bilan bir xil)."""
+        return self.annotate(display_name=translated_expression('name', language))
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -13,6 +44,8 @@ class Category(models.Model):
     name_en = models.CharField(max_length=100, blank=True, null=True)
     name_ru = models.CharField(max_length=100, blank=True, null=True)
 
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = 'Categories'
 
@@ -29,7 +62,9 @@ class Category(models.Model):
         return reverse("news:category_detail", kwargs={"slug": self.slug})
     
     def get_translate_name(self):
-        from django.utils import translation
+        # translated() orqali olingan bo'lsa tayyor qiymat
+        if 'display_name' in self.__dict__:
+            return self.display_name
         lang = translation.get_language()
         if lang == "en" and self.name_en:
             return self.name_en
@@ -38,8 +73,44 @@ class Category(models.Model):
         return self.name
 
 
+# Kartochka (ro'yxat elementi) shablonlari ishlatadigan News ustunlari
+CARD_FIELDS = ('id', 'title', 'slug', 'image', 'image_variants', 'category', 'published_at', 'created_at', 'views')
+
+
+class DeferredFieldWarning(RuntimeWarning):
+    """Kartochka obyektida yuklanmagan ustunga murojaat - har biri alohida so'rov."""
+
+
+class NewsQuerySet(models.QuerySet):
+    def translated(self, language=None, content=False):
+        """
+        Joriy til uchun tayyor display_title va display_excerpt (content=True
+        bo'lsa to'liq display_content) annotatsiyalari. Boshqa tillarning
+        ustunlari va to'liq matnlar (content, content_en, content_ru) yuklanmaydi.
+        """
+        queryset = self.annotate(display_title=translated_expression('title', language))
+        body = translated_expression('content', language)
+        if content:
+            queryset = queryset.annotate(display_content=body)
+        else:
+            queryset = queryset.annotate(display_excerpt=Substr(body, 1, EXCERPT_LENGTH))
+        return queryset.defer('title_en', 'title_ru', 'content', 'content_en', 'content_ru')
+
+    def cards(self, language=None, author=False):
+        """
+        Ro'yxatlar uchun yengil queryset: faqat CARD_FIELDS, kategoriya (va
+        kerak bo'lsa muallif) bitta JOIN bilan, sarlavha/matn joriy tilda.
+        """
+        fields = list(CARD_FIELDS)
+        related = ['category']
+        if author:
+            fields += ['author__id', 'author__username']
+            related.append('author')
+        return self.translated(language).select_related(*related).only(*fields)
+
+
 # Custom Manager (PublishedManager) ni tashqarida aniqlaymiz
-class PublishedManager(models.Manager):
+class PublishedManager(models.Manager.from_queryset(NewsQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(status=self.model.Status.PUBLISHED)
 
@@ -63,6 +134,8 @@ class News(models.Model):
     content_ru = models.TextField(blank=True, null=True)
 
     image = models.ImageField(upload_to='news/images/', blank=True, null=True)
+    # Rasmning kichraytirilgan nusxalari (images.py): {"source": ..., "formats": {"webp": {"320": path}}}
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='news', null=True, blank=True)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='news')
     published_at = models.DateTimeField(default=timezone.now)
@@ -75,12 +148,16 @@ class News(models.Model):
     )
 
     views = models.PositiveIntegerField(default=0) # Ko'rishlar soni
+    comment_count = models.PositiveIntegerField(default=0)  # Faol izohlar soni (signallar yangilaydi)
 
     # Managers
-    objects = models.Manager()   # Default manager
+    objects = NewsQuerySet.as_manager()   # Default manager
     published = PublishedManager()  # Custom manager faqat PUBLISHED postlarni qaytaradi
 
     def get_translated_title(self):
+        # translated() orqali olingan bo'lsa til tanlovi SQL da bajarilgan
+        if 'display_title' in self.__dict__:
+            return self.display_title
         lang = translation.get_language()
         if lang == 'en' and self.title_en:
             return self.title_en
@@ -89,14 +166,48 @@ class News(models.Model):
         return self.title  # default uzbekcha
 
     def get_translated_content(self):
+        if 'display_content' in self.__dict__:
+            return self.display_content
         lang = translation.get_language()
         if lang == 'en' and self.content_en:
             return self.content_en
         elif lang == 'ru' and self.content_ru:
             return self.content_ru
         return self.content  # default uzbekcha
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # translated()/cards() obyektida yuklanmagan ustun so'ralsa ogohlantiramiz:
+        # bu shablon har bir element uchun qo'shimcha so'rov yuborayotganini bildiradi
+        if fields and 'display_title' in self.__dict__:
+            warnings.warn(
+                f"News #{self.pk}: kartochkada yuklanmagan {', '.join(fields)} ustuni so'raldi",
+                DeferredFieldWarning,
+                stacklevel=3,
+            )
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def get_excerpt(self):
+        """Ro'yxatlar uchun qisqa matn: translated() bo'lsa SQL dagi qirqilgan qism."""
+        if 'display_excerpt' in self.__dict__:
+            return self.display_excerpt
+        return self.get_translated_content()[:EXCERPT_LENGTH]
+
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            # News.published + ordering('-published_at'): ro'yxatlar, so'nggi yangiliklar
+            # (-id - keyset paginatsiyaning tiebreaker'i, saralash to'liq indeksdan)
+            models.Index(fields=['status', '-published_at', '-id'], name='news_status_published_idx'),
+            # Kategoriya sahifasi, bosh sahifa bo'limlari, o'xshash yangiliklar
+            models.Index(fields=['category', 'status', '-published_at', '-id'], name='news_cat_status_pub_idx'),
+            # Ommabop yangiliklar (views bo'yicha)
+            models.Index(fields=['status', '-views'], name='news_status_views_idx'),
+            # Bosh sahifa paginatsiyasi (-created_at). Qisman (WHERE status='Pu') indeks
+            # SQLite da ishlamaydi: Django status ni parametr (?) sifatida yuboradi
+            models.Index(fields=['status', '-created_at', '-id'], name='news_status_created_idx'),
+            # Ro'yxatlarning Last-Modified qiymati (conditional.published_last_modified)
+            models.Index(fields=['status', '-updated_at'], name='news_status_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -120,10 +231,31 @@ class Comment(models.Model):
         ordering = ['created_at']
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
+        indexes = [
+            # Detail sahifadagi izohlar ro'yxati (faol, created_at bo'yicha cursor)
+            models.Index(fields=['news', 'active', 'created_at'], name='comment_news_active_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} - {self.news.title}'
 
+class PendingComment(models.Model):
+    """
+    Moderatsiya navbati: yangi izohlar avval shu yerga yoziladi, comments.CommentQueue
+    ularni bitta bulk_create bilan Comment ga ko'chiradi (bazada - restart'da yo'qolmaydi).
+    """
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='pending_comments')
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pending_comments')
+    text = models.TextField()
+    active = models.BooleanField(default=True)  # False - spam.needs_moderation
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'Pending comment by {self.author_id} on {self.news_id}'
+
 class Contact(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()
@@ -137,3 +269,128 @@ class Contact(models.Model):
 
     def __str__(self):
         return f'Message from {self.name} <{self.email}>'
+
+
+class TranslationJob(models.Model):
+    """Tarjima navbati: signal faqat job yozadi, tarjimani translation_worker bajaradi."""
+
+    class Status(models.TextChoices):
+        PENDING = 'Pe', 'Pending'
+        RUNNING = 'Ru', 'Running'
+        DONE = 'Do', 'Done'
+        FAILED = 'Fa', 'Failed'
+
+    model = models.CharField(max_length=50)  # masalan "news_app.news"
+    object_id = models.PositiveBigIntegerField()
+    source_lang = models.CharField(max_length=5, default='uz')
+    status = models.CharField(max_length=2, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='translation_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model}#{self.object_id} ({self.get_status_display()})'
+
+
+class TranslationMemory(models.Model):
+    """Avval tarjima qilingan gap (segment)lar: bir xil matn qayta tarjimaga yuborilmaydi."""
+    source_lang = models.CharField(max_length=5)
+    target_lang = models.CharField(max_length=5)
+    segment_hash = models.CharField(max_length=64)  # normallashtirilgan segment sha256
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'Translation memory'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source_lang', 'target_lang', 'segment_hash'],
+                name='unique_translation_segment',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.source_lang}->{self.target_lang}: {self.source_text[:50]}'
+
+
+class NewsViewBucket(models.Model):
+    """Soatlik ko'rishlar: ViewCounter.flush() har bir soat uchun bitta qatorni oshiradi."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='view_buckets')
+    hour = models.DateTimeField()  # soat boshiga qirqilgan vaqt
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'hour'], name='unique_news_view_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['hour'], name='news_view_bucket_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.news_id} @ {self.hour:%Y-%m-%d %H}:00 - {self.views}'
+
+
+class PopularNews(models.Model):
+    """
+    Ommabop yangiliklar jadvali (trending.rebuild_popular() qayta yozadi):
+    vaqt o'tishi bilan so'nuvchi ball bo'yicha har kategoriyadan eng yaxshilari.
+    """
+    news = models.OneToOneField(News, on_delete=models.CASCADE, related_name='popularity')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='popular_news')
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = 'Popular news'
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['-score'], name='popular_news_score_idx'),
+            models.Index(fields=['category', '-score'], name='popular_news_cat_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.news_id}: {self.score:.2f}'
+
+
+class RelatedNews(models.Model):
+    """O'xshash yangiliklar indeksi (related.py, build_related buyrug'i): har bir yangilik uchun top-K qo'shni."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_from')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name_plural = 'Related news'
+        ordering = ['news', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'related'], name='unique_related_news'),
+        ]
+        indexes = [
+            models.Index(fields=['news', 'rank'], name='related_news_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.news_id} -> {self.related_id} ({self.score:.3f})'
+
+
+class CacheVersion(models.Model):
+    """
+    Kesh versiyalari (page_cache.get_version): kontent yoki ommabop ro'yxat
+    o'zgarganini barcha processlar - worker, cron, buyruqlar ham - bazadan ko'radi.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField()
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
@@ -0,0 +1,147 @@
+"""
+Bosh sahifa va kategoriya sahifalari uchun versiyali sahifa keshi.
+
+Kesh kaliti: til (uz/en/ru) + URL yo'li + sahifa raqami (yoki cursor). Kontent versiyasi
+esa Django keshining `version` parametri orqali beriladi. News, Category yoki
+Comment saqlanganda/o'chirilganda (tarjima worker, buyruqlar ham) versiya
+bazada oshiriladi va eski sahifalar ko'pi bilan NEWS_VERSION_CHECK_INTERVAL
+soniyadan keyin eskiradi - TTL ni kutish shart emas.
+
+Faqat anonim foydalanuvchilar keshdan oladi (qobiq sahifalarni esa hamma -
+ular foydalanuvchidan mustaqil, page_shell.py). CSRF token keshga
+yozilmaydi: render paytida o'rniga placeholder qo'yiladi va har bir javobda
+joriy foydalanuvchining tokeni bilan almashtiriladi.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import translation
+
+from .page_shell import is_page_shell
+
+CONTENT_VERSION = 'content'
+CSRF_PLACEHOLDER = '__news_csrf_token__'
+# Process versiyani bazadan shuncha soniyada bir marta o'qiydi
+VERSION_CHECK_INTERVAL = getattr(settings, 'NEWS_VERSION_CHECK_INTERVAL', 2)
+
+# name -> (qiymat, keyingi tekshiruv vaqti); faqat shu process uchun
+_versions = {}
+
+
+def get_version(name):
+    """
+    Versiya bazadagi CacheVersion qatorida saqlanadi: LocMem kesh har process
+    uchun alohida, worker yoki cron dagi bump web processlarga yetib bormasdi.
+    Processlar uni VERSION_CHECK_INTERVAL da bir marta o'qiydi.
+    """
+    from .models import CacheVersion
+
+    cached = _versions.get(name)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    # Replikadan emas: kechikkan versiya bilan eski sahifa qayta keshlanardi
+    versions = CacheVersion.objects.using(DEFAULT_DB_ALIAS)
+    value = versions.filter(name=name).values_list('value', flat=True).first()
+    if value is None:
+        # Jadval tozalangan bo'lsa vaqtdan boshlaymiz, eski sahifalar qayta ishlatilmaydi
+        value = versions.get_or_create(name=name, defaults={'value': int(time.time())})[0].value
+    _versions[name] = (value, time.monotonic() + VERSION_CHECK_INTERVAL)
+    return value
+
+
+def bump_version(name):
+    from .models import CacheVersion
+
+    versions = CacheVersion.objects.using(DEFAULT_DB_ALIAS).filter(name=name)
+    if not versions.update(value=F('value') + 1):
+        versions.get_or_create(name=name, defaults={'value': int(time.time())})
+        versions.update(value=F('value') + 1)
+    value = versions.values_list('value', flat=True).get()
+    _versions[name] = (value, time.monotonic() + VERSION_CHECK_INTERVAL)
+    return value
+
+
+def get_content_version():
+    return get_version(CONTENT_VERSION)
+
+
+def bump_content_version():
+    return bump_version(CONTENT_VERSION)
+
+
+class CachedPageMixin:
+    """
+    ListView/DetailView uchun mixin: anonim GET so'rovlarga tayyor HTML
+    ni keshdan qaytaradi.
+    """
+    page_cache_timeout = getattr(settings, 'NEWS_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+    page_cache_params = ('page', 'cursor')
+
+    def is_page_cacheable(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        # ?q=..., ?category=... kabi boshqa parametrlar shablonga ta'sir qiladi
+        if any(param not in self.page_cache_params for param in request.GET):
+            return False
+        if is_page_shell(request):
+            # Sessiya va messages'ga tegilmaydi - sahifa hamma uchun bir xil
+            return True
+        if request.user.is_authenticated:
+            return False
+        # Navbatdagi messages bo'lsa sahifa shaxsiy hisoblanadi
+        if len(messages.get_messages(request)):
+            return False
+        return True
+
+    def get_page_cache_key(self, request):
+        parts = [
+            translation.get_language() or settings.LANGUAGE_CODE,
+            request.path,
+            request.GET.get('page', '1'),
+            request.GET.get('cursor', ''),
+            'shell' if is_page_shell(request) else '',
+        ]
+        digest = hashlib.md5(':'.join(parts).encode('utf-8')).hexdigest()
+        return f'news:page:{digest}'
+
+    def dispatch(self, request, *args, **kwargs):
+        self.page_cache_key = None
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        version = get_content_version()
+        content = cache.get(key, version=version)
+        if content is not None:
+            return self.page_cache_response(request, content)
+
+        self.page_cache_key = key
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            def store(rendered):
+                cache.set(key, rendered.content, self.page_cache_timeout, version=version)
+                rendered.content = self.insert_csrf_token(request, rendered.content)
+            response.add_post_render_callback(store)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.page_cache_key:
+            context['csrf_token'] = CSRF_PLACEHOLDER
+        return context
+
+    def insert_csrf_token(self, request, content):
+        # Qobiq sahifada placeholder yo'q - get_token() CSRF cookie o'rnatmasin
+        if CSRF_PLACEHOLDER.encode() not in content:
+            return content
+        return content.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode())
+
+    def page_cache_response(self, request, content):
+        return HttpResponse(self.insert_csrf_token(request, content))
@@ -0,0 +1,160 @@
+"""
+Sahifa qobig'i (page shell): reverse proxy keshlay oladigan ochiq sahifalar.
+
+Bosh sahifa, yangiliklar ro'yxati, kategoriya va yangilik sahifalari GET
+so'rovda foydalanuvchidan mustaqil render qilinadi:
+
+  - user menyusi anonim ko'rinishda, CSRF token va messages yo'q;
+  - faqat ma'lum foydalanuvchilarga ko'rinadigan bloklar ({% authblock %})
+    `data-auth` bilan yashirin holda chiqadi;
+  - ko'rish view ichida emas, sahifadagi beacon bilan hisoblanadi.
+
+Shuning uchun javob sessiyaga tegmaydi, cookie o'rnatmaydi va unga
+`Cache-Control: public, max-age=0, s-maxage=NEWS_SHELL_S_MAXAGE` qo'yiladi,
+Vary dan Cookie olib tashlanadi. Brauzer har safar ETag bilan tekshiradi,
+proxy esa sahifani hamma uchun (login qilganlar uchun ham) bitta nusxada
+saqlaydi.
+
+Foydalanuvchiga xos qismlar news:user_fragment JSON endpointidan olinadi
+(base.html dagi skript). Oddiy anonim o'quvchi uni umuman so'ramaydi -
+faqat quyidagi JS o'qiy oladigan belgi cookie'lari bo'lsa:
+
+    news_auth  - login qilingan (menyu, rollar);
+    news_flash - navbatda messages bor (masalan izoh yuborilgandan keyin).
+
+POST formalar CSRF tokenini yuborish oldidan shu endpointdan oladi.
+
+Nginx:
+
+    proxy_cache_path /var/cache/nginx/news keys_zone=news:50m inactive=1h;
+
+    location ~ ^/(uz|en|ru)/ {
+        proxy_cache news;
+        proxy_cache_revalidate on;
+        proxy_cache_bypass $cookie_news_primary$cookie_news_flash;
+        proxy_no_cache $cookie_news_primary$cookie_news_flash;
+        proxy_pass http://django;
+    }
+
+Proxy keshida sahifa NEWS_SHELL_S_MAXAGE soniyagacha eskirgan bo'lishi
+mumkin (Django keshi esa versiya bilan darhol yangilanadi).
+"""
+from django.conf import settings
+from django.contrib import messages
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.cache import cc_delim_re, patch_cache_control
+from django.utils.functional import SimpleLazyObject, empty
+
+from .snapshots import is_snapshot_request
+
+SHELL_ENABLED = getattr(settings, 'NEWS_PAGE_SHELL', True)
+S_MAXAGE = getattr(settings, 'NEWS_SHELL_S_MAXAGE', 60)
+AUTH_COOKIE = 'news_auth'
+FLASH_COOKIE = 'news_flash'
+FLASH_MAX_AGE = 60 * 5
+USER_MENU_TEMPLATE = 'news/includes/user_menu.html'
+
+
+def is_page_shell(request):
+    return getattr(request, 'page_shell', False)
+
+
+def user_roles(user):
+    """authblock va JS uchun rollar: anon, user, member (staff emas), staff, superuser, owner-<pk>."""
+    if user is None or not user.is_authenticated:
+        return ['anon']
+    roles = ['user', f'owner-{user.pk}']
+    roles.append('staff' if user.is_staff else 'member')
+    if user.is_superuser:
+        roles.append('superuser')
+    return roles
+
+
+def user_fragment_data(request):
+    """Qobiq sahifadagi foydalanuvchiga xos qismlar (news:user_fragment javobi)."""
+    return {
+        'roles': user_roles(request.user),
+        'menu': render_to_string(USER_MENU_TEMPLATE, request=request),
+        # Iteratsiya xabarlarni o'qilgan deb belgilaydi
+        'messages': [{'tags': message.tags, 'text': str(message)} for message in messages.get_messages(request)],
+        'csrfToken': get_token(request),
+    }
+
+
+class PageShellMixin:
+    """View'ning GET javobini qobiq sifatida belgilaydi (boshqa mixinlardan oldin turishi kerak)."""
+
+    def dispatch(self, request, *args, **kwargs):
+        # Statik sahifa (snapshots.py) ham qobiq - sozlamadan qat'i nazar
+        request.page_shell = request.method in ('GET', 'HEAD') and (
+            SHELL_ENABLED or is_snapshot_request(request)
+        )
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if is_page_shell(self.request):
+            # {% csrf_token %} hech narsa chiqarmaydi va get_token() chaqirilmaydi
+            context['csrf_token'] = 'NOTPROVIDED'
+        return context
+
+
+def _evaluated_user(request):
+    """So'rov davomida allaqachon olingan foydalanuvchi (aks holda None - sessiyaga tegmaymiz)."""
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return user
+
+
+class PageShellMiddleware:
+    """
+    Qobiq javoblariga ochiq kesh sarlavhalarini qo'yadi, qolganlarida belgi
+    cookie'larini yangilaydi. SessionMiddleware va MessageMiddleware dan
+    oldin turishi kerak (javobni ulardan keyin ko'radi).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if is_page_shell(request) and response.status_code in (200, 304) and not response.cookies:
+            patch_cache_control(response, public=True, max_age=0, s_maxage=S_MAXAGE)
+            self.drop_cookie_vary(response)
+        else:
+            self.sync_auth_cookie(request, response)
+            self.sync_flash_cookie(request, response)
+        return response
+
+    def drop_cookie_vary(self, response):
+        vary = [field for field in cc_delim_re.split(response.get('Vary', '')) if field and field.lower() != 'cookie']
+        if vary:
+            response['Vary'] = ', '.join(vary)
+        elif response.has_header('Vary'):
+            del response['Vary']
+
+    def sync_auth_cookie(self, request, response):
+        user = _evaluated_user(request)
+        if user is None:
+            return
+        if user.is_authenticated and AUTH_COOKIE not in request.COOKIES:
+            response.set_cookie(
+                AUTH_COOKIE, '1', max_age=settings.SESSION_COOKIE_AGE,
+                secure=settings.SESSION_COOKIE_SECURE, samesite='Lax',
+            )
+        elif not user.is_authenticated and AUTH_COOKIE in request.COOKIES:
+            response.delete_cookie(AUTH_COOKIE, samesite='Lax')
+
+    def sync_flash_cookie(self, request, response):
+        storage = getattr(request, '_messages', None)
+        if storage is None:
+            return
+        if storage._queued_messages:
+            response.set_cookie(
+                FLASH_COOKIE, '1', max_age=FLASH_MAX_AGE,
+                secure=settings.SESSION_COOKIE_SECURE, samesite='Lax',
+            )
+        elif storage.used and FLASH_COOKIE in request.COOKIES:
+            response.delete_cookie(FLASH_COOKIE, samesite='Lax')
@@ -0,0 +1,267 @@
+"""
+Keyset (cursor) paginatsiya.
+
+Django Paginator har bir sahifada COUNT(*) va OFFSET ishlatadi: ?page=5000
+kabi chuqur sahifalar chiziqli sekinlashadi. Bu yerda:
+
+  - CachedCountPaginator: oddiy Paginator, lekin COUNT(*) natijasi keshlanadi
+    (taxminiy jami, kontent versiyasi o'zgarganda yangilanadi);
+  - CursorPaginator: (published_at, id) kabi tartib ustunlari bo'yicha
+    "shu qiymatdan keyingilar" so'rovi - OFFSET yo'q, har sahifa indeks bilan;
+  - CursorPaginationMixin: ListView uchun. Birinchi sahifalar odatdagi
+    ?page=N bilan ishlaydi (page_obj shablon kontrakti o'zgarmaydi), undan
+    keyin ?cursor=... tokenlari bilan davom etiladi. Eski ?page=N havolalari
+    cursorga yo'naltiriladi: cursor bitta OFFSET so'rov bilan topiladi va
+    kontent versiyasi bo'yicha keshlanadi, MAX_REDIRECT_PAGES dan keyin 404.
+
+Cursor tokenlari imzolangan (django.core.signing), ularni qo'lda yasab bo'lmaydi.
+"""
+import hashlib
+from collections.abc import Sequence
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404, HttpResponseRedirect
+
+from .page_cache import get_content_version
+
+CURSOR_SALT = 'news_app.pagination.cursor'
+COUNT_CACHE_TIMEOUT = 60 * 10
+CURSOR_CACHE_TIMEOUT = 60 * 10
+
+
+def encode_cursor(values, direction):
+    return signing.dumps({'v': values, 'd': direction}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        return data['v'], data['d']
+    except (signing.BadSignature, KeyError, TypeError):
+        raise Http404("Noto'g'ri sahifa tokeni")
+
+
+class CachedCountPaginator(Paginator):
+    """COUNT(*) ni keshlaydigan Paginator (jami son taxminiy bo'lishi mumkin)."""
+
+    @property
+    def count(self):
+        if not hasattr(self, '_cached_count'):
+            try:
+                sql = str(self.object_list.query)
+            except (AttributeError, EmptyResultSet):
+                # Ro'yxat yoki .none() - keshlash shart emas
+                sql = None
+            if sql is None:
+                self._cached_count = super().count
+            else:
+                digest = hashlib.md5(sql.encode('utf-8')).hexdigest()
+                self._cached_count = cache.get_or_set(
+                    f'news:count:{digest}',
+                    self.object_list.count,
+                    COUNT_CACHE_TIMEOUT,
+                    version=get_content_version(),
+                )
+        return self._cached_count
+
+
+class CursorPage(Sequence):
+    """Page ga o'xshash obyekt: shablonlar uchun has_next/has_previous va tokenlar."""
+
+    number = None
+
+    def __init__(self, object_list, paginator, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage ({len(self.object_list)} items)>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    @property
+    def count(self):
+        # Taxminiy jami (keshdan); aniq son keyset uchun shart emas
+        return CachedCountPaginator(self.queryset, self.per_page).count
+
+    def cursor_for(self, obj, direction):
+        return self._encode([getattr(obj, field) for field in self.fields], direction)
+
+    def cursor_after(self, index):
+        """
+        index-qatordan (0 dan) keyingi sahifa cursori, qator bo'lmasa None.
+        OFFSET so'rov chuqurlikka qarab sekinlashadi, shuning uchun natija
+        (so'rov, index) bo'yicha kontent versiyasi bilan keshlanadi.
+        """
+        rows = self.queryset.order_by(*self.ordering).values_list(*self.fields)[index:index + 1]
+        try:
+            sql = str(rows.query)
+        except EmptyResultSet:
+            return None
+        digest = hashlib.md5(sql.encode('utf-8')).hexdigest()
+        version = get_content_version()
+        cached = cache.get(f'news:cursor:{digest}', version=version)
+        if cached is None:
+            # (cursor,) - "qator yo'q" (None) ham keshlanadi
+            cached = (next((self._encode(values, 'next') for values in rows), None),)
+            cache.set(f'news:cursor:{digest}', cached, CURSOR_CACHE_TIMEOUT, version=version)
+        return cached[0]
+
+    def _encode(self, values, direction):
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        return encode_cursor(values, direction)
+
+    def _keyset_filter(self, values, forward):
+        """
+        (a, b) > (x, y) ni tartib yo'nalishini hisobga olib Q ga aylantiradi:
+        a > x OR (a = x AND b > y)
+        """
+        model = self.queryset.model
+        values = [model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, values)]
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def page(self, cursor=None):
+        queryset = self.queryset.order_by(*self.ordering)
+        direction = 'next'
+        if cursor:
+            values, direction = decode_cursor(cursor)
+            forward = direction == 'next'
+            queryset = queryset.filter(self._keyset_filter(values, forward))
+            if not forward:
+                # Orqaga: teskari tartibda olib, keyin qaytaramiz
+                reverse = [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+                queryset = queryset.order_by(*reverse)
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'next':
+            has_next, has_previous = has_more, bool(cursor)
+        else:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+
+        next_cursor = self.cursor_for(rows[-1], 'next') if rows and has_next else None
+        previous_cursor = self.cursor_for(rows[0], 'prev') if rows and has_previous else None
+        return CursorPage(rows, self, has_next, has_previous, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    ListView uchun: dastlabki `max_offset_pages` sahifa odatdagi ?page=N bilan,
+    undan keyingilari ?cursor=... bilan. page_obj.next_cursor har doim mavjud.
+    Eski ?page=N havolalari (max_offset_pages < N <= max_redirect_pages) shu
+    sahifaning cursoriga yo'naltiriladi, undan chuqurlari - 404.
+    """
+    cursor_ordering = ('-published_at', '-id')
+    cursor_param = 'cursor'
+    max_offset_pages = 5
+    max_redirect_pages = 1000
+    paginator_class = CachedCountPaginator
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        ordering = self.get_cursor_ordering()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        url = self.get_deep_page_redirect()
+        if url:
+            return HttpResponseRedirect(url)
+        return super().get(request, *args, **kwargs)
+
+    def get_page_number(self):
+        try:
+            return int(self.request.GET.get(self.page_kwarg) or 1)
+        except ValueError:
+            return 1
+
+    def get_deep_page_redirect(self):
+        """?page=N (N > max_offset_pages) uchun xuddi shu sahifaning ?cursor=... manzili."""
+        ordering = self.get_cursor_ordering()
+        page_number = self.get_page_number()
+        if not ordering or self.cursor_param in self.request.GET or page_number <= self.max_offset_pages:
+            return None
+        if page_number > self.max_redirect_pages:
+            # Har so'rovda OFFSET bilan minglab qatorlarni o'tkazib yubormaslik uchun
+            raise Http404("Bunday sahifa yo'q")
+        queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+        # Oldingi sahifaning oxirgi qatori - bitta (keshlangan) OFFSET so'rov, keyin sahifalar cursor bilan
+        cursor = CursorPaginator(queryset, page_size, ordering).cursor_after((page_number - 1) * page_size - 1)
+        if cursor is None:
+            raise Http404("Bunday sahifa yo'q")
+        params = self.request.GET.copy()
+        params.pop(self.page_kwarg, None)
+        params[self.cursor_param] = cursor
+        return f'{self.request.path}?{params.urlencode()}'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.get_cursor_ordering():
+            context['max_offset_pages'] = self.max_offset_pages
+        return context
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_cursor_ordering()
+        if not ordering:
+            return super().paginate_queryset(queryset, page_size)
+
+        cursor = self.request.GET.get(self.cursor_param)
+        if cursor:
+            paginator = CursorPaginator(queryset, page_size, ordering)
+            page = paginator.page(cursor)
+            return paginator, page, page.object_list, page.has_other_pages()
+
+        if self.get_page_number() > self.max_offset_pages:
+            # get() yo'naltirmagan bo'lsa (masalan get_context_data boshqa joydan chaqirilgan)
+            raise Http404("Bu sahifaga cursor orqali o'ting")
+
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        cursor_paginator = CursorPaginator(queryset, page_size, ordering)
+        rows = list(page.object_list)
+        page.next_cursor = cursor_paginator.cursor_for(rows[-1], 'next') if rows and page.has_next() else None
+        page.previous_cursor = None
+        return paginator, page, page.object_list, is_paginated
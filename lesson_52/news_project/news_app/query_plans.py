@@ -0,0 +1,48 @@
+"""
+Viewlar haqiqatda yuboradigan SQL ning EXPLAIN rejalari.
+
+Qo'lda yozilgan querysetlar view'lardagi tartib (masalan keyset
+paginatsiyaning ('-published_at', '-id') tiebreaker'i) bilan mos kelmay
+qolishi mumkin. Shuning uchun sahifa test client bilan render qilinadi,
+CaptureQueriesContext bilan yozib olingan so'rovlar EXPLAIN qilinadi.
+Ishlatiladi: explain_listings buyrug'i va news_app.tests.
+"""
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+TABLE = 'news_app_news'
+
+# Indeks ishlatilmaganini bildiruvchi belgilar (har bir reja qatoriga qo'llanadi).
+# "USE TEMP B-TREE FOR RIGHT PART OF ORDER BY" ham TEMP B-TREE ga tushadi.
+BAD_PLANS = {
+    'sqlite': (re.compile(rf'^SCAN {TABLE}\b(?!_)'), re.compile('TEMP B-TREE')),
+    'postgresql': (re.compile(rf'Seq Scan on {TABLE}\b'), re.compile(r'^\s*(->\s*)?Sort\b')),
+}
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(row[3] for row in cursor.fetchall())
+        cursor.execute('EXPLAIN ' + sql)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def bad_lines(plan):
+    markers = BAD_PLANS.get(connection.vendor, ())
+    return [line.strip() for line in plan.splitlines() if any(marker.search(line) for marker in markers)]
+
+
+def capture_plans(client, url):
+    """url ni so'rab, News jadvaliga tegadigan har bir SELECT uchun (sql, reja) qaytaradi."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    plans = [
+        (query['sql'], explain(query['sql']))
+        for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and f'"{TABLE}"' in query['sql']
+    ]
+    return response, plans
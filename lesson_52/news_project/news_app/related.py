@@ -0,0 +1,173 @@
+"""
+O'xshash yangiliklar (related news) indeksi.
+
+Avval "related_news" shunchaki o'sha kategoriyadagi istalgan 3 ta yangilik edi.
+Endi build_related buyrug'i barcha chop etilgan yangiliklarning sarlavha va
+matnidan (uz/en/ru) TF-IDF vektorlarini quradi, kosinus o'xshashlik bo'yicha
+har biriga TOP_K qo'shnini topadi va RelatedNews jadvaliga yozadi. Detail
+sahifa ularni (news, rank) indeksi bilan bitta so'rovda o'qiydi.
+
+Vektorlar siyrak (dict), o'xshashlik inverted indeks orqali faqat umumiy
+so'zi bor hujjatlar uchun hisoblanadi - numpy kerak emas.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from .models import News, RelatedNews
+
+TOP_K = 6
+TITLE_WEIGHT = 3       # sarlavha so'zlari matndagidan muhimroq
+MAX_TERMS = 60         # hujjat vektorida eng og'ir shuncha so'z qoladi
+MAX_DF_RATIO = 0.5     # yarmidan ko'p hujjatda uchraydigan so'zlar (stop so'zlar) tashlanadi
+MIN_SCORE = 0.05
+BATCH_SIZE = 500
+
+WORD_RE = re.compile(r'[^\W\d_]{3,}', re.UNICODE)
+TEXT_FIELDS = ('title', 'title_en', 'title_ru', 'content', 'content_en', 'content_ru')
+
+
+def tokenize(text):
+    return WORD_RE.findall(strip_tags(text or '').lower())
+
+
+def document_terms(row):
+    """News qiymatlari (TEXT_FIELDS tartibida) -> so'z chastotalari."""
+    terms = Counter()
+    for field, text in zip(TEXT_FIELDS, row):
+        weight = TITLE_WEIGHT if field.startswith('title') else 1
+        for token in tokenize(text):
+            terms[token] += weight
+    return terms
+
+
+class RelatedIndex:
+    """Korpus bo'yicha TF-IDF vektorlari va inverted indeks."""
+
+    def __init__(self, documents):
+        # documents: {news_id: Counter}
+        self.size = len(documents)
+        df = Counter()
+        for terms in documents.values():
+            df.update(terms.keys())
+        max_df = max(2, int(self.size * MAX_DF_RATIO))
+        # Faqat bitta hujjatda uchragan so'z o'xshashlikka hissa qo'shmaydi
+        self.idf = {
+            term: math.log(self.size / count)
+            for term, count in df.items()
+            if 1 < count <= max_df
+        }
+        self.vectors = {news_id: self.vectorize(terms) for news_id, terms in documents.items()}
+        self.postings = defaultdict(list)
+        for news_id, vector in self.vectors.items():
+            for term, weight in vector.items():
+                self.postings[term].append((news_id, weight))
+
+    def vectorize(self, terms):
+        weights = {
+            term: (1 + math.log(count)) * self.idf[term]
+            for term, count in terms.items()
+            if term in self.idf
+        }
+        top = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_TERMS]
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+        return {term: weight / norm for term, weight in top}
+
+    def neighbours(self, news_id, top_k=TOP_K):
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(news_id, {}).items():
+            for other_id, other_weight in self.postings[term]:
+                if other_id != news_id:
+                    scores[other_id] += weight * other_weight
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(other_id, score) for other_id, score in best if score >= MIN_SCORE]
+
+
+def load_index():
+    documents = {}
+    rows = News.published.values_list('pk', *TEXT_FIELDS)
+    for pk, *texts in rows.iterator(chunk_size=BATCH_SIZE):
+        documents[pk] = document_terms(texts)
+    return RelatedIndex(documents)
+
+
+def _write(neighbours_by_news):
+    """{news_id: [(related_id, score), ...]} - shu yangiliklarning qatorlarini almashtiradi."""
+    news_ids = list(neighbours_by_news)
+    rows = [
+        RelatedNews(news_id=news_id, related_id=related_id, rank=rank, score=score)
+        for news_id, neighbours in neighbours_by_news.items()
+        for rank, (related_id, score) in enumerate(neighbours)
+    ]
+    with transaction.atomic():
+        for start in range(0, len(news_ids), BATCH_SIZE):
+            RelatedNews.objects.filter(news_id__in=news_ids[start:start + BATCH_SIZE]).delete()
+        RelatedNews.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def build_related(index=None, top_k=TOP_K, batch_size=BATCH_SIZE):
+    """Butun indeksni qayta quradi. Generator: har partiyadan keyin (tayyor, jami) beradi."""
+    index = index or load_index()
+    news_ids = list(index.vectors)
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+    for start in range(0, len(news_ids), batch_size):
+        batch = news_ids[start:start + batch_size]
+        _write({news_id: index.neighbours(news_id, top_k) for news_id in batch})
+        yield min(start + batch_size, len(news_ids)), len(news_ids)
+
+
+def update_related(news_ids, index=None, top_k=TOP_K):
+    """
+    Yangi chop etilgan yangiliklar uchun: ularning qo'shnilarini yozadi va
+    qo'shnilar ro'yxatiga ham (agar eng kuchsizidan yaxshiroq bo'lsa) qo'shadi.
+    """
+    index = index or load_index()
+    news_ids = [news_id for news_id in news_ids if news_id in index.vectors]
+    if not news_ids:
+        return 0
+
+    updates = {news_id: index.neighbours(news_id, top_k) for news_id in news_ids}
+
+    # Teskari yo'nalish: yangi hujjat qo'shnining top-K iga kirishi mumkin
+    affected = defaultdict(list)
+    for news_id, neighbours in updates.items():
+        for other_id, score in neighbours:
+            if other_id not in updates:
+                affected[other_id].append((news_id, score))
+    current = defaultdict(list)
+    for news_id, related_id, score in RelatedNews.objects.filter(news_id__in=affected).values_list('news_id', 'related_id', 'score'):
+        current[news_id].append((related_id, score))
+    for other_id, candidates in affected.items():
+        merged = dict(current[other_id])
+        merged.update(candidates)
+        best = sorted(merged.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        if best != sorted(current[other_id], key=lambda item: item[1], reverse=True):
+            updates[other_id] = best
+
+    _write(updates)
+    return len(news_ids)
+
+
+def get_related_news(news, size=3):
+    """
+    Indeksdagi o'xshash yangiliklar (bitta so'rov). Indeks hali qurilmagan
+    bo'lsa o'sha kategoriyadagi so'nggi yangiliklar qaytariladi.
+    """
+    related = list(
+        News.published.cards()
+        .filter(related_from__news=news)
+        .order_by('related_from__rank')[:size]
+    )
+    if related:
+        return related
+    return list(
+        News.published.cards()
+        .filter(category_id=news.category_id)
+        .exclude(pk=news.pk)
+        .order_by('-published_at')[:size]
+    )
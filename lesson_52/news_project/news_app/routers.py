@@ -0,0 +1,105 @@
+"""
+O'qish replikalari (read replicas).
+
+DB_REPLICAS sozlangan bo'lsa (news_project/database.py) news_app modellarini
+o'qish so'rovlari replikalarga, barcha yozuvlar esa primary ('default')
+bazaga yuboriladi. Replikadan faqat quyidagilar o'qiladi:
+
+  - @replica_reads bilan belgilangan ochiq viewlar (bosh sahifa, ro'yxat,
+    qidiruv, detail...) ichidagi GET/HEAD so'rovlar;
+  - ReplicaMiddleware ularni belgilaydi, qolgan hamma narsa (admin, CRUD,
+    accounts, fon oqimlari - ViewCounter) primary'dan.
+
+Read-your-writes:
+  - so'rov ichida birorta yozuv bo'lsa, shu so'rovdagi keyingi o'qishlar
+    ham primary'dan (db_for_write);
+  - POST kabi so'rovdan keyin STICKY_SECONDS davomida `news_primary`
+    cookie bor - izoh yozgan foydalanuvchi o'z izohini replika kechikishisiz ko'radi.
+    @no_sticky bilan belgilangan viewlar (ko'rish beacon'i) bundan mustasno:
+    ular faqat hisoblagichga yozadi, aks holda har bir o'quvchi primary'ga
+    (va proxy keshidan tashqariga) o'tib qolardi.
+
+Lokal sinov uchun: DB_REPLICAS=db.replica.sqlite3 va
+`python manage.py sync_replica --interval 5` (replikatsiyaning o'rnida).
+"""
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_APPS = {'news_app'}
+STICKY_COOKIE = 'news_primary'
+STICKY_SECONDS = getattr(settings, 'NEWS_REPLICA_STICKY_SECONDS', 15)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = contextvars.ContextVar('news_use_replica', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def replica_reads(view):
+    """View (funksiya yoki klass) o'qishlari replikadan bo'lishi mumkinligini belgilaydi."""
+    view.replica_reads = True
+    return view
+
+
+def no_sticky(view):
+    """POST dan keyin news_primary cookie o'rnatilmaydi (yozuvi sahifada ko'rinmaydigan viewlar)."""
+    view.replica_sticky = False
+    return view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or model._meta.app_label not in REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        # Bog'langan obyektlar o'sha bazadan (replikalar turlicha kechikishi mumkin)
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Shu so'rovdagi keyingi o'qishlar yozilgan ma'lumotni ko'rishi uchun
+        _use_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar primary'ning nusxasi - ma'lumotlar bir xil
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _use_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        if (
+            request.method not in SAFE_METHODS
+            and replica_aliases()
+            and getattr(request, 'replica_sticky', True)
+        ):
+            response.set_cookie(STICKY_COOKIE, '1', max_age=STICKY_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        request.replica_sticky = getattr(view, 'replica_sticky', True)
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view, 'replica_reads', False)
+            and STICKY_COOKIE not in request.COOKIES
+        ):
+            _use_replica.set(True)
@@ -0,0 +1,236 @@
+"""
+Yangiliklar uchun to'liq matnli qidiruv (full-text search).
+
+Avval SearchResultsView har bir qidiruvda title/content/category bo'yicha
+icontains (LIKE '%...%') ishlatardi - bu butun jadvalni skanerlaydi va
+natijalar reytingsiz chiqadi. Endi qidiruv indeks orqali ishlaydi:
+
+  - SQLite:   FTS5 virtual jadvali (news_app_news_fts), bm25() reyting
+  - Postgres: search_uz/search_en/search_ru tsvector ustunlari + GIN indeks
+  - simple:   eski icontains usuli (indeks bo'lmasa yoki benchmark uchun)
+
+Backend NEWS_SEARCH_BACKEND sozlamasi bilan tanlanadi ('auto' - baza turiga
+qarab). Indeks News/Category signallaridan yangilanib turadi.
+
+Indeksda qoralamalar ham bor (status queryset.update() bilan signalsiz ham
+o'zgarishi mumkin), shuning uchun reyting so'rovi status bo'yicha LIMIT dan
+oldin filtrlaydi - aks holda qoralamalar MAX_RESULTS o'rinlarini egallaydi.
+"""
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, IntegerField, Q, When
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'news_app_news_fts'
+MAX_RESULTS = getattr(settings, 'NEWS_SEARCH_MAX_RESULTS', 500)
+
+LANGUAGES = ('uz', 'en', 'ru')
+
+# Postgres matn qidiruv konfiguratsiyalari (o'zbek tili uchun stemmer yo'q)
+PG_CONFIGS = {'uz': 'simple', 'en': 'english', 'ru': 'russian'}
+
+# FTS5 ustunlari tartibi - bm25() og'irliklari shu tartibda beriladi
+FTS_COLUMNS = (
+    'title', 'title_en', 'title_ru',
+    'content', 'content_en', 'content_ru',
+    'category', 'category_en', 'category_ru',
+)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _tokens(query):
+    return TOKEN_RE.findall(query.lower())
+
+
+def _language(language):
+    language = (language or settings.LANGUAGE_CODE)[:2]
+    return language if language in LANGUAGES else 'uz'
+
+
+def _order_by_ids(queryset, ids):
+    """Backend qaytargan reyting tartibini saqlagan holda queryset qaytaradi."""
+    if not ids:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ordering)
+
+
+class BaseSearchBackend:
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def search(self, query, language=None):
+        from .models import News
+
+        ids = self.ranked_ids(query, _language(language))
+        # Reyting va natijalar bitta bazadan (replikalar turlicha kechikishi mumkin)
+        return _order_by_ids(News.published.db_manager(self.using).all(), ids)
+
+    def ranked_ids(self, query, language):
+        raise NotImplementedError
+
+    def index(self, news):
+        pass
+
+    def remove(self, news_id):
+        pass
+
+    def index_category(self, category):
+        for news in category.news.select_related('category'):
+            self.index(news)
+
+    def rebuild(self):
+        pass
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Eski icontains qidiruvi: indeks talab qilmaydi, lekin butun jadvalni skanerlaydi."""
+
+    def search(self, query, language=None):
+        from .models import News
+
+        return News.published.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(category__name__icontains=query)
+        ).order_by('-published_at').distinct()
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+
+    def _match_expression(self, query):
+        # Foydalanuvchi kiritgan matnni FTS5 sintaksisidan himoyalaymiz:
+        # har bir so'z qo'shtirnoq ichida va prefiks bo'yicha qidiriladi
+        return ' '.join(f'"{token}"*' for token in _tokens(query))
+
+    def _weights(self, language):
+        # Joriy tildagi ustunlar yuqoriroq baholanadi, boshqalari ham topiladi
+        base = {'title': 10.0, 'content': 1.0, 'category': 4.0}
+        weights = []
+        for column in FTS_COLUMNS:
+            name, _, lang = column.partition('_')
+            weight = base[name]
+            if (lang or 'uz') != language:
+                weight *= 0.2
+            weights.append(weight)
+        return weights
+
+    def ranked_ids(self, query, language):
+        from .models import News
+
+        match = self._match_expression(query)
+        if not match:
+            return []
+        weights = ', '.join(str(weight) for weight in self._weights(language))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT n.id FROM {FTS_TABLE} JOIN news_app_news n ON n.id = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s AND n.status = %s '
+                f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s',
+                [match, News.Status.PUBLISHED, MAX_RESULTS],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _row(self, news):
+        category = news.category
+        return [
+            news.pk,
+            news.title, news.title_en or '', news.title_ru or '',
+            news.content, news.content_en or '', news.content_ru or '',
+            category.name, category.name_en or '', category.name_ru or '',
+        ]
+
+    def index(self, news):
+        columns = ', '.join(('rowid',) + FTS_COLUMNS)
+        placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [news.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} ({columns}) VALUES ({placeholders})',
+                self._row(news),
+            )
+
+    def remove(self, news_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [news_id])
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) '
+                'SELECT n.id, n.title, COALESCE(n.title_en, \'\'), COALESCE(n.title_ru, \'\'), '
+                'n.content, COALESCE(n.content_en, \'\'), COALESCE(n.content_ru, \'\'), '
+                'c.name, COALESCE(c.name_en, \'\'), COALESCE(c.name_ru, \'\') '
+                'FROM news_app_news n JOIN news_app_category c ON c.id = n.category_id'
+            )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+
+    def ranked_ids(self, query, language):
+        from .models import News
+
+        if not _tokens(query):
+            return []
+        config = PG_CONFIGS[language]
+        column = f'search_{language}'
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id FROM news_app_news '
+                f'WHERE {column} @@ websearch_to_tsquery(%s, %s) AND status = %s '
+                f'ORDER BY ts_rank({column}, websearch_to_tsquery(%s, %s)) DESC LIMIT %s',
+                [config, query, News.Status.PUBLISHED, config, query, MAX_RESULTS],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _update(self, where='', params=()):
+        assignments = []
+        for language, config in PG_CONFIGS.items():
+            suffix = '' if language == 'uz' else f'_{language}'
+            assignments.append(
+                f"search_{language} = "
+                f"setweight(to_tsvector('{config}', COALESCE(n.title{suffix}, '')), 'A') || "
+                f"setweight(to_tsvector('{config}', COALESCE(c.name{suffix}, '')), 'B') || "
+                f"setweight(to_tsvector('{config}', COALESCE(n.content{suffix}, '')), 'C')"
+            )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE news_app_news n SET {", ".join(assignments)} '
+                f'FROM news_app_category c WHERE c.id = n.category_id {where}',
+                params,
+            )
+
+    def index(self, news):
+        self._update('AND n.id = %s', [news.pk])
+
+    def index_category(self, category):
+        self._update('AND n.category_id = %s', [category.pk])
+
+    def rebuild(self):
+        self._update()
+
+
+BACKENDS = {
+    'simple': 'news_app.search.SimpleSearchBackend',
+    'sqlite': 'news_app.search.SQLiteFTSBackend',
+    'postgresql': 'news_app.search.PostgresSearchBackend',
+}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    name = getattr(settings, 'NEWS_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        vendor = connections[using].vendor
+        name = vendor if vendor in BACKENDS else 'simple'
+    return import_string(BACKENDS.get(name, name))(using=using)
@@ -1,59 +1,102 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from deep_translator import GoogleTranslator
-from .models import News, Category
+from .models import News, Category, Comment
+from .comments import refresh_comment_counts
+from .images import schedule_variants
+from .page_cache import bump_content_version
+from .search import get_search_backend
+from .snapshots import SNAPSHOT_ROOT, snapshot_publisher, targets_for_news
+from .translation_jobs import (
+    TARGET_LANGUAGES,
+    TRANSLATABLE_FIELDS,
+    enqueue_translation,
+    missing_fields,
+)
 
+# --- NEWS TRANSLATION ---
+# Tarjima so'rov ichida bajarilmaydi: faqat navbatga job yoziladi,
+# uni `manage.py translation_worker` fonda bajaradi
 @receiver(post_save, sender=News)
 def auto_translate_news(sender, instance, created, **kwargs):
     if not created:
         return
-
-    changed = False
-
-    try:
-        print("🟢 Tarjima jarayoni boshlandi:", instance.title)
-        # Title tarjimalari
-        if not instance.title_en:
-            instance.title_en = GoogleTranslator(source='uz', target='en').translate(instance.title)
-            changed = True
-        if not instance.title_ru:
-            instance.title_ru = GoogleTranslator(source='uz', target='ru').translate(instance.title)
-            changed = True
-
-        # Content tarjimalari
-        if not instance.content_en:
-            instance.content_en = GoogleTranslator(source='uz', target='en').translate(instance.content)
-            changed = True
-        if not instance.content_ru:
-            instance.content_ru = GoogleTranslator(source='uz', target='ru').translate(instance.content)
-            changed = True
-
-    except Exception as e:
-        print(f"Tarjima xatosi: {e}")
-
-    if changed:
-        instance.save()
-        print("✅ Tarjima saqlandi:", instance.title)
+    if missing_translations(instance, 'news_app.news'):
+        transaction.on_commit(lambda: enqueue_translation(instance))
 
 # --- CATEGORY TRANSLATION ---
 @receiver(post_save, sender=Category)
 def auto_tarnslate_category(sender, instance, created, **kwargs):
     if not created:
         return
-    changed = False
-    try:
-        print("🟢 Tarjima jarayoni boshlandi (Category):", instance.name)
-
-        if not instance.name_en:
-            instance.name_en = GoogleTranslator(source='uz', target='en').translate(instance.name)
-            changed = True
-        if not instance.name_ru:
-            instance.name_ru = GoogleTranslator(source='uz', target='ru').translate(instance.name)
-            changed = True
-
-    except Exception as e:
-        print(f"❌ Tarjima xatosi (Category): {e}")
-
-    if changed:
-        instance.save()
-        print("✅ Tarjima saqlandi (Category):", instance.name)
+    if missing_translations(instance, 'news_app.category'):
+        transaction.on_commit(lambda: enqueue_translation(instance))
+
+
+def missing_translations(instance, label):
+    fields = TRANSLATABLE_FIELDS[label]
+    return any(missing_fields(instance, fields, target) for target in TARGET_LANGUAGES)
+
+
+# --- SAHIFA KESHINI YANGILASH ---
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_page_cache(sender, **kwargs):
+    # Kontent versiyasi oshadi -> keshdagi barcha sahifalar eskiradi
+    bump_content_version()
+
+
+# --- IZOHLAR SONI ---
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_comment_count(sender, instance, **kwargs):
+    # Faollik o'zgarishi ham hisobga olinishi uchun qayta sanaymiz (bitta UPDATE)
+    refresh_comment_counts([instance.news_id])
+
+
+# --- RASM NUSXALARI ---
+@receiver(post_save, sender=News)
+def build_image_variants(sender, instance, **kwargs):
+    # Rasm o'zgargan bo'lsa srcset nusxalari fonda (tranzaksiyadan keyin) yaratiladi
+    schedule_variants(instance)
+
+
+# --- STATIK SAHIFALAR (snapshots.py) ---
+@receiver(pre_save, sender=News)
+def remember_snapshot_targets(sender, instance, **kwargs):
+    # Slug yoki kategoriya o'zgarsa eski sahifalar ham yangilanishi kerak
+    if SNAPSHOT_ROOT and instance.pk:
+        instance._snapshot_old = (
+            News.objects.filter(pk=instance.pk).values_list('slug', 'category__slug').first()
+        )
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def publish_news_snapshots(sender, instance, **kwargs):
+    if not SNAPSHOT_ROOT:
+        return
+    targets, stale = targets_for_news(instance, getattr(instance, '_snapshot_old', None))
+    transaction.on_commit(lambda: snapshot_publisher.schedule(targets, stale))
+
+
+# --- QIDIRUV INDEKSI ---
+@receiver(post_save, sender=News)
+def update_search_index(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=News)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def update_category_search_index(sender, instance, created, **kwargs):
+    # Kategoriya nomi ham indekslanadi, shuning uchun uning yangiliklari qayta yoziladi
+    if not created:
+        get_search_backend().index_category(instance)
@@ -0,0 +1,230 @@
+"""
+Anonim o'quvchilar uchun oldindan render qilingan statik sahifalar.
+
+Bosh sahifa, yangilik va kategoriya sahifalari har bir til prefiksi
+(/uz/, /en/, /ru/) uchun NEWS_SNAPSHOT_ROOT ga yoziladi:
+
+    <root>/releases/<vaqt>/uz/index.html
+    <root>/releases/<vaqt>/uz/news/<slug>/index.html
+    <root>/releases/<vaqt>/uz/category/<slug>/index.html
+    <root>/current -> releases/<vaqt>
+
+To'liq qayta qurish (publish_snapshots buyrug'i) yangi release papkasiga
+yoziladi va `current` symlinki atomik almashtiriladi. News saqlanganda esa
+faqat o'sha yangilik, bosh sahifa va uning kategoriyasi (eski va yangi)
+fonda qayta render qilinadi, har bir fayl os.replace bilan almashadi.
+
+Sahifalar to'liq middleware zanjiri orqali render qilinadi. Imzolangan
+X-News-Snapshot sarlavhasi bilan sahifa har doim qobiq (page_shell.py)
+sifatida render qilinadi: CSRF token va foydalanuvchi ma'lumoti yo'q,
+ko'rish beacon bilan hisoblanadi, POST formalar CSRF tokenini yuborishdan
+oldin oladi.
+
+Nginx (faqat sessiyasiz, query'siz GET):
+
+    map $cookie_sessionid$cookie_news_primary$args $snapshot_root {
+        ""      /path/to/snapshots/current;
+        default /nonexistent;
+    }
+    location ~ ^/(uz|en|ru)/((news|category)/[^/]+/)?$ {
+        root $snapshot_root;
+        try_files ${uri}index.html @django;
+    }
+
+WhiteNoise fayllarni faqat ishga tushganda ko'radi va sessiyani
+tekshirmaydi, shuning uchun ular uchun Nginx tavsiya etiladi.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+from django.urls import reverse
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ROOT = getattr(settings, 'NEWS_SNAPSHOT_ROOT', '')
+SNAPSHOT_HEADER = 'HTTP_X_NEWS_SNAPSHOT'
+SNAPSHOT_SALT = 'news_app.snapshots'
+KEEP_RELEASES = 2
+
+
+def snapshot_token():
+    return signing.Signer(salt=SNAPSHOT_SALT).sign('snapshot')
+
+
+def is_snapshot_request(request):
+    token = request.META.get(SNAPSHOT_HEADER)
+    return bool(token) and token == snapshot_token()
+
+
+# --- Manzillar ---
+# Nishon (target): ('home',), ('news', slug) yoki ('category', slug)
+
+def target_url(target):
+    kind, *args = target
+    if kind == 'home':
+        return reverse('news:home')
+    if kind == 'news':
+        return reverse('news:news_detail', kwargs={'slug': args[0]})
+    return reverse('news:category_detail', kwargs={'slug': args[0]})
+
+
+def target_files(root, target):
+    """Har bir til uchun (url, fayl yo'li)."""
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            url = target_url(target)
+        yield url, Path(root) / url.strip('/') / 'index.html'
+
+
+def targets_for_news(news, old=None):
+    """News o'zgarganda qayta yoziladigan sahifalar. old - saqlashdan oldingi (slug, category_slug)."""
+    targets = {('home',), ('news', news.slug)}
+    if news.category_id:
+        targets.add(('category', news.category.slug))
+    stale = set()
+    if old:
+        old_slug, old_category = old
+        if old_category:
+            targets.add(('category', old_category))
+        if old_slug != news.slug:
+            stale.add(('news', old_slug))
+    return targets, stale
+
+
+def all_targets():
+    from .models import Category, News
+
+    yield ('home',)
+    for slug in Category.objects.values_list('slug', flat=True):
+        yield ('category', slug)
+    for slug in News.published.values_list('slug', flat=True).iterator(chunk_size=500):
+        yield ('news', slug)
+
+
+# --- Render ---
+
+def _client():
+    from django.test import Client
+
+    hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+    return Client(HTTP_HOST=(hosts[0].lstrip('.') if hosts else 'localhost'), **{SNAPSHOT_HEADER: snapshot_token()})
+
+
+def render(client, url):
+    """200 bo'lsa HTML, aks holda None."""
+    response = client.get(url, secure=not settings.DEBUG)
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        handle.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def remove(path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def publish(root, targets, stale=()):
+    """Nishonlarni `root` ichiga yozadi; 200 bermaganlari (yashirilgan yangilik) o'chiriladi."""
+    client = _client()
+    written = 0
+    for target in targets:
+        for url, path in target_files(root, target):
+            content = render(client, url)
+            if content is None:
+                remove(path)
+            else:
+                write_atomic(path, content)
+                written += 1
+    for target in stale:
+        for _, path in target_files(root, target):
+            remove(path)
+    return written
+
+
+# --- Releaselar ---
+
+def current_root():
+    return Path(SNAPSHOT_ROOT) / 'current'
+
+
+def publish_release(progress=None):
+    """Hamma sahifalarni yangi release'ga yozib, `current` ni atomik almashtiradi."""
+    base = Path(SNAPSHOT_ROOT)
+    releases = base / 'releases'
+    release = releases / time.strftime('%Y%m%d%H%M%S')
+    release.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    for index, target in enumerate(all_targets(), start=1):
+        written += publish(release, [target])
+        if progress and index % 50 == 0:
+            progress(index)
+
+    link = base / 'current.tmp'
+    remove(link)
+    link.symlink_to(release.relative_to(base))
+    os.replace(link, base / 'current')
+
+    for old in sorted(releases.iterdir())[:-KEEP_RELEASES]:
+        shutil.rmtree(old, ignore_errors=True)
+    return written
+
+
+class SnapshotPublisher:
+    """
+    Signal'lardan kelgan nishonlarni yig'ib, bitta fon oqimida yozadi
+    (ketma-ket bir necha saqlash bitta qayta render bo'ladi).
+    """
+
+    def __init__(self):
+        self._targets = set()
+        self._stale = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='news-snapshots')
+
+    def schedule(self, targets, stale=()):
+        with self._lock:
+            idle = not (self._targets or self._stale)
+            self._targets |= set(targets)
+            self._stale |= set(stale) - set(targets)
+        if idle:
+            self._executor.submit(self._drain)
+
+    def _drain(self):
+        with self._lock:
+            targets, self._targets = self._targets, set()
+            stale, self._stale = self._stale, set()
+        root = current_root()
+        if not root.exists():
+            # To'liq release hali qurilmagan - publish_snapshots kerak
+            return
+        try:
+            publish(root, targets, stale)
+        except Exception:
+            logger.exception("Statik sahifalarni yozib bo'lmadi")
+        finally:
+            close_old_connections()
+
+
+snapshot_publisher = SnapshotPublisher()
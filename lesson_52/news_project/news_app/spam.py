@@ -0,0 +1,30 @@
+"""
+Spam qoidalari: ContactForm va izohlar bir xil qoidalardan foydalanadi.
+
+  - contains_spam(): aniq spam (taqiqlangan so'zlar) - forma xatosi;
+  - needs_moderation(): shubhali matn (ko'p havola, takroriy belgilar) -
+    izoh qabul qilinadi, lekin active=False bilan moderatsiyaga tushadi.
+"""
+import re
+
+SPAM_KEYWORDS = ('spam',)
+BLOCKED_EMAIL_DOMAINS = ('spam.com', 'fake.com')
+
+MAX_LINKS = 2
+LINK_RE = re.compile(r'https?://|www\.', re.IGNORECASE)
+REPEATED_RE = re.compile(r'(.)\1{9,}')  # bir belgi 10+ marta ketma-ket
+
+
+def contains_spam(text):
+    text = (text or '').lower()
+    return any(keyword in text for keyword in SPAM_KEYWORDS)
+
+
+def is_blocked_email(email):
+    domain = (email or '').rpartition('@')[2].lower()
+    return domain in BLOCKED_EMAIL_DOMAINS
+
+
+def needs_moderation(text):
+    text = text or ''
+    return len(LINK_RE.findall(text)) > MAX_LINKS or bool(REPEATED_RE.search(text))
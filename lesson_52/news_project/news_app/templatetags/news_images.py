@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from news_app.images import WIDTHS, available_formats, srcset
+from news_app.thumbnails import thumbnail_url
+
+register = template.Library()
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+@register.simple_tag
+def responsive_image(field_file, variants=None, sizes='100vw', **attrs):
+    """
+    {% responsive_image item.image item.image_variants sizes="120px" alt="..." class="..." %}
+
+    Nusxalar tayyor bo'lsa <picture> (AVIF/WebP <source> + JPEG srcset),
+    aks holda (hali fonda ishlanmoqda yoki eski rasm) srcset /media/thumb/
+    orqali talab bo'yicha kichraytiriladi.
+    """
+    if not field_file:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    extra = format_html_join(' ', '{}="{}"', attrs.items())
+
+    variants = variants or {}
+    if variants.get('source') != field_file.name or not variants.get('formats'):
+        fallback = ', '.join(f'{thumbnail_url(field_file, width)} {width}w' for width in WIDTHS)
+        return format_html('<img src="{}" srcset="{}" sizes="{}" {}>', field_file.url, fallback, sizes, extra)
+
+    sources = [
+        format_html('<source type="{}" srcset="{}" sizes="{}">', MIME_TYPES[name], srcset(variants, name), sizes)
+        for name in available_formats()
+        if name in MIME_TYPES and name in variants['formats']
+    ]
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        mark_safe(''.join(sources)),
+        field_file.url,
+        srcset(variants, 'jpeg'),
+        sizes,
+        extra,
+    )
+
+
+@register.filter
+def thumbnail(field_file, size):
+    """{{ item.image|thumbnail:"100x80" }} - NEWS_THUMB_SIZES dagi o'lchamda rasm URL'i."""
+    if not field_file:
+        return ''
+    width, height = (int(part) for part in size.split('x'))
+    return thumbnail_url(field_file, width, height)
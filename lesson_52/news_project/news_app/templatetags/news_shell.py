@@ -0,0 +1,64 @@
+from django import template
+from django.utils.html import format_html
+
+from news_app.page_shell import is_page_shell, user_roles
+
+register = template.Library()
+
+
+class AuthBlockNode(template.Node):
+    def __init__(self, nodelist, roles, owner, tag):
+        self.nodelist = nodelist
+        self.roles = roles
+        self.owner = owner
+        self.tag = tag
+
+    def render(self, context):
+        roles = {role.resolve(context) for role in self.roles}
+        if self.owner is not None:
+            owner = self.owner.resolve(context)
+            if owner:
+                roles.add(f'owner-{owner}')
+        request = context.get('request')
+
+        if is_page_shell(request):
+            # Qobiqda foydalanuvchi noma'lum: blok yashirin chiqadi, base.html dagi skript rollarga qarab ochadi
+            return format_html(
+                '<{tag} data-auth="{}"{}>{}</{tag}>',
+                ' '.join(sorted(roles)),
+                '' if 'anon' in roles else ' hidden',
+                self.nodelist.render(context),
+                tag=self.tag or 'div',
+            )
+        if roles.intersection(user_roles(getattr(request, 'user', None))):
+            if self.tag:
+                return format_html('<{tag}>{}</{tag}>', self.nodelist.render(context), tag=self.tag)
+            return self.nodelist.render(context)
+        return ''
+
+
+@register.tag
+def authblock(parser, token):
+    """
+    {% authblock "staff" "superuser" owner=news_item.author_id %} ... {% endauthblock %}
+
+    Ichidagi qism foydalanuvchida rollardan biri bo'lsa chiqadi
+    (rollar: news_app.page_shell.user_roles). tag="li" - o'ram element
+    (masalan <ul> ichida div bo'lmasligi uchun), har ikki rejimda chiqadi.
+    """
+    bits = token.split_contents()[1:]
+    owner = None
+    tag = None
+    roles = []
+    for bit in bits:
+        if bit.startswith('owner='):
+            owner = parser.compile_filter(bit[len('owner='):])
+        elif bit.startswith('tag='):
+            tag = bit[len('tag='):].strip('"\'')
+        else:
+            roles.append(parser.compile_filter(bit))
+    if not roles and owner is None:
+        raise template.TemplateSyntaxError("authblock kamida bitta rol talab qiladi")
+    nodelist = parser.parse(('endauthblock',))
+    parser.delete_first_token()
+    return AuthBlockNode(nodelist, roles, owner, tag)
@@ -1,3 +1,815 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import tempfile
+import warnings
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone, translation
+from PIL import Image
+
+from . import comments, page_cache, thumbnails
+from .admin import CommentAdmin
+from .comments import TokenBucket, comment_queue, refresh_comment_counts
+from .context_processor import latest_news
+from .forms import CommentForm
+from .images import available_formats, process_instance
+from .models import CacheVersion, Category, Comment, DeferredFieldWarning, News, NewsViewBucket, PendingComment, PopularNews, TranslationJob, TranslationMemory
+from .query_plans import bad_lines, capture_plans
+from .routers import STICKY_COOKIE
+from .search import FTS_COLUMNS, SQLiteFTSBackend
+from .snapshots import SNAPSHOT_HEADER, is_snapshot_request, publish, snapshot_token, targets_for_news
+from .page_cache import bump_content_version, get_content_version
+from .page_shell import AUTH_COOKIE
+from .translation_jobs import MAX_ATTEMPTS, RETRY_DELAY, process_jobs
+from .translation_memory import TranslationMemoryTranslator
+from .translators import BaseTranslator, FakeTranslator, GoogleTranslatorBackend, TranslationError
+from .trending import bump_popular_version, current_hour, get_popular_version, rebuild_popular, record_buckets
+from .thumbnails import ThumbnailCache
+from .view_counter import ViewCounter, view_counter
+
+# Fayl keshi (DEBUG) testlar orasida saqlanib qolmasligi uchun
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'news-tests'}}
+CATEGORY_NAMES = ['Mahalliy', 'Xorij', 'Sport', 'Texnologiya']
+
+# Replika marshrutlash testlari uchun primary'ning ko'zgusi (DB_REPLICAS=... bilan bir xil).
+# Test bazalari yaratilishidan oldin (modul import qilinganda) qo'shiladi. SQLite xotiradagi
+# test bazasida ko'zgu alohida ulanish: u faqat o'qiydi va test tranzaksiyasidagi
+# ma'lumotlarni ko'rishi uchun read_uncommitted
+REPLICA = 'replica1'
+if REPLICA not in connections.settings:
+    replica = {**settings.DATABASES[DEFAULT_DB_ALIAS], 'TEST': {'MIRROR': DEFAULT_DB_ALIAS}}
+    if replica['ENGINE'].endswith('sqlite3'):
+        replica['OPTIONS'] = {'init_command': 'PRAGMA read_uncommitted=1'}
+    connections.settings[REPLICA] = settings.DATABASES[REPLICA] = replica
+
+
+def create_news(author, categories, count, start=0):
+    now = timezone.now()
+    return [
+        News.objects.create(
+            title=f'Yangilik {index}',
+            slug=f'yangilik-{index}',
+            content=f'Matn {index} ' * 20,
+            author=author,
+            category=categories[index % len(categories)],
+            published_at=now - timedelta(hours=index),
+            status=News.Status.PUBLISHED,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+@override_settings(CACHES=TEST_CACHES)
+class NewsTestData(TestCase):
+    """Bosh sahifa bo'limlari, ro'yxat va detail uchun umumiy ma'lumotlar."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader', password='secret')
+        cls.categories = [Category.objects.create(name=name, slug=name.lower()) for name in CATEGORY_NAMES]
+        cls.news = create_news(cls.user, cls.categories, 12)
+        for news in cls.news[:3]:
+            for index in range(3):
+                Comment.objects.create(news=news, author=cls.user, text=f'Izoh {index}', active=True)
+
+    def setUp(self):
+        # Har test sahifa keshisiz (birinchi so'rov) holatni o'lchaydi
+        cache.clear()
+        # Versiyalar bazadan bir marta o'qiladi - so'rovlar soni vaqtga bog'liq bo'lmasin
+        interval = mock.patch('news_app.page_cache.VERSION_CHECK_INTERVAL', 60 * 60)
+        interval.start()
+        self.addCleanup(interval.stop)
+        page_cache._versions.clear()
+        get_content_version()
+        get_popular_version()
+
+
+class QueryCountTests(NewsTestData):
+    """Sahifalardagi so'rovlar soni - N+1 regressiyalari shu yerda ushlanadi."""
+
+    HOME_QUERIES = 5
+    LIST_QUERIES = 3
+    DETAIL_QUERIES = 9
+
+    def test_home(self):
+        with self.assertNumQueries(self.HOME_QUERIES):
+            self.assertEqual(self.client.get('/uz/').status_code, 200)
+
+    def test_news_list(self):
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.assertEqual(self.client.get('/uz/news/').status_code, 200)
+
+    def test_news_detail(self):
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            self.assertEqual(self.client.get(self.news[0].get_absolute_url()).status_code, 200)
+
+    def test_context_processor(self):
+        context = latest_news(RequestFactory().get('/uz/'))
+        # Natijalar lazy - shablon ishlatganda bittadan so'rov
+        with self.assertNumQueries(2):
+            list(context['latest_news'])
+            list(context['categories'])
+
+    def test_counts_do_not_grow_with_rows(self):
+        create_news(self.user, self.categories, 12, start=100)
+        for url, expected in [('/uz/', self.HOME_QUERIES), ('/uz/news/', self.LIST_QUERIES)]:
+            cache.clear()
+            with self.subTest(url=url), self.assertNumQueries(expected):
+                self.client.get(url)
+
+
+class CardTemplateTests(NewsTestData):
+    """Kartochka shablonlari cards() da yuklanmagan ustunlarga murojaat qilmaydi."""
+
+    def card_urls(self, language):
+        urls = [f'/{language}/', f'/{language}/news/', f'/{language}/search/?q=Yangilik']
+        urls.append(f'/{language}/category/{self.categories[0].slug}/')
+        urls.append(f'/{language}/news/{self.news[0].slug}/')
+        return urls
+
+    def test_no_deferred_loads(self):
+        for language in ('uz', 'en', 'ru'):
+            for url in self.card_urls(language):
+                cache.clear()
+                with self.subTest(url=url), warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always', DeferredFieldWarning)
+                    response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    loads = [str(w.message) for w in caught if issubclass(w.category, DeferredFieldWarning)]
+                    self.assertEqual(loads, [])
+
+
+class QueryPlanTests(NewsTestData):
+    """Ro'yxat sahifalari yuboradigan so'rovlar indeks bilan bajariladi (vaqtinchalik saralash yo'q)."""
+
+    def listing_urls(self):
+        return ['/uz/', '/uz/news/', '/uz/news/?page=2', f'/uz/category/{self.categories[0].slug}/']
+
+    def test_no_temp_sort_or_full_scan(self):
+        for url in self.listing_urls():
+            cache.clear()
+            response, plans = capture_plans(self.client, url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(plans)
+            for sql, plan in plans:
+                with self.subTest(url=url, sql=sql[:80]):
+                    self.assertNotIn('TEMP B-TREE', plan)
+                    self.assertEqual(bad_lines(plan), [])
+
+    def test_cursor_page(self):
+        cursor = self.client.get('/uz/news/').context['page_obj'].next_cursor
+        self.assertTrue(cursor)
+        cache.clear()
+        response, plans = capture_plans(self.client, f'/uz/news/?{urlencode({"cursor": cursor})}')
+        self.assertEqual(response.status_code, 200)
+        for sql, plan in plans:
+            with self.subTest(sql=sql[:80]):
+                self.assertNotIn('TEMP B-TREE', plan)
+                self.assertEqual(bad_lines(plan), [])
+
+
+class ViewCounterTests(NewsTestData):
+    def test_record_does_not_write(self):
+        counter = ViewCounter(flush_interval=60 * 60)
+        with self.assertNumQueries(0):
+            counter.record(self.news[0].pk)
+        self.assertEqual(counter.pending(self.news[0].pk), 1)
+
+    def test_failed_flush_keeps_pending(self):
+        counter = ViewCounter(flush_interval=60 * 60)
+        counter.record(self.news[0].pk, 3)
+        with mock.patch('news_app.trending.record_buckets', side_effect=OperationalError('database is locked')), \
+                self.assertLogs('news_app.view_counter', 'ERROR'):
+            self.assertEqual(counter.flush(), 0)
+        self.assertEqual(counter.pending(self.news[0].pk), 3)
+
+        self.assertEqual(counter.flush(), 3)
+        self.assertEqual(counter.pending(self.news[0].pk), 0)
+        self.news[0].refresh_from_db()
+        self.assertEqual(self.news[0].views, 3)
+
+
+class RebuildPopularTests(NewsTestData):
+    def test_rebuild_updates_in_place(self):
+        hour = current_hour()
+        record_buckets({self.news[0].pk: 5, self.news[1].pk: 3}, hour=hour)
+        self.assertEqual(rebuild_popular(), 2)
+        kept = PopularNews.objects.get(news=self.news[0])
+
+        # news[1] oynadan chiqdi - faqat u o'chiriladi, qolgani shu qatorda yangilanadi
+        NewsViewBucket.objects.filter(news=self.news[1]).delete()
+        record_buckets({self.news[0].pk: 5}, hour=hour)
+        self.assertEqual(rebuild_popular(), 1)
+        self.assertEqual(list(PopularNews.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertGreater(PopularNews.objects.get().score, kept.score)
+
+
+class DeepPageTests(NewsTestData):
+    def test_deep_page_redirects_to_cursor(self):
+        create_news(self.user, self.categories, 30, start=100)
+        response = self.client.get('/uz/news/?page=6')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('?cursor=', response['Location'])
+
+        page = self.client.get(response['Location']).context['page_obj']
+        expected = list(News.published.order_by('-published_at', '-id')[30:36])
+        self.assertEqual(list(page.object_list), expected)
+
+    def test_page_past_the_end(self):
+        self.assertEqual(self.client.get('/uz/news/?page=50').status_code, 404)
+
+    def offset_queries(self, url):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        return response, [query for query in queries.captured_queries if 'OFFSET' in query['sql']]
+
+    def test_deep_page_cursor_is_cached(self):
+        create_news(self.user, self.categories, 30, start=100)
+        first, offsets = self.offset_queries('/uz/news/?page=6')
+        self.assertEqual(len(offsets), 1)
+        again, offsets = self.offset_queries('/uz/news/?page=6')
+        self.assertEqual(offsets, [])
+        self.assertEqual(again['Location'], first['Location'])
+
+        # Yangi yangilik - kontent versiyasi o'zgaradi, cursor qayta hisoblanadi
+        create_news(self.user, self.categories, 1, start=200)
+        _, offsets = self.offset_queries('/uz/news/?page=6')
+        self.assertEqual(len(offsets), 1)
+
+    def test_page_beyond_redirect_limit(self):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            response = self.client.get('/uz/news/?page=1001')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+
+    @override_settings(NEWS_SEARCH_BACKEND='simple')
+    def test_search_keeps_query(self):
+        create_news(self.user, self.categories, 30, start=100)
+        response = self.client.get('/uz/search/?q=Yangilik&page=6')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('q=Yangilik', response['Location'])
+        self.assertNotIn('page=', response['Location'])
+
+
+class LongTextTranslationTests(TestCase):
+    class UpperTranslator:
+        def __init__(self):
+            self.sizes = []
+
+        def translate(self, text):
+            self.sizes.append(len(text))
+            return text.upper()
+
+    def test_long_paragraph_is_split_not_cut(self):
+        backend = GoogleTranslatorBackend()
+        translator = self.UpperTranslator()
+        text = 'Birinchi gap. ' * 700 + '\nqisqa\n' + "so'z " * 2000 + '\n' + 'x' * 10000
+
+        result = backend._translate_long(translator, text)
+
+        self.assertTrue(all(size <= backend.MAX_CHARS for size in translator.sizes))
+        self.assertEqual(result.split(), text.upper().split())
+
+
+class CacheVersionTests(NewsTestData):
+    def test_bump_from_another_process_is_seen(self):
+        before = get_content_version()
+        # translation_worker yoki cron boshqa processda bump qiladi - faqat bazadagi qator o'zgaradi
+        CacheVersion.objects.filter(name=page_cache.CONTENT_VERSION).update(value=F('value') + 1)
+        self.assertEqual(get_content_version(), before)
+        with mock.patch('news_app.page_cache.VERSION_CHECK_INTERVAL', 0):
+            page_cache._versions.clear()
+            self.assertEqual(get_content_version(), before + 1)
+
+    def test_bump_in_process(self):
+        before = get_popular_version()
+        self.assertEqual(bump_popular_version(), before + 1)
+        self.assertEqual(get_popular_version(), before + 1)
+
+
+class TranslationJobTests(NewsTestData):
+    class BrokenTranslator(BaseTranslator):
+        def translate_batch(self, texts, source, target):
+            raise ConnectionError('tarjimon javob bermadi')
+
+    def create_news(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_news(self.user, self.categories, 1, start=500)[0]
+
+    def test_enqueue_on_save(self):
+        news = self.create_news()
+        job = TranslationJob.objects.get(model='news_app.news', object_id=news.pk)
+        self.assertEqual(job.status, TranslationJob.Status.PENDING)
+        self.assertIsNone(News.objects.get(pk=news.pk).title_en)
+
+    def test_claim_and_complete(self):
+        news = self.create_news()
+        version = get_content_version()
+
+        self.assertEqual(process_jobs(translator=FakeTranslator()), (1, 0, 0))
+
+        job = TranslationJob.objects.get(object_id=news.pk)
+        self.assertEqual((job.status, job.attempts), (TranslationJob.Status.DONE, 1))
+        news.refresh_from_db()
+        self.assertEqual(news.title_en, f'[en] {news.title}')
+        self.assertEqual(news.content_ru, f'[ru] {news.content}')
+        self.assertGreater(get_content_version(), version)
+        # Bajarilgan job qayta olinmaydi
+        self.assertEqual(process_jobs(translator=FakeTranslator()), (0, 0, 0))
+
+    def test_retry_with_backoff_until_failed(self):
+        news = self.create_news()
+        job = TranslationJob.objects.get(object_id=news.pk)
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            started = timezone.now()
+            result = process_jobs(translator=self.BrokenTranslator())
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn('tarjimon javob bermadi', job.last_error)
+            if attempt < MAX_ATTEMPTS:
+                self.assertEqual(result, (0, 1, 0))
+                self.assertEqual(job.status, TranslationJob.Status.PENDING)
+                delay = (job.run_after - started).total_seconds()
+                self.assertAlmostEqual(delay, RETRY_DELAY * 2 ** (attempt - 1), delta=5)
+                # Kechikish tugamaguncha job olinmaydi
+                self.assertEqual(process_jobs(translator=self.BrokenTranslator()), (0, 0, 0))
+                TranslationJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            else:
+                self.assertEqual(result, (0, 0, 1))
+                self.assertEqual(job.status, TranslationJob.Status.FAILED)
+        self.assertEqual(process_jobs(translator=FakeTranslator()), (0, 0, 0))
+
+
+class TranslationMemoryTests(TestCase):
+    class CountingTranslator(FakeTranslator):
+        def __init__(self, fail_with=False):
+            self.calls = []
+            self.fail_with = fail_with
+
+        def translate_batch(self, texts, source, target):
+            self.calls.append(list(texts))
+            if self.fail_with is not False:
+                return [self.fail_with for _ in texts]
+            return super().translate_batch(texts, source, target)
+
+    def test_hits_and_misses(self):
+        backend = self.CountingTranslator()
+        memory = TranslationMemoryTranslator(backend)
+
+        first = memory.translate_batch(['Salom dunyo. Yangiliklar.', 'Yangiliklar.'], 'uz', 'en')
+        self.assertEqual(first, ['[en] Salom dunyo. [en] Yangiliklar.', '[en] Yangiliklar.'])
+        self.assertEqual(backend.calls, [['Salom dunyo.', 'Yangiliklar.']])
+        self.assertEqual((memory.stats.hits, memory.stats.misses), (0, 2))
+
+        # Yangi tarjimon obyekti - natijalar bazadagi xotiradan
+        backend = self.CountingTranslator()
+        memory = TranslationMemoryTranslator(backend)
+        self.assertEqual(memory.translate_batch(['Yangiliklar. Sport.'], 'uz', 'en'), ['[en] Yangiliklar. [en] Sport.'])
+        self.assertEqual(backend.calls, [['Sport.']])
+        self.assertEqual((memory.stats.hits, memory.stats.misses), (1, 1))
+        self.assertEqual(TranslationMemory.objects.get(source_text='Yangiliklar.').hits, 1)
+
+    def test_failed_translation_is_not_cached(self):
+        for result in (None, ''):
+            with self.subTest(result=result):
+                memory = TranslationMemoryTranslator(self.CountingTranslator(fail_with=result))
+                with self.assertRaises(TranslationError):
+                    memory.translate_batch(['Salom dunyo.'], 'uz', 'en')
+                self.assertFalse(TranslationMemory.objects.exists())
+
+        memory = TranslationMemoryTranslator(self.CountingTranslator())
+        self.assertEqual(memory.translate_batch(['Salom dunyo.'], 'uz', 'en'), ['[en] Salom dunyo.'])
+
+
+class NewsArchiveTests(NewsTestData):
+    def test_reimport_counts_only_inserted_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'archive.jsonl')
+            call_command('news_archive', 'export', path, stdout=StringIO())
+            News.objects.filter(pk__in=[news.pk for news in self.news[:2]]).delete()
+
+            out = StringIO()
+            call_command('news_archive', 'import', path, stdout=out)
+        self.assertIn('news_app.News: 2 ta yozildi, 10 ta', out.getvalue())
+        self.assertIn('✅ 2 ta obyekt yozildi, 14 tasi bazada bor edi', out.getvalue())
+        self.assertEqual(News.objects.count(), 12)
+        # Sequence import qilingan pk lardan keyin davom etadi
+        news = create_news(self.user, self.categories, 1, start=900)[0]
+        self.assertGreater(news.pk, max(item.pk for item in self.news))
+
+
+class CommentIngestionTests(NewsTestData):
+    def setUp(self):
+        super().setUp()
+        # Fon oqimi ishga tushmasin - navbatni test o'zi bo'shatadi (atexit ham)
+        for attribute in ('flush_interval', '_used'):
+            patcher = mock.patch.object(comment_queue, attribute, 0)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Cheklov oynasi test davomida almashmasin
+        clock = mock.patch('news_app.comments.time.time', return_value=1_000_000.0)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def post_comment(self, news, text, ip='10.0.0.1'):
+        return self.client.post(news.get_absolute_url(), {'text': text}, REMOTE_ADDR=ip)
+
+    def test_post_is_queued_then_flushed_in_bulk(self):
+        self.client.force_login(self.user)
+        news = self.news[5]
+        version = get_content_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.post_comment(news, 'Birinchi izoh').status_code, 302)
+            self.post_comment(news, 'Ikkinchi izoh')
+            self.post_comment(news, 'Havolalar http://a.uz http://b.uz http://c.uz')
+
+        self.assertEqual(PendingComment.objects.count(), 3)
+        self.assertFalse(news.comments.exists())
+        self.assertEqual(get_content_version(), version)
+
+        # Izohlar soni bo'yicha o'smaydi: SELECT, INSERT, DELETE, son, versiya (+ savepoint)
+        with self.assertNumQueries(8):
+            self.assertEqual(comment_queue.flush(), 3)
+        self.assertFalse(PendingComment.objects.exists())
+        self.assertEqual(list(news.comments.values_list('text', 'active')), [
+            ('Birinchi izoh', True),
+            ('Ikkinchi izoh', True),
+            ('Havolalar http://a.uz http://b.uz http://c.uz', False),
+        ])
+        news.refresh_from_db()
+        self.assertEqual(news.comment_count, 2)
+        self.assertGreater(get_content_version(), version)
+
+    def test_spam_rejected_by_form(self):
+        form = CommentForm(data={'text': 'Arzon spam takliflar'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('text', form.errors)
+        self.assertTrue(CommentForm(data={'text': 'Oddiy izoh'}).is_valid())
+
+        self.client.force_login(self.user)
+        self.post_comment(self.news[5], 'Arzon spam takliflar')
+        self.assertFalse(PendingComment.objects.exists())
+
+    def test_user_bucket_limit(self):
+        self.client.force_login(self.user)
+        capacity = comments.user_bucket.capacity
+        for _ in range(capacity + 2):
+            self.post_comment(self.news[5], 'Izoh')
+        self.assertEqual(PendingComment.objects.count(), capacity)
+
+    def test_rejected_attempt_does_not_use_a_token(self):
+        bucket = TokenBucket('test', 2, 60)
+        self.assertEqual([bucket.allow('u'), bucket.allow('u'), bucket.allow('u')], [True, True, False])
+        bucket.refund('u')
+        self.assertTrue(bucket.allow('u'))
+        self.assertFalse(bucket.allow('u'))
+
+    def test_ip_rejection_refunds_user_token(self):
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.9')
+        request.user = self.user
+        for _ in range(comments.ip_bucket.capacity):
+            comments.ip_bucket.allow('10.0.0.9')
+        self.assertFalse(comments.comment_allowed(request))
+        key = comments.user_bucket.cache_key(self.user.pk)
+        self.assertEqual(cache.get(key), 0)
+
+
+class CommentModerationTests(NewsTestData):
+    def setUp(self):
+        super().setUp()
+        self.model_admin = CommentAdmin(Comment, admin.site)
+
+    def test_moderate_refreshes_counts_and_pages(self):
+        news = self.news[0]
+        version = get_content_version()
+
+        self.assertEqual(self.model_admin._moderate(news.comments.filter(text__in=['Izoh 0', 'Izoh 1']), active=False), 2)
+        news.refresh_from_db()
+        self.assertEqual(news.comment_count, 1)
+        self.assertGreater(get_content_version(), version)
+
+        self.model_admin._moderate(news.comments.filter(active=False), active=True)
+        news.refresh_from_db()
+        self.assertEqual(news.comment_count, 3)
+
+        self.assertEqual(self.model_admin._moderate(news.comments.filter(text='Izoh 2')), 1)
+        news.refresh_from_db()
+        self.assertEqual(news.comment_count, 2)
+
+
+@override_settings(DATABASE_ROUTERS=['news_app.routers.ReplicaRouter'])
+class ReplicaRoutingTests(NewsTestData):
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    def aliases_for(self, method, url, **kwargs):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(self.client, method)(url, **kwargs)
+        return response, primary.captured_queries, replica.captured_queries
+
+    def test_search_reads_from_replica(self):
+        response, primary, replica = self.aliases_for('get', '/uz/search/?q=Yangilik')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['results'].object_list)
+        self.assertEqual(primary, [])
+        # FTS reyting so'rovi ham replikada
+        self.assertTrue(any('news_app_news' in query['sql'] and 'MATCH' in query['sql'] for query in replica))
+
+    def test_list_reads_from_replica(self):
+        response, primary, replica = self.aliases_for('get', '/uz/news/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('news_app_news' in query['sql'] for query in primary))
+        self.assertTrue(any('news_app_news' in query['sql'] for query in replica))
+
+    def test_sticky_cookie_after_post(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(comment_queue, 'flush_interval', 0), mock.patch.object(comment_queue, '_used', False):
+            response = self.client.post(self.news[5].get_absolute_url(), {'text': 'Izoh'})
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+        response, primary, replica = self.aliases_for('get', '/uz/search/?q=Yangilik')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, [])
+        self.assertTrue(any('news_app_news' in query['sql'] for query in primary))
+
+
+class SnapshotTests(NewsTestData):
+    def test_targets_for_new_news(self):
+        news = self.news[0]
+        targets, stale = targets_for_news(news)
+        self.assertEqual(targets, {('home',), ('news', news.slug), ('category', news.category.slug)})
+        self.assertEqual(stale, set())
+
+    def test_targets_after_slug_and_category_change(self):
+        news = self.news[0]
+        old = (news.slug, news.category.slug)
+        news.slug = 'yangi-slug'
+        news.category = self.categories[1]
+        targets, stale = targets_for_news(news, old)
+        # Eski va yangi kategoriya qayta yoziladi, eski slug sahifasi o'chiriladi
+        self.assertEqual(targets, {
+            ('home',), ('news', 'yangi-slug'), ('category', self.categories[1].slug), ('category', old[1]),
+        })
+        self.assertEqual(stale, {('news', old[0])})
+
+    def test_same_slug_is_not_stale(self):
+        news = self.news[0]
+        targets, stale = targets_for_news(news, (news.slug, news.category.slug))
+        self.assertEqual(stale, set())
+
+    def test_snapshot_render_does_not_count_view(self):
+        news = self.news[4]
+        pending = view_counter.pending(news.pk)
+        with tempfile.TemporaryDirectory() as root:
+            self.assertEqual(publish(root, [('news', news.slug)]), len(settings.LANGUAGES))
+            html = (Path(root) / 'uz' / 'news' / news.slug / 'index.html').read_text(encoding='utf-8')
+        self.assertIn(news.title, html)
+        self.assertNotIn('csrfmiddlewaretoken" value="', html)
+        self.assertEqual(view_counter.pending(news.pk), pending)
+
+        # Statik sahifani o'qigan o'quvchini beacon hisoblaydi
+        with translation.override('uz'):
+            seen_url = reverse('news:news_seen', kwargs={'slug': news.slug})
+        self.assertIn(seen_url, html)
+        self.assertEqual(self.client.post(seen_url).status_code, 204)
+        self.assertEqual(view_counter.pending(news.pk), pending + 1)
+
+    def test_forged_snapshot_header_is_ignored(self):
+        request = RequestFactory().get('/uz/', **{SNAPSHOT_HEADER: 'snapshot'})
+        self.assertFalse(is_snapshot_request(request))
+        request = RequestFactory().get('/uz/', **{SNAPSHOT_HEADER: snapshot_token()})
+        self.assertTrue(is_snapshot_request(request))
+
+
+class PageShellTests(NewsTestData):
+    def shell_urls(self):
+        return ['/uz/', '/uz/news/', self.news[4].get_absolute_url(), self.categories[0].get_absolute_url()]
+
+    def test_shell_is_same_for_every_user(self):
+        for url in self.shell_urls():
+            with self.subTest(url=url):
+                cache.clear()
+                self.client.logout()
+                anonymous = self.client.get(url)
+                cache.clear()
+                self.client.force_login(self.user)
+                member = self.client.get(url)
+                self.assertEqual(anonymous.status_code, 200)
+                self.assertEqual(member.content, anonymous.content)
+                self.assertIn('public', member['Cache-Control'])
+                self.assertNotIn('sessionid', member.cookies)
+                self.assertNotIn(b'csrfmiddlewaretoken" value="', member.content)
+
+    def test_user_fragment(self):
+        url = reverse('news:user_fragment')
+        data = self.client.get(url).json()
+        self.assertEqual(data['roles'], ['anon'])
+        self.assertTrue(data['csrfToken'])
+
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertIn('no-cache', response['Cache-Control'])
+        data = response.json()
+        self.assertEqual(data['roles'], ['user', f'owner-{self.user.pk}', 'member'])
+        self.assertIn(self.user.username, data['menu'])
+        self.assertTrue(data['csrfToken'])
+        self.assertIn(AUTH_COOKIE, response.cookies)
+
+
+class ConditionalGetTests(NewsTestData):
+    def setUp(self):
+        super().setUp()
+        self.url = self.news[4].get_absolute_url()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.etag = response['ETag']
+        self.last_modified = response['Last-Modified']
+
+    def test_repeated_get_is_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=self.last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_comment_changes_etag(self):
+        news = self.news[4]
+        Comment.objects.create(news=news, author=self.user, text='Yangi izoh', active=True)
+        refresh_comment_counts([news.pk])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], self.etag)
+        self.assertContains(response, 'Yangi izoh')
+
+    def test_content_version_changes_etag(self):
+        bump_content_version()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], self.etag)
+
+
+def png_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class ImageVariantTests(NewsTestData):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.data = png_bytes(800, 400)
+        self.item = self.news[4]
+        self.item.image = SimpleUploadedFile('rasm.png', self.data, content_type='image/png')
+        self.item.save()
+
+    def test_variants_are_content_hashed(self):
+        self.assertTrue(process_instance('news_app.news', self.item.pk))
+        self.item.refresh_from_db()
+        variants = self.item.image_variants
+        digest = hashlib.sha1(self.data).hexdigest()[:20]
+        self.assertEqual(variants['source'], self.item.image.name)
+        self.assertEqual(variants['hash'], digest)
+        self.assertEqual(set(variants['formats']), set(available_formats()))
+        # 1024 asl rasmdan (800px) katta - yaratilmaydi
+        self.assertEqual(variants['formats']['jpeg'], {
+            '320': f'derivatives/{digest}/320.jpg', '640': f'derivatives/{digest}/640.jpg',
+        })
+        for paths in variants['formats'].values():
+            for path in paths.values():
+                self.assertTrue(default_storage.exists(path))
+
+        # Rasm o'zgarmagan - qayta ishlanmaydi; majburan ishlansa ham fayllar qayta yozilmaydi
+        self.assertFalse(process_instance('news_app.news', self.item.pk))
+        path = default_storage.path(variants['formats']['jpeg']['320'])
+        mtime = os.stat(path).st_mtime_ns
+        self.assertTrue(process_instance('news_app.news', self.item.pk, force=True))
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def render_tag(self):
+        template = Template('{% load news_images %}{% responsive_image item.image item.image_variants sizes="120px" alt="x" %}')
+        return template.render(Context({'item': self.item}))
+
+    def test_responsive_image_srcset(self):
+        # Nusxalar hali yo'q - talab bo'yicha kichraytirish manzillari
+        html = self.render_tag()
+        self.assertIn('/thumb/', html)
+        self.assertIn(' 320w', html)
+        self.assertNotIn('<picture>', html)
+
+        process_instance('news_app.news', self.item.pk)
+        self.item.refresh_from_db()
+        html = self.render_tag()
+        digest = self.item.image_variants['hash']
+        self.assertIn('<picture>', html)
+        self.assertIn(f'/media/derivatives/{digest}/320.jpg 320w, /media/derivatives/{digest}/640.jpg 640w', html)
+        self.assertIn('sizes="120px"', html)
+        self.assertIn('alt="x"', html)
+        if 'webp' in available_formats():
+            self.assertIn('<source type="image/webp"', html)
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        patcher = mock.patch('news_app.thumbnails.thumbnail_cache', ThumbnailCache(Path(media.name) / 'cache', 10 ** 7))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.name = default_storage.save('news/images/rasm.png', SimpleUploadedFile('rasm.png', png_bytes(800, 400)))
+        self.url = reverse('thumbnail', kwargs={'width': 320, 'height': 0, 'path': self.name})
+
+    def test_thumbnail_and_not_modified(self):
+        with mock.patch('news_app.thumbnails.source_file', wraps=thumbnails.source_file) as source_file:
+            response = self.client.get(self.url, HTTP_ACCEPT='image/jpeg')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/jpeg')
+            self.assertEqual(Image.open(io.BytesIO(b''.join(response.streaming_content))).size, (320, 160))
+            response.close()
+            # ETag va view uchun asl fayl bir marta tekshiriladi
+            self.assertEqual(source_file.call_count, 1)
+
+            response = self.client.get(self.url, HTTP_ACCEPT='image/jpeg', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(source_file.call_count, 2)
+
+        # Keshdan (ochiq fayl)
+        response = self.client.get(self.url, HTTP_ACCEPT='image/jpeg')
+        self.assertEqual(len(b''.join(response.streaming_content)), int(response['Content-Length']))
+        response.close()
+
+    def test_broken_image_is_404(self):
+        name = default_storage.save('news/images/buzuq.jpg', SimpleUploadedFile('buzuq.jpg', b'rasm emas'))
+        response = self.client.get(reverse('thumbnail', kwargs={'width': 320, 'height': 0, 'path': name}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_size_or_missing_file_is_404(self):
+        self.assertEqual(self.client.get(self.url.replace('320x0', '321x0')).status_code, 404)
+        self.assertEqual(self.client.get(self.url.replace('rasm.png', 'yoq.png')).status_code, 404)
+
+
+@override_settings(NEWS_SEARCH_BACKEND='sqlite')
+class SearchRankingTests(NewsTestData):
+    def add(self, title, content='Matn', status=News.Status.PUBLISHED, **fields):
+        return News.objects.create(
+            title=title, slug=f'qidiruv-{News.objects.count()}', content=content, author=self.user,
+            category=self.categories[0], status=status, **fields,
+        )
+
+    def ranked(self, query, language='uz'):
+        return SQLiteFTSBackend().ranked_ids(query, language)
+
+    def test_title_match_ranks_first(self):
+        in_content = self.add('Oddiy sarlavha', content='Bugun zilzila bo\'ldi')
+        in_title = self.add('Zilzila haqida')
+        self.assertEqual(self.ranked('zilzila'), [in_title.pk, in_content.pk])
+
+    def test_current_language_weighs_more(self):
+        english = self.add('Saylov', title_en='Election results')
+        uzbek = self.add('Election kuni')
+        self.assertEqual(self.ranked('election', 'en'), [english.pk, uzbek.pk])
+        self.assertEqual(self.ranked('election', 'uz'), [uzbek.pk, english.pk])
+
+    def test_weights(self):
+        weights = dict(zip(FTS_COLUMNS, SQLiteFTSBackend()._weights('ru')))
+        self.assertEqual(weights['title_ru'], 10.0)
+        self.assertEqual(weights['category_ru'], 4.0)
+        self.assertEqual(weights['content_ru'], 1.0)
+        self.assertAlmostEqual(weights['title'], 2.0)
+        self.assertAlmostEqual(weights['title_en'], 2.0)
+
+    def test_drafts_do_not_fill_the_limit(self):
+        for index in range(3):
+            self.add(f'Zilzila qoralama {index}', status=News.Status.DRAFT)
+        published = self.add('Oddiy', content='zilzila')
+        with mock.patch('news_app.search.MAX_RESULTS', 2):
+            self.assertEqual(self.ranked('zilzila'), [published.pk])
+        results = self.client.get('/uz/search/?q=zilzila').context['results'].object_list
+        self.assertEqual([news.pk for news in results], [published.pk])
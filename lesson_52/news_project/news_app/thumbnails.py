@@ -0,0 +1,229 @@
+"""
+Talab bo'yicha kichraytirilgan rasmlar: /media/thumb/<w>x<h>/<path>.
+
+images.py nusxalari faqat yuklash paytida yaratiladi; eski yoki shablonda
+boshqa o'lcham kerak bo'lgan rasmlar uchun bu view asl faylni MEDIA_ROOT dan
+o'qib, birinchi so'rovda kichraytiradi va diskdagi keshga yozadi:
+
+  - o'lchamlar faqat THUMB_SIZES ro'yxatidan (ixtiyoriy o'lchamlar bilan
+    diskni to'ldirib bo'lmaydi); h=0 - nisbat saqlanadi, aks holda crop;
+  - format Accept sarlavhasiga qarab: AVIF -> WebP -> JPEG (Vary: Accept);
+  - kesh hajmi CACHE_MAX_BYTES bilan cheklangan, oshsa eng uzoq vaqt
+    ishlatilmagan (mtime bo'yicha LRU) fayllar o'chiriladi;
+  - ETag asl faylning mtime/hajmidan olinadi, shuning uchun 304 javobi
+    rasmni ochmasdan qaytadi; Cache-Control: public, max-age=MAX_AGE;
+  - asl fayl so'rov davomida bir marta stat qilinadi (ETag va view uchun
+    umumiy), o'qib bo'lmaydigan rasm - 404.
+
+Productionda Nginx /media/thumb/ ni Django ga yo'naltirishi kerak
+(qolgan /media/ avvalgidek Nginx dan).
+"""
+import hashlib
+import io
+import os
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_safe
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .images import DERIVATIVES_DIR, FORMATS, flatten
+
+THUMB_SIZES = frozenset(
+    tuple(int(part) for part in size.split('x'))
+    for size in getattr(settings, 'NEWS_THUMB_SIZES', ('100x80', '200x160', '320x0', '640x0', '1024x0'))
+)
+CACHE_DIR = Path(getattr(settings, 'NEWS_THUMB_CACHE_DIR', Path(settings.MEDIA_ROOT) / 'thumb-cache'))
+CACHE_MAX_BYTES = getattr(settings, 'NEWS_THUMB_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+MAX_AGE = getattr(settings, 'NEWS_THUMB_MAX_AGE', 60 * 60 * 24 * 30)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif'}
+CONTENT_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+# Keshdagi faylning mtime'i shuncha soniyada bir martadan ko'p yangilanmaydi
+TOUCH_INTERVAL = 60
+# Tozalashda kesh shu ulushgacha kamaytiriladi (har yozuvda qayta tozalamaslik uchun)
+LOW_WATERMARK = 0.9
+
+
+class ThumbnailCache:
+    """Hajmi cheklangan disk keshi; fayllar mtime bo'yicha LRU tartibida o'chiriladi."""
+
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def path_for(self, key, extension):
+        return self.root / key[:2] / f'{key}.{extension}'
+
+    def _files(self):
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def size(self):
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._files())
+        return self._size
+
+    def get(self, key, extension):
+        """Ochiq fayl yoki None: ochilgan fayl tozalashda o'chirilsa ham o'qilaveradi."""
+        path = self.path_for(key, extension)
+        try:
+            handle = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - os.fstat(handle.fileno()).st_mtime > TOUCH_INTERVAL:
+            # LRU uchun "oxirgi ishlatilgan" vaqti (atime ko'p tizimlarda o'chirilgan)
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                pass
+        return handle
+
+    def put(self, key, extension, data):
+        """Faylni yozadi va uni boshidan o'qishga ochiq holda qaytaradi."""
+        path = self.path_for(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Avval vaqtinchalik faylga, keyin atomik almashtirish - yarim yozilgan fayl berilmaydi
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        handle = os.fdopen(fd, 'w+b')
+        handle.write(data)
+        handle.flush()
+        os.replace(tmp, path)
+        handle.seek(0)
+        with self._lock:
+            self._size = self.size() + len(data)
+            if self._size > self.max_bytes:
+                self.evict()
+        return handle
+
+    def evict(self, target=None):
+        """Eng eski fayllarni kesh `target` baytdan kichik bo'lguncha o'chiradi."""
+        target = int(self.max_bytes * LOW_WATERMARK) if target is None else target
+        files = sorted(self._files(), key=lambda item: item[1])
+        total = sum(size for _, _, size in files)
+        removed = 0
+        for path, _, size in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+
+thumbnail_cache = ThumbnailCache(CACHE_DIR, CACHE_MAX_BYTES)
+
+
+def source_file(path):
+    """MEDIA_ROOT ichidagi asl rasm va uning stat'i; boshqa har qanday yo'l uchun 404."""
+    if Path(path).suffix.lower() not in IMAGE_EXTENSIONS or path.startswith(f'{DERIVATIVES_DIR}/'):
+        raise Http404
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if CACHE_DIR in full_path.parents:
+        raise Http404
+    try:
+        source_stat = full_path.stat()
+    except OSError:
+        raise Http404
+    if not stat.S_ISREG(source_stat.st_mode):
+        raise Http404
+    return full_path, source_stat
+
+
+def negotiate_format(request):
+    accept = request.headers.get('Accept', '')
+    for name in ('avif', 'webp'):
+        if f'image/{name}' in accept and features.check(name):
+            return name
+    return 'jpeg'
+
+
+def cache_key(source, source_stat, width, height, image_format):
+    raw = f'{source}:{source_stat.st_mtime_ns}:{source_stat.st_size}:{width}x{height}:{image_format}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def render_thumbnail(source, width, height, image_format):
+    """Kichraytirilgan rasm baytlari; buzilgan yoki o'qib bo'lmaydigan fayl uchun 404."""
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            if height:
+                image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+            else:
+                image.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+            if image_format == 'jpeg':
+                image = flatten(image)
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format.upper(), **FORMATS[image_format][1])
+    except (UnidentifiedImageError, OSError):
+        raise Http404
+    return buffer.getvalue()
+
+
+def _resolve(request, width, height, path):
+    """(asl fayl, format, kesh kaliti) - so'rovda bir marta hisoblanadi (ETag va view uchun)."""
+    resolved = getattr(request, '_thumbnail', None)
+    if resolved is None:
+        if (width, height) not in THUMB_SIZES:
+            raise Http404
+        source, source_stat = source_file(path)
+        image_format = negotiate_format(request)
+        resolved = source, image_format, cache_key(source, source_stat, width, height, image_format)
+        request._thumbnail = resolved
+    return resolved
+
+
+def _etag(request, width, height, path):
+    return _resolve(request, width, height, path)[2]
+
+
+def _patch_headers(response):
+    patch_cache_control(response, public=True, max_age=MAX_AGE)
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+@require_safe
+def thumbnail(request, width, height, path):
+    response = _thumbnail(request, width, height, path)
+    return _patch_headers(response)
+
+
+@condition(etag_func=_etag)
+def _thumbnail(request, width, height, path):
+    source, image_format, key = _resolve(request, width, height, path)
+    extension = FORMATS[image_format][0]
+    handle = thumbnail_cache.get(key, extension)
+    if handle is None:
+        handle = thumbnail_cache.put(key, extension, render_thumbnail(source, width, height, image_format))
+    return FileResponse(handle, content_type=CONTENT_TYPES[image_format])
+
+
+def thumbnail_url(field_file, width, height=0):
+    return reverse('thumbnail', kwargs={'width': width, 'height': height, 'path': field_file.name})
@@ -0,0 +1,140 @@
+"""
+Tarjima navbati (TranslationJob) bilan ishlash.
+
+Signal faqat enqueue_translation() ni chaqiradi - saqlash so'rovi darhol
+qaytadi. Tarjimani `manage.py translation_worker` bajaradi: joblarni oladi,
+har bir til uchun barcha bo'sh maydonlarni bitta translate_batch() bilan
+tarjima qiladi va .update() orqali yozadi (post_save qayta ishlamaydi).
+Xato bo'lsa job eksponensial kechikish bilan qayta navbatga qo'yiladi.
+"""
+import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TranslationJob
+from .page_cache import bump_content_version
+from .search import get_search_backend
+from .translators import get_translator
+
+# model -> tarjima qilinadigan maydonlar (maqsad ustunlari: <maydon>_<til>)
+TRANSLATABLE_FIELDS = {
+    'news_app.news': ('title', 'content'),
+    'news_app.category': ('name',),
+}
+TARGET_LANGUAGES = ('en', 'ru')
+
+MAX_ATTEMPTS = getattr(settings, 'NEWS_TRANSLATION_MAX_ATTEMPTS', 5)
+RETRY_DELAY = getattr(settings, 'NEWS_TRANSLATION_RETRY_DELAY', 30)  # soniya, har urinishda 2 barobar
+STALE_AFTER = datetime.timedelta(minutes=15)
+
+
+def enqueue_translation(instance, source_lang='uz'):
+    return TranslationJob.objects.create(
+        model=instance._meta.label_lower,
+        object_id=instance.pk,
+        source_lang=source_lang,
+    )
+
+
+def missing_fields(obj, fields, target):
+    return [field for field in fields if getattr(obj, field) and not getattr(obj, f'{field}_{target}')]
+
+
+def translate_object(obj, fields, source_lang, translator):
+    """Bo'sh tarjima ustunlari uchun {ustun: tarjima} lug'atini qaytaradi."""
+    values = {}
+    for target in TARGET_LANGUAGES:
+        todo = missing_fields(obj, fields, target)
+        if not todo:
+            continue
+        translated = translator.translate_batch([getattr(obj, field) for field in todo], source_lang, target)
+        values.update({f'{field}_{target}': text for field, text in zip(todo, translated)})
+    return values
+
+
+def after_translation(model, pk):
+    # .update() signal yubormaydi: kesh va qidiruv indeksini o'zimiz yangilaymiz
+    bump_content_version()
+    search = get_search_backend()
+    if model._meta.label_lower == 'news_app.news':
+        news = model.objects.select_related('category').filter(pk=pk).first()
+        if news is not None:
+            search.index(news)
+    elif model._meta.label_lower == 'news_app.category':
+        category = model.objects.filter(pk=pk).first()
+        if category is not None:
+            search.index_category(category)
+
+
+def run_job(job, translator):
+    model = apps.get_model(job.model)
+    obj = model.objects.filter(pk=job.object_id).first()
+    if obj is not None:
+        values = translate_object(obj, TRANSLATABLE_FIELDS[job.model], job.source_lang, translator)
+        if values:
+            model.objects.filter(pk=obj.pk).update(**values)
+            after_translation(model, obj.pk)
+    TranslationJob.objects.filter(pk=job.pk).update(
+        status=TranslationJob.Status.DONE, last_error='', updated_at=timezone.now()
+    )
+
+
+def schedule_retry(job, error):
+    if job.attempts >= MAX_ATTEMPTS:
+        status, run_after = TranslationJob.Status.FAILED, job.run_after
+    else:
+        status = TranslationJob.Status.PENDING
+        run_after = timezone.now() + datetime.timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+    TranslationJob.objects.filter(pk=job.pk).update(
+        status=status, run_after=run_after, last_error=str(error)[:2000], updated_at=timezone.now()
+    )
+    return status
+
+
+def requeue_stale_jobs():
+    """Worker to'xtab qolgan (RUNNING holatida qotgan) joblarni qayta navbatga qo'yadi."""
+    return TranslationJob.objects.filter(
+        status=TranslationJob.Status.RUNNING,
+        updated_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=TranslationJob.Status.PENDING, updated_at=timezone.now())
+
+
+def claim_jobs(limit):
+    with transaction.atomic():
+        queryset = TranslationJob.objects.filter(
+            status=TranslationJob.Status.PENDING,
+            run_after__lte=timezone.now(),
+        ).order_by('run_after')
+        if connection.features.has_select_for_update_skip_locked:
+            # Bir nechta worker bir xil jobni olmasligi uchun
+            queryset = queryset.select_for_update(skip_locked=True)
+        ids = list(queryset.values_list('pk', flat=True)[:limit])
+        TranslationJob.objects.filter(pk__in=ids).update(
+            status=TranslationJob.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now(),
+        )
+    return list(TranslationJob.objects.filter(pk__in=ids))
+
+
+def process_jobs(limit=10, translator=None):
+    """
+    Navbatdan `limit` tagacha jobni bajaradi. (bajarildi, qayta urinishga
+    qo'yildi, MAX_ATTEMPTS dan keyin FAILED) sonlarini qaytaradi.
+    """
+    translator = translator or get_translator()
+    done = retried = failed = 0
+    for job in claim_jobs(limit):
+        try:
+            run_job(job, translator)
+            done += 1
+        except Exception as error:
+            if schedule_retry(job, error) == TranslationJob.Status.FAILED:
+                failed += 1
+            else:
+                retried += 1
+    return done, retried, failed
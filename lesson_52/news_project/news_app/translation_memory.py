@@ -0,0 +1,170 @@
+"""
+Tarjima xotirasi (translation memory).
+
+Matn gaplarga (segmentlarga) bo'linadi, har bir segment
+(manba til, maqsad til, normallashtirilgan segment hash) kaliti bilan
+TranslationMemory jadvalidan bitta so'rovda qidiriladi. Faqat topilmagan
+segmentlar tarjimonga yuboriladi va natija xotiraga yoziladi. Shunday qilib
+kategoriya nomlari, takrorlanuvchi sarlavhalar va footer gaplari qayta
+tarjima qilinmaydi.
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db.models import F
+
+from .models import TranslationMemory
+from .translators import BaseTranslator, TranslationError
+
+# Gap oxiri (. ! ? …) dan keyingi bo'shliq yoki yangi qator - segment chegarasi
+SEGMENT_SPLIT_RE = re.compile(r'((?<=[.!?…])[ \t]+|\s*\n\s*)')
+WORD_RE = re.compile(r'[^\W\d_]', re.UNICODE)
+LOOKUP_CHUNK = 500
+
+
+def normalize(segment):
+    return ' '.join(unicodedata.normalize('NFC', segment).split())
+
+
+def segment_hash(segment):
+    return hashlib.sha256(normalize(segment).encode('utf-8')).hexdigest()
+
+
+def split_segments(text):
+    """Matnni [segment, ajratgich, segment, ...] ko'rinishida bo'ladi (juft indekslar - segmentlar)."""
+    return SEGMENT_SPLIT_RE.split(text)
+
+
+def needs_translation(segment):
+    # Faqat raqam/tinish belgilaridan iborat segmentlar tarjimasiz qoladi
+    return bool(WORD_RE.search(segment))
+
+
+@dataclass
+class TranslationMemoryStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def total(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.total if self.total else 0.0
+
+    def __str__(self):
+        return f'{self.hits}/{self.total} segment xotiradan ({self.hit_rate:.0%})'
+
+
+class TranslationMemoryTranslator(BaseTranslator):
+    """
+    Istalgan tarjimon ustidan xotira qatlami (translate_batch interfeysi o'zgarmaydi).
+
+    autoflush=False bo'lsa yangi segmentlar darhol yozilmaydi, flush() chaqirilganda
+    yoziladi - ko'p threadli buyruqlar barcha yozuvlarni bitta ulanishdan qilishi uchun.
+    """
+
+    def __init__(self, translator, autoflush=True):
+        self.translator = translator
+        self.autoflush = autoflush
+        self.stats = TranslationMemoryStats()
+        self._lock = threading.Lock()
+        self._pending_rows = {}  # (source, target, hash) -> TranslationMemory
+        self._pending_hits = Counter()
+
+    def translate_batch(self, texts, source, target):
+        split_texts = [split_segments(text) if text else [] for text in texts]
+
+        # Barcha matnlardagi noyob segmentlar
+        segments = {}
+        for parts in split_texts:
+            for segment in parts[::2]:
+                if needs_translation(segment):
+                    segments.setdefault(segment_hash(segment), normalize(segment))
+
+        memory = self._lookup(source, target, list(segments))
+        misses = [digest for digest in segments if digest not in memory]
+
+        translated = []
+        if misses:
+            translated = self.translator.translate_batch([segments[d] for d in misses], source, target)
+            # Bo'sh natija xotiraga yozilsa xato abadiy takrorlanardi - hech narsa saqlamay qayta urinamiz
+            empty = [segments[d] for d, text in zip(misses, translated) if not text]
+            if len(translated) != len(misses) or empty:
+                raise TranslationError(
+                    f'{source}->{target}: {len(misses)} segmentdan {len(misses) - len(translated) + len(empty)} '
+                    f'tasi tarjima qilinmadi'
+                )
+
+        with self._lock:
+            self.stats.hits += len(memory)
+            self.stats.misses += len(misses)
+            for digest in memory:
+                self._pending_hits[(source, target, digest)] += 1
+            for digest, text in zip(misses, translated):
+                memory[digest] = text
+                self._pending_rows[(source, target, digest)] = TranslationMemory(
+                    source_lang=source,
+                    target_lang=target,
+                    segment_hash=digest,
+                    source_text=segments[digest],
+                    translated_text=text,
+                )
+        if self.autoflush:
+            self.flush()
+
+        results = []
+        for text, parts in zip(texts, split_texts):
+            if not text:
+                results.append(text)
+                continue
+            rebuilt = [
+                memory.get(segment_hash(part), part) if i % 2 == 0 and needs_translation(part) else part
+                for i, part in enumerate(parts)
+            ]
+            results.append(''.join(rebuilt))
+        return results
+
+    def flush(self):
+        """Yangi segmentlar va hit hisoblagichlarini bazaga yozadi."""
+        with self._lock:
+            rows, self._pending_rows = self._pending_rows, {}
+            hits, self._pending_hits = self._pending_hits, Counter()
+
+        if rows:
+            TranslationMemory.objects.bulk_create(rows.values(), batch_size=LOOKUP_CHUNK, ignore_conflicts=True)
+
+        # Bir xil hit soniga ega segmentlar bitta UPDATE bilan yangilanadi
+        grouped = {}
+        for (source, target, digest), count in hits.items():
+            grouped.setdefault((source, target, count), []).append(digest)
+        for (source, target, count), hashes in grouped.items():
+            for start in range(0, len(hashes), LOOKUP_CHUNK):
+                TranslationMemory.objects.filter(
+                    source_lang=source,
+                    target_lang=target,
+                    segment_hash__in=hashes[start:start + LOOKUP_CHUNK],
+                ).update(hits=F('hits') + count)
+
+    def _lookup(self, source, target, hashes):
+        memory = {}
+        # Hali yozilmagan (flush qilinmagan) segmentlar ham xotira hisoblanadi
+        with self._lock:
+            for digest in hashes:
+                row = self._pending_rows.get((source, target, digest))
+                if row is not None:
+                    memory[digest] = row.translated_text
+        hashes = [digest for digest in hashes if digest not in memory]
+        for start in range(0, len(hashes), LOOKUP_CHUNK):
+            rows = TranslationMemory.objects.filter(
+                source_lang=source,
+                target_lang=target,
+                segment_hash__in=hashes[start:start + LOOKUP_CHUNK],
+            ).values_list('segment_hash', 'translated_text')
+            memory.update(rows)
+        return memory
@@ -0,0 +1,151 @@
+"""
+Tarjima backendlari.
+
+Barcha backendlar bitta interfeysga ega: translate_batch(texts, source, target)
+matnlar ro'yxatini oladi va xuddi shu tartibda tarjimalar ro'yxatini qaytaradi.
+Qaysi backend ishlatilishi NEWS_TRANSLATOR sozlamasida belgilanadi, testlar va
+lokal ishlab chiqish uchun FakeTranslator tarmoqqa chiqmaydi.
+"""
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class TranslationError(Exception):
+    """Tarjimon natija qaytarmadi (None, bo'sh satr yoki soni mos emas) - job qayta uriniladi."""
+
+
+class BaseTranslator:
+    def translate_batch(self, texts, source, target):
+        raise NotImplementedError
+
+
+class FakeTranslator(BaseTranslator):
+    """Tarmoqsiz soxta tarjimon: matn oldiga til kodini qo'shadi."""
+
+    def translate_batch(self, texts, source, target):
+        return [f'[{target}] {text}' if text else text for text in texts]
+
+
+class GoogleTranslatorBackend(BaseTranslator):
+    """
+    deep_translator.GoogleTranslator ustidan backend.
+
+    Bir nechta maydon (title, content, ...) bitta so'rovda yuboriladi:
+    matnlar SEPARATOR bilan birlashtiriladi va javob qayta bo'linadi.
+    Google bitta so'rovda MAX_CHARS belgidan ko'pini qabul qilmaydi.
+    """
+    SEPARATOR = '\n\n§§§\n\n'
+    MAX_CHARS = 4500
+
+    def _translator(self, source, target):
+        from deep_translator import GoogleTranslator
+
+        return GoogleTranslator(source=source, target=target)
+
+    def translate_batch(self, texts, source, target):
+        translator = self._translator(source, target)
+        results = list(texts)
+
+        # Bo'sh matnlar tarjima qilinmaydi
+        pending = [(i, text) for i, text in enumerate(texts) if text and text.strip()]
+
+        for group in self._groups(pending):
+            if len(group) == 1:
+                index, text = group[0]
+                results[index] = self._translate_long(translator, text)
+                continue
+            joined = self.SEPARATOR.join(text for _, text in group)
+            parts = (translator.translate(joined) or '').split('§§§')
+            if len(parts) != len(group):
+                # Ajratgich buzilgan bo'lsa har birini alohida tarjima qilamiz
+                parts = [self._translate_long(translator, text) for _, text in group]
+            for (index, _), part in zip(group, parts):
+                results[index] = part.strip()
+        return results
+
+    def _groups(self, pending):
+        group, size = [], 0
+        for index, text in pending:
+            if group and size + len(text) + len(self.SEPARATOR) > self.MAX_CHARS:
+                yield group
+                group, size = [], 0
+            group.append((index, text))
+            size += len(text) + len(self.SEPARATOR)
+        if group:
+            yield group
+
+    # Uzun matn avval paragraflarga, keyin gaplarga, keyin so'zlarga bo'linadi
+    SPLITTERS = (
+        (re.compile(r'\n'), '\n'),
+        (re.compile(r'(?<=[.!?…])\s+'), ' '),
+        (re.compile(r'\s+'), ' '),
+    )
+
+    def _translate_long(self, translator, text, level=0):
+        if len(text) <= self.MAX_CHARS:
+            return translator.translate(text) or ''
+        if level >= len(self.SPLITTERS):
+            # Bo'sh joysiz juda uzun qator (masalan URL) - teng bo'laklarga
+            pieces = [text[i:i + self.MAX_CHARS] for i in range(0, len(text), self.MAX_CHARS)]
+            return ''.join(translator.translate(piece) or '' for piece in pieces)
+
+        pattern, joiner = self.SPLITTERS[level]
+        chunks, chunk = [], ''
+        for piece in pattern.split(text):
+            if chunk and len(chunk) + len(joiner) + len(piece) > self.MAX_CHARS:
+                chunks.append(chunk)
+                chunk = ''
+            chunk = f'{chunk}{joiner}{piece}' if chunk else piece
+        if chunk:
+            chunks.append(chunk)
+        # MAX_CHARS dan uzun bo'lak (bitta uzun paragraf yoki gap) keyingi darajada bo'linadi
+        return joiner.join(self._translate_long(translator, chunk, level + 1) for chunk in chunks)
+
+
+class RateLimitedTranslator(BaseTranslator):
+    """
+    Token bucket: soniyasiga `rate` tagacha so'rov (bir nechta thread uchun umumiy).
+    Ko'p thread bilan ishlaydigan buyruqlar tarjimon kvotasidan oshib ketmasligi uchun.
+    """
+
+    def __init__(self, translator, rate, burst=None):
+        self.translator = translator
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def translate_batch(self, texts, source, target):
+        self.acquire()
+        return self.translator.translate_batch(texts, source, target)
+
+
+def get_translator(rate=None, autoflush=True):
+    path = getattr(settings, 'NEWS_TRANSLATOR', 'news_app.translators.GoogleTranslatorBackend')
+    translator = import_string(path)()
+    if rate:
+        # Limit faqat haqiqiy tarjimon chaqiruvlariga qo'llanadi, xotiradan olinganlarga emas
+        translator = RateLimitedTranslator(translator, rate)
+    if getattr(settings, 'NEWS_TRANSLATION_MEMORY', True):
+        # Tarjima xotirasi takroriy gaplarni tarjimonga yubormaydi
+        from .translation_memory import TranslationMemoryTranslator
+
+        translator = TranslationMemoryTranslator(translator, autoflush=autoflush)
+    return translator
@@ -0,0 +1,151 @@
+"""
+Ommabop yangiliklar (trending) - vaqt o'tishi bilan so'nuvchi ball.
+
+Avval "popular_news" yo views bo'yicha to'liq saralash (draftlar bilan), yo
+oddiy -published_at edi. Endi:
+
+  - ViewCounter.flush() ko'rishlarni soatlik NewsViewBucket qatorlariga ham yozadi;
+  - rebuild_popular() oxirgi WINDOW_HOURS soatdagi bucketlardan
+    ball = sum(views * 0.5 ** (yosh_soat / HALF_LIFE_HOURS)) hisoblab,
+    har kategoriyadan eng yaxshi PER_CATEGORY tasini PopularNews jadvaliga yozadi;
+  - get_popular_news() shu kichik jadvaldan indeks bilan o'qiydi (va keshlaydi).
+
+Jadval so'rov yo'lida hech qachon qurilmaydi - uni jadval bo'yicha
+(NEWS_POPULAR_REFRESH_INTERVAL da bir marta) cron yoki systemd timer yangilaydi:
+
+    */15 * * * * cd /srv/news_project && python manage.py rebuild_popular --prune
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone, translation
+from django.utils.functional import SimpleLazyObject
+
+from .front_page import get_recent_news
+from .page_cache import bump_version, get_version
+from .models import News, NewsViewBucket, PopularNews
+
+HALF_LIFE_HOURS = getattr(settings, 'NEWS_POPULAR_HALF_LIFE_HOURS', 24)
+WINDOW_HOURS = getattr(settings, 'NEWS_POPULAR_WINDOW_HOURS', 24 * 7)
+REFRESH_INTERVAL = getattr(settings, 'NEWS_POPULAR_REFRESH_INTERVAL', 60 * 15)
+PER_CATEGORY = 20
+
+POPULAR_VERSION = 'popular'
+
+
+def current_hour(now=None):
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def record_buckets(pending, hour=None):
+    """{news_id: ko'rishlar} ni shu soatning bucketlariga qo'shadi (2 ta so'rov)."""
+    if not pending:
+        return
+    hour = hour or current_hour()
+    NewsViewBucket.objects.bulk_create(
+        [NewsViewBucket(news_id=news_id, hour=hour) for news_id in pending],
+        ignore_conflicts=True,
+    )
+    increment = Case(
+        *[When(news_id=news_id, then=Value(count)) for news_id, count in pending.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+    NewsViewBucket.objects.filter(hour=hour, news_id__in=pending.keys()).update(views=F('views') + increment)
+
+
+def decayed_scores(now=None, half_life=HALF_LIFE_HOURS, window=WINDOW_HOURS):
+    """news_id -> ball, faqat oynadagi bucketlardan."""
+    now = now or timezone.now()
+    since = current_hour(now) - timedelta(hours=window)
+    scores = defaultdict(float)
+    buckets = NewsViewBucket.objects.filter(hour__gte=since).values_list('news_id', 'hour', 'views')
+    for news_id, hour, views in buckets.iterator(chunk_size=2000):
+        age = max((now - hour).total_seconds() / 3600, 0)
+        scores[news_id] += views * 0.5 ** (age / half_life)
+    return scores
+
+
+def rebuild_popular(now=None, half_life=HALF_LIFE_HOURS, window=WINDOW_HOURS, per_category=PER_CATEGORY):
+    """PopularNews jadvalini qayta yozadi, yozilgan qatorlar sonini qaytaradi."""
+    now = now or timezone.now()
+    scores = decayed_scores(now, half_life, window)
+    published = News.published.filter(pk__in=scores.keys()).values_list('pk', 'category_id')
+
+    by_category = defaultdict(list)
+    for news_id, category_id in published.iterator(chunk_size=2000):
+        by_category[category_id].append((scores[news_id], news_id))
+
+    rows = []
+    for category_id, items in by_category.items():
+        items.sort(reverse=True)
+        rows.extend(
+            PopularNews(news_id=news_id, category_id=category_id, score=score, computed_at=now)
+            for score, news_id in items[:per_category]
+        )
+
+    # Jadval hech qachon bo'sh qolmaydi: mavjud qatorlar yangilanadi, yangilari
+    # qo'shiladi va faqat bu safar yozilmaganlari (computed_at eski) o'chiriladi
+    with transaction.atomic():
+        PopularNews.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['news'],
+            update_fields=['category', 'score', 'computed_at'],
+        )
+        PopularNews.objects.exclude(computed_at=now).delete()
+    bump_popular_version()
+    return len(rows)
+
+
+def prune_buckets(window=WINDOW_HOURS, now=None):
+    """Oynadan tashqaridagi eski bucketlarni o'chiradi."""
+    since = current_hour(now) - timedelta(hours=window)
+    deleted, _ = NewsViewBucket.objects.filter(hour__lt=since).delete()
+    return deleted
+
+
+def get_popular_version():
+    return get_version(POPULAR_VERSION)
+
+
+def bump_popular_version():
+    # rebuild_popular cron'da ishlaydi - versiya web processlar ko'radigan bazada
+    return bump_version(POPULAR_VERSION)
+
+
+def _load_popular(category_id, size):
+    key = f'news:popular:{category_id or "all"}:{size}:{translation.get_language()}'
+    version = get_popular_version()
+    items = cache.get(key, version=version)
+    if items is None:
+        rows = PopularNews.objects.order_by('-score')
+        if category_id:
+            rows = rows.filter(category_id=category_id)
+        ids = list(rows.values_list('news_id', flat=True)[:size])
+        found = News.published.cards().in_bulk(ids)
+        items = [found[pk] for pk in ids if pk in found]
+        cache.set(key, items, REFRESH_INTERVAL, version=version)
+    return items
+
+
+def get_popular_news(request=None, size=5, category=None):
+    """
+    Ommabop yangiliklar (lazy). Jadvalda yetarli yangilik bo'lmasa (yangi
+    o'rnatish, ko'rishlar kam) ro'yxat so'nggi yangiliklar bilan to'ldiriladi.
+    """
+    category_id = getattr(category, 'pk', category)
+
+    def load():
+        items = list(_load_popular(category_id, size))
+        if len(items) < size:
+            seen = {item.pk for item in items}
+            items += [item for item in get_recent_news(request, size) if item.pk not in seen]
+        return items[:size]
+
+    return SimpleLazyObject(load)
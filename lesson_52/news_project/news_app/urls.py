@@ -24,6 +24,9 @@ urlpatterns = [
     path("news/<int:pk>/edit/", NewsUpdateView.as_view(), name="news_edit"),
     path("news/<int:pk>/delete/", NewsDeleteView.as_view(), name="news_delete"),
     path('news/<slug:slug>/', SinglePageView.as_view(), name='news_detail'),
+    path('news/<slug:slug>/comments/', views.news_comments, name='news_comments'),
+    path('news/<slug:slug>/seen/', views.news_seen, name='news_seen'),
+    path('fragments/user/', views.user_fragment, name='user_fragment'),
     path('category/<slug:slug>/', CategoryDetailView.as_view(), name='category_detail'),
     path('about/', AboutPageView.as_view(), name='about'),
     path('contact/', ContactPageView.as_view(), name='contact'),
@@ -0,0 +1,199 @@
+"""
+Ko'rishlar sonini buferlab, bazaga to'plab yozuvchi hisoblagich.
+
+Avval SinglePageView har bir birinchi ko'rishda UPDATE, refresh_from_db va
+sessiyaga yozish qilardi. SQLite da bu yozish qulfi ostida barcha
+o'quvchilarni kutishga majbur qiladi. Endi:
+  - ko'rishlar process ichidagi buferda yig'iladi;
+  - har NEWS_VIEW_FLUSH_INTERVAL soniyada fon oqimi bitta CASE ... WHEN UPDATE
+    bilan yozadi (so'rov yo'lida emas; xato bo'lsa log qilinib keyingi safar
+    qayta uriniladi);
+  - shu bilan birga soatlik bucketlarga ham qo'shiladi (trending.py uchun);
+  - takroriy ko'rishlar sessiya o'rniga imzolangan `news_seen` cookie'dagi
+    Bloom filtri orqali aniqlanadi (baza ham, kesh ham yozilmaydi). Cookie
+    yubormaydigan mijozlar (botlar) uchun IP + User-Agent kesh kaliti qoladi.
+"""
+import atexit
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, 'NEWS_VIEW_FLUSH_INTERVAL', 10)
+DEDUP_TIMEOUT = getattr(settings, 'NEWS_VIEW_DEDUP_TIMEOUT', 60 * 60 * 24)
+
+SEEN_COOKIE = 'news_seen'
+SEEN_SALT = 'news_app.view_counter.seen'
+SEEN_BITS = 1024       # 128 bayt; 100 ta maqolada xato ehtimoli ~1.6%
+SEEN_HASHES = 3
+SEEN_CAPACITY = 150    # shundan keyin filtr to'ladi va yangisi boshlanadi
+
+
+class ViewCounter:
+    """
+    Bufer so'rov ichida yozilmaydi: record() faqat hisoblaydi, bazaga fon
+    oqimi (har flush_interval soniyada) va process tugashida atexit yozadi.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    def record(self, news_id, count=1):
+        with self._lock:
+            self._pending[news_id] += count
+            self._ensure_worker()
+
+    def pending(self, news_id):
+        """Hali bazaga yozilmagan ko'rishlar soni."""
+        with self._lock:
+            return self._pending.get(news_id, 0)
+
+    def _ensure_worker(self):
+        # fork'dan keyin (gunicorn --preload) oqim bola processga o'tmaydi
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        self._worker_pid = os.getpid()
+        self._worker = threading.Thread(target=self._run, name='news-view-counter', daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Buferdagi barcha ko'rishlarni bitta UPDATE bilan yozadi, yozilganlar sonini qaytaradi."""
+        from .models import News
+        from .trending import record_buckets
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        increment = Case(
+            *[When(pk=news_id, then=Value(count)) for news_id, count in pending.items()],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+        try:
+            with transaction.atomic():
+                News.objects.filter(pk__in=pending.keys()).update(views=F('views') + increment)
+                record_buckets(pending)
+        except Exception:
+            # Yozib bo'lmasa (masalan baza band) ko'rishlar yo'qolmasin, keyingi flush da qayta urinamiz
+            logger.exception("Ko'rishlarni bazaga yozib bo'lmadi (%s ta yangilik)", len(pending))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return sum(pending.values())
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
+
+
+class SeenFilter:
+    """
+    Ko'rilgan maqolalar ID'lari uchun Bloom filtri. "Yo'q" javobi aniq,
+    "bor" javobi kichik ehtimol bilan xato (ko'rish hisoblanmay qoladi).
+    Filtr DEDUP_TIMEOUT dan eski bo'lsa yoki to'lsa yangidan boshlanadi.
+    """
+
+    def __init__(self, bits=None, count=0, created=None):
+        self.bits = bytearray(bits or bytes(SEEN_BITS // 8))
+        self.count = count
+        self.created = created or int(time.time())
+        self.changed = False
+
+    @classmethod
+    def from_request(cls, request):
+        value = request.get_signed_cookie(SEEN_COOKIE, default=None, salt=SEEN_SALT)
+        if not value:
+            return None
+        try:
+            created, count, bits = value.split(':')
+            seen = cls(base64.urlsafe_b64decode(bits), int(count), int(created))
+        except (ValueError, TypeError):
+            return None
+        if len(seen.bits) * 8 != SEEN_BITS or time.time() - seen.created > DEDUP_TIMEOUT or seen.count >= SEEN_CAPACITY:
+            return cls()
+        return seen
+
+    def _positions(self, news_id):
+        digest = hashlib.blake2b(str(news_id).encode(), digest_size=SEEN_HASHES * 2).digest()
+        for index in range(SEEN_HASHES):
+            yield int.from_bytes(digest[index * 2:index * 2 + 2], 'big') % SEEN_BITS
+
+    def __contains__(self, news_id):
+        return all(self.bits[pos // 8] & (1 << pos % 8) for pos in self._positions(news_id))
+
+    def add(self, news_id):
+        for pos in self._positions(news_id):
+            self.bits[pos // 8] |= 1 << pos % 8
+        self.count += 1
+        self.changed = True
+
+    def dumps(self):
+        return f'{self.created}:{self.count}:{base64.urlsafe_b64encode(bytes(self.bits)).decode()}'
+
+
+def get_viewer_id(request):
+    if request.user.is_authenticated:
+        return f'u{request.user.pk}'
+    # Anonim foydalanuvchi uchun sessiya yaratmaymiz: IP + User-Agent hash
+    raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return 'a' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def register_view(request, news):
+    """
+    Ko'rishni hisobga oladi (bir foydalanuvchi uchun DEDUP_TIMEOUT ichida bir marta).
+    True qaytarsa ko'rish yangi hisoblangan. Javobga remember_views() cookie yozadi.
+    """
+    seen = SeenFilter.from_request(request)
+    if seen is None:
+        # Cookie yo'q (birinchi kirish yoki cookie saqlamaydigan mijoz)
+        seen = SeenFilter()
+        key = f'news:viewed:{news.pk}:{get_viewer_id(request)}'
+        is_new = cache.add(key, 1, DEDUP_TIMEOUT)
+    else:
+        is_new = news.pk not in seen
+    if news.pk not in seen:
+        seen.add(news.pk)
+    request._news_seen = seen
+    if is_new:
+        view_counter.record(news.pk)
+    return is_new
+
+
+def remember_views(request, response):
+    seen = getattr(request, '_news_seen', None)
+    if seen is not None and seen.changed:
+        response.set_signed_cookie(
+            SEEN_COOKIE,
+            seen.dumps(),
+            salt=SEEN_SALT,
+            max_age=DEDUP_TIMEOUT,
+            httponly=True,
+            samesite='Lax',
+            secure=settings.SESSION_COOKIE_SECURE,
+        )
+    return response
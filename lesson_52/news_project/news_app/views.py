@@ -1,6 +1,11 @@
 from django.contrib import messages
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.auth.views import redirect_to_login
 from django.views.generic import (
   ListView, 
   DetailView, 
@@ -12,10 +17,23 @@ from django.views.generic import (
 from django.views.generic.edit import FormView, FormMixin
 from .models import News, Category
 from .forms import ContactForm, NewsForm, CommentForm
-from django.urls import reverse_lazy
-from django.db.models import Q, F
+from .front_page import load_front_page
+from .trending import get_popular_news
+from .related import get_related_news
+from .comments import comment_allowed, comment_page, serialize_comment, submit_comment
+from .conditional import ConditionalGetMixin, published_last_modified
+from .page_cache import CachedPageMixin
+from .page_shell import PageShellMixin, is_page_shell, user_fragment_data
+from .pagination import CursorPaginationMixin
+from .routers import no_sticky, replica_reads
+from .view_counter import register_view, remember_views, view_counter
+from .search import SimpleSearchBackend, get_search_backend
+from django.urls import reverse, reverse_lazy
+from django.db import router
+from django.db.models import Count, F, Max, Q
 from django.core.paginator import Paginator
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+from django.utils import translation
+from django.utils.functional import cached_property
 
 # ================================
 # NewsList view - FUNCTION BASED
@@ -39,19 +57,29 @@ from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 # ================================
 # NewsList view - CLASS BASED
 # ================================
-class NewsListView(ListView):
+@replica_reads
+class NewsListView(PageShellMixin, ConditionalGetMixin, CachedPageMixin, CursorPaginationMixin, ListView):
     model = News
     template_name = 'news/news_list.html'
     context_object_name = 'news'
     queryset = News.published.all()
     paginate_by = 6
 
+    def get_queryset(self):
+        # Til tanlovi so'rov vaqtida bo'lishi kerak, shuning uchun class atributida emas
+        return super().get_queryset().cards()
+
+    def get_validator_state(self):
+        # ETag: kontent versiyasi + sahifa/cursor (get_etag da); bazaga har GET da so'rov yo'q
+        return (), published_last_modified()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
+        # categories va latest_news context processor dan (request ichida bir marta)
         context['current_category'] = self.request.GET.get('category')
         return context
     
+@replica_reads
 class NewsDetailView(DetailView):
     model = News
     template_name = "news/news_deatil.html"
@@ -63,33 +91,33 @@ class NewsDetailView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Related news
-        context["related_news"] = News.objects.filter(
-            category=self.object.category
-        ).exclude(id=self.object.id)[:4]
-        # Popular news
-        context["popular_news"] = News.objects.order_by("-views")[:5]
-        # Categories
-        context["categories"] = Category.objects.all()
+        # Related news (RelatedNews indeksidan, faqat chop etilganlar)
+        context["related_news"] = get_related_news(self.object, 4)
+        # Popular news (vaqt bo'yicha so'nuvchi ball, trending.py)
+        context["popular_news"] = get_popular_news(self.request, 5)
         return context
     
-class HomePageView(ListView):
+@replica_reads
+class HomePageView(PageShellMixin, ConditionalGetMixin, CachedPageMixin, CursorPaginationMixin, ListView):
     model = News
     template_name = 'news/home.html'
     context_object_name = 'news'                       
-    queryset = News.published.all().order_by('-created_at')
+    queryset = News.published.order_by('-created_at')
     paginate_by = 6
+    cursor_ordering = ('-created_at', '-id')
+
+    def get_queryset(self):
+        return super().get_queryset().cards()
+
+    def get_validator_state(self):
+        # ETag: kontent versiyasi + sahifa/cursor (get_etag da); bazaga har GET da so'rov yo'q
+        return (), published_last_modified()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Slider / "latest" uchun kesma (paginationni buzmaslik uchun object_list ni o'zgartirmaymiz)
-        context['news_list'] = News.published.all().order_by('-created_at')[:6]
-        context['latest_news'] = News.published.order_by('-published_at')[:6] 
-        context['local_news'] = News.published.filter(category__name__iexact='Mahalliy').order_by('-published_at')[:5]
-        context['xorij_news'] = News.published.filter(category__name__iexact='Xorij').order_by('-published_at')[:5]
-        context['sport'] = News.published.filter(category__name__iexact='Sport').order_by('-published_at')[:5]
-        context['texnologiya'] = News.published.filter(category__name__iexact='Texnologiya').order_by('-published_at')[:5]
-        context['categories'] = Category.objects.all()
+        # Barcha bo'limlar (slider, Mahalliy, Xorij, Sport, Texnologiya, so'nggi yangiliklar)
+        # bitta so'rov bilan olinadi va context processor bilan bo'lishiladi
+        context.update(load_front_page(self.request))
         context['current_category'] = self.request.GET.get('category')
         return context
     
@@ -100,6 +128,7 @@ def custom_404_view(request, exception=None):
     
     return render(request, 'news/404.html', status=404)
     
+@replica_reads
 class AboutPageView(TemplateView):
     template_name = 'news/about.html'
 
@@ -127,67 +156,85 @@ class ContactPageView(FormView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['latest_news'] = News.published.order_by('-published_at')[:10]
-        context['categories'] = Category.objects.all()
-        context['popular_news'] = News.published.order_by('-published_at')[:6]
+        # latest_news va categories context processor dan
+        context['popular_news'] = get_popular_news(self.request, 6)
         return context
     
 
-class SinglePageView(FormMixin, DetailView):
+@replica_reads
+class SinglePageView(PageShellMixin, ConditionalGetMixin, FormMixin, DetailView):
     model = News
     template_name = 'news/news_detail.html'
     form_class = CommentForm
     context_object_name = 'news_item'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
-    queryset = News.published.all()
+    # Breadcrumb (kategoriya) va muallif shablonda - alohida so'rovlarsiz
+    queryset = News.published.select_related('category', 'author')
+
+    def get_validator_state(self):
+        # Bitta so'rov: yangilik o'zgargan vaqti, izohlar soni va oxirgi izoh vaqti
+        row = News.published.filter(slug=self.kwargs['slug']).aggregate(
+            pk=Max('pk'),
+            updated=Max('updated_at'),
+            comment_count=Max('comment_count'),
+            commented=Max('comments__created_at'),
+        )
+        if row['pk'] is None:
+            return None
+        self.validator_pk = row['pk']
+        last_modified = max(filter(None, (row['updated'], row['commented'])))
+        return (row['pk'], row['updated'], row['comment_count'], row['commented']), last_modified
+
+    def not_modified(self, request, response):
+        # 304 da ham ko'rish hisoblanadi (sahifa render qilinmaydi); qobiqda - beacon hisoblaydi
+        if is_page_shell(request):
+            return response
+        register_view(request, News(pk=self.validator_pk))
+        return remember_views(request, response)
 
     def get(self, request, *args, **kwargs):
         # obyektni olamiz
         self.object = self.get_object()
 
-        # sessiya asosida views hisoblash
-        session_key = f"viewed_news_{self.object.slug}"
-        if not request.session.get(session_key, False):
-            # views++ DB darajasida atomik
-            News.objects.filter(slug=self.object.slug).update(views=F('views') + 1)
-            request.session[session_key] = True
+        # views buferlanadi va vaqti-vaqti bilan bitta UPDATE bilan yoziladi.
+        # Qobiq sahifa (proxy keshi, statik sahifa) hisoblamaydi - uni o'quvchining beacon'i hisoblaydi
+        if not is_page_shell(request):
+            register_view(request, self.object)
 
-        # yangilangan qiymatni olish
-        self.object.refresh_from_db(fields=['views'])
+        # taxminiy jonli qiymat: bazadagi + hali yozilmagan ko'rishlar (refresh_from_db shart emas)
+        self.object.views += view_counter.pending(self.object.pk)
 
-        return super().get(request, *args, **kwargs)
+        # super().get() obyektni qayta so'ramasligi uchun to'g'ridan-to'g'ri render qilamiz
+        context = self.get_context_data(object=self.object)
+        # Ko'rilganlar Bloom filtri imzolangan cookie'da (sessiya yozilmaydi)
+        return remember_views(request, self.render_to_response(context))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         news_item = self.object
 
-        # Related news (o'sha kategoriyadagi boshqa yangiliklar)
-        context['related_news'] = News.published.filter(
-            category=news_item.category
-        ).exclude(id=news_item.id)[:3]
+        # Related news (TF-IDF o'xshashlik indeksi, related.py)
+        context['related_news'] = get_related_news(news_item, 3)
 
-        # Categories (sidebar uchun)
-        context['categories'] = Category.objects.all()
+        # Categories va latest news (sidebar uchun) context processor dan keladi
 
-        # Popular news (views bo'yicha)
-        context['popular_news'] = News.published.order_by('-published_at')[:4]
+        # Popular news (PopularNews jadvalidan, keshlangan)
+        context['popular_news'] = get_popular_news(self.request, 4)
 
-        # Latest news (oxirgi 10 ta)
-        context['latest_news'] = News.published.order_by('-published_at')[:10]
-
-        # Comments (faol kommentariyalar)
-        context['comments'] = news_item.comments.filter(active=True)
+        # Comments: faqat birinchi sahifa, qolganlari news:comments JSON endpointidan
+        context['comments'] = comment_page(news_item)
         
         # Comment form - agar POST da xato bo'lsa, xatoli formani ko'rsatish
         if 'comment_form' not in context:
             context['comment_form'] = self.get_form()
 
-        # Latest comments (agar comment modeli bo'lsa)
-        if hasattr(news_item, 'comments'):
-            context['latest_comments'] = news_item.comments.all()[:4]
-        else:
-            context['latest_comments'] = []
+        # Latest comments (faqat faollari; comment.news - shu yangilik, qayta so'ralmaydi)
+        context['latest_comments'] = news_item.comments.filter(active=True).order_by('-created_at')[:4]
+
+        # Qobiq sahifada ko'rish news_seen endpointiga beacon bilan yuboriladi
+        if is_page_shell(self.request):
+            context['seen_url'] = reverse('news:news_seen', kwargs={'slug': news_item.slug})
 
         # Sponsor image (agar mavjud bo'lsa)
         context['sponsor_image'] = getattr(news_item, 'sponsor_image', None)
@@ -199,6 +246,8 @@ class SinglePageView(FormMixin, DetailView):
     
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
         form = self.get_form()
         if form.is_valid():
             return self.form_valid(form)
@@ -206,11 +255,16 @@ class SinglePageView(FormMixin, DetailView):
             return self.form_invalid(form)
 
     def form_valid(self, form):
-        comment = form.save(commit=False)
-        comment.author = self.request.user
-        comment.news = self.object
-        comment.save()
-        messages.success(self.request, "✅ Izohingiz muvaffaqiyatli qo'shildi!")
+        # Juda tez-tez izoh (flood) - foydalanuvchi va IP bo'yicha cheklov (faqat to'g'ri formada token sarflanadi)
+        if not comment_allowed(self.request):
+            messages.error(self.request, "Juda ko'p izoh yubordingiz. Birozdan keyin qayta urinib ko'ring.")
+            return redirect(self.get_success_url())
+        # Izoh moderatsiya navbatiga tushadi (bir necha soniyada ko'chiriladi), shubhalilari yashirin qoladi
+        published = submit_comment(self.object, self.request.user, form.cleaned_data['text'])
+        if published:
+            messages.success(self.request, "✅ Izohingiz qabul qilindi va bir necha soniyada ko'rinadi!")
+        else:
+            messages.info(self.request, "Izohingiz moderatsiyadan keyin ko'rinadi.")
         return redirect(self.get_success_url())
     
     def form_invalid(self, form):
@@ -219,17 +273,55 @@ class SinglePageView(FormMixin, DetailView):
             self.get_context_data(comment_form=form)
         )
 
-class CategoryDetailView(DetailView):
+@replica_reads
+def news_comments(request, slug):
+    """Izohlarning keyingi sahifasi (JSON): ?cursor=... detail sahifadagi "Ko'proq" tugmasi uchun."""
+    news_item = get_object_or_404(News.published.only('pk'), slug=slug)
+    page = comment_page(news_item, request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [serialize_comment(comment) for comment in page],
+        'next_cursor': page.next_cursor,
+    })
+
+@no_sticky
+@csrf_exempt
+@require_POST
+def news_seen(request, slug):
+    """Qobiq (keshlangan yoki statik) sahifadan kelgan ko'rish beacon'i: faqat hisoblagich, render yo'q."""
+    news_item = get_object_or_404(News.published.only('pk'), slug=slug)
+    register_view(request, news_item)
+    return remember_views(request, HttpResponse(status=204))
+
+
+@never_cache
+def user_fragment(request):
+    """Qobiq sahifalar uchun foydalanuvchiga xos qismlar (JSON): rollar, user menyusi, messages, CSRF token."""
+    return JsonResponse(user_fragment_data(request))
+
+
+@replica_reads
+class CategoryDetailView(PageShellMixin, ConditionalGetMixin, CachedPageMixin, DetailView):
     model = Category
     template_name = "news/category_detail.html"
     context_object_name = "category"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_validator_state(self):
+        # Bitta so'rov: kategoriya va uning chop etilgan yangiliklari (nomi o'zgarsa kontent versiyasi oshadi)
+        published = Q(news__status=News.Status.PUBLISHED)
+        row = Category.objects.filter(slug=self.kwargs['slug']).aggregate(
+            pk=Max('pk'),
+            updated=Max('news__updated_at', filter=published),
+            count=Count('news', filter=published),
+        )
+        if row['pk'] is None:
+            return None
+        return (row['pk'], row['updated'], row['count']), row['updated']
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['news_list'] = News.published.filter(category=self.object).order_by('-published_at')
-        context['categories'] = Category.objects.all()
+        context['news_list'] = News.published.cards().filter(category=self.object).order_by('-published_at')
         return context
     
 class NewsCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
@@ -290,7 +382,8 @@ def search_view(request):
 # ================================
 # SEARCH VIEW - CLASS BASED
 # ================================
-class SearchResultsView(ListView):
+@replica_reads
+class SearchResultsView(CursorPaginationMixin, ListView):
     model = News
     template_name = "news/search_results.html"
     paginate_by = 6  # bir sahifada nechta natija
@@ -299,8 +392,7 @@ class SearchResultsView(ListView):
     def get_queryset(self):
         """
         Qidiruv so'rovini oladi va queryset qaytaradi.
-        .distinct() qo'shish duplikatlarni olib tashlash uchun foydali bo'lishi mumkin
-        (masalan, join natijasida takroriy yozuvlar paydo bo'lsa).
+        Qidiruv indeks orqali bajariladi (LIKE skan yo'q), faqat chop etilgan yangiliklar.
         select_related bilan author va category ni oldindan yuklash (N+1 muammosini kamaytirish)
         """
         q = self.request.GET.get("q", "").strip()
@@ -308,23 +400,23 @@ class SearchResultsView(ListView):
             # Hech qidiruv bo'lmasa bo'sh queryset qaytaramiz
             return News.objects.none()
 
-        qs = News.objects.filter(
-            Q(title__icontains=q) |
-            Q(content__icontains=q) |
-            Q(category__name__icontains=q)
-        ).select_related("category", "author").order_by("-published_at").distinct()
+        # Full-Text Search: SQLite FTS5 yoki Postgres tsvector indeksi (news_app/search.py),
+        # natijalar reyting bo'yicha va joriy til hisobga olingan holda tartiblanadi
+        qs = self.search_backend.search(q, language=translation.get_language())
 
-        # Full-Text Search
-        # search_vector = SearchVector("title", "content", "category__name")
-        # search_query = SearchQuery(q)
+        return qs.cards(author=True)
 
-        # qs = (News.objects
-        #       .annotate(search=search_vector, rank=SearchRank(search_vector, search_query))
-        #       .filter(search=search_query)
-        #       .select_related("category", "author")
-        #       .order_by("-rank"))
+    @cached_property
+    def search_backend(self):
+        # Reyting so'rovi ham replikadan (@replica_reads) - faqat id'lar emas
+        return get_search_backend(using=router.db_for_read(News))
 
-        return qs
+    def get_cursor_ordering(self):
+        # Indeksli qidiruv natijalari reyting bo'yicha va MAX_RESULTS bilan cheklangan -
+        # ularga oddiy Paginator yetarli. Cursor faqat sana bo'yicha (simple) qidiruvda.
+        if isinstance(self.search_backend, SimpleSearchBackend):
+            return self.cursor_ordering
+        return None
 
     def get_context_data(self, **kwargs):
         """
@@ -349,6 +441,7 @@ class SearchResultsView(ListView):
 
         params = self.request.GET.copy()
         params.pop("page", None)
+        params.pop("cursor", None)
         context["querystring"] = params.urlencode()
         
         return context
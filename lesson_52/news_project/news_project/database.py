@@ -0,0 +1,113 @@
+"""
+DATABASES sozlamasi .env orqali.
+
+    DB_ENGINE=sqlite      (default) - db.sqlite3, WAL rejimida
+    DB_ENGINE=postgres    - DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+
+SQLite: default "rollback journal" rejimida har bir yozuv (ko'rishlar
+UPDATE'i, sessiya, izoh) butun bazani qulflaydi va o'quvchilar kutadi.
+WAL rejimida o'quvchilar yozuvchini kutmaydi. PRAGMA'lar har yangi ulanishda
+`init_command` orqali bajariladi:
+
+    journal_mode=WAL, synchronous=NORMAL (WAL da xavfsiz, fsync kam),
+    busy_timeout (qulf bo'lsa darhol xato emas, kutish), mmap_size.
+
+transaction_mode=IMMEDIATE - yozuv tranzaksiyasi qulfni boshida oladi,
+shuning uchun busy_timeout ishlaydi ("database is locked" o'rniga kutadi).
+
+Postgres: DB_POOL=True bo'lsa psycopg_pool (pip install "psycopg[binary,pool]"),
+aks holda doimiy ulanishlar (CONN_MAX_AGE + CONN_HEALTH_CHECKS).
+Django pool bilan CONN_MAX_AGE ni birga ishlatishga ruxsat bermaydi.
+
+DB_REPLICAS (vergul bilan: SQLite fayllari yoki Postgres hostlari) - o'qish
+replikalari, ular news_app.routers.ReplicaRouter orqali ishlatiladi.
+"""
+
+
+def sqlite_pragmas(journal_mode='WAL', synchronous='NORMAL', busy_timeout=5000, mmap_size=0, cache_size=None):
+    pragmas = [
+        f'PRAGMA journal_mode={journal_mode}',
+        f'PRAGMA synchronous={synchronous}',
+        f'PRAGMA busy_timeout={busy_timeout}',
+        f'PRAGMA mmap_size={mmap_size}',
+    ]
+    if cache_size is not None:
+        # Manfiy qiymat - KiB da
+        pragmas.append(f'PRAGMA cache_size={cache_size}')
+    return ';'.join(pragmas)
+
+
+def sqlite_database(name, **pragmas):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': {
+            'init_command': sqlite_pragmas(**pragmas),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+
+
+def postgres_database(name, user, password, host, port, conn_max_age=60, pool=False, pool_min=2, pool_max=10):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': name,
+        'USER': user,
+        'PASSWORD': password,
+        'HOST': host,
+        'PORT': port,
+        'CONN_HEALTH_CHECKS': True,
+        'CONN_MAX_AGE': conn_max_age,
+        'OPTIONS': {},
+    }
+    if pool:
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {'min_size': pool_min, 'max_size': pool_max, 'timeout': 10}
+    return database
+
+
+def replica_databases(primary, names, base_dir=None):
+    """
+    Replikalar primary sozlamalarining nusxasi: SQLite uchun boshqa fayl (NAME,
+    nisbiy bo'lsa base_dir ga nisbatan), Postgres uchun boshqa server (HOST).
+    Testlarda ular primary'ni ko'rsatadi.
+    """
+    sqlite = primary['ENGINE'].endswith('sqlite3')
+    key = 'NAME' if sqlite else 'HOST'
+    replicas = {}
+    for index, name in enumerate(names, start=1):
+        if sqlite and base_dir is not None:
+            name = str(base_dir / name)
+        replicas[f'replica{index}'] = {
+            **primary,
+            key: name,
+            'OPTIONS': dict(primary.get('OPTIONS', {})),
+            'TEST': {'MIRROR': 'default'},
+        }
+    return replicas
+
+
+def database_from_env(config, base_dir):
+    engine = config('DB_ENGINE', default='sqlite')
+    if engine == 'sqlite':
+        return sqlite_database(
+            config('DB_NAME', default=str(base_dir / 'db.sqlite3')),
+            journal_mode=config('SQLITE_JOURNAL_MODE', default='WAL'),
+            synchronous=config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+            busy_timeout=config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+            mmap_size=config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+            cache_size=config('SQLITE_CACHE_SIZE', default=-20000, cast=int),
+        )
+    if engine == 'postgres':
+        return postgres_database(
+            config('DB_NAME'),
+            config('DB_USER'),
+            config('DB_PASSWORD', default=''),
+            config('DB_HOST', default='localhost'),
+            config('DB_PORT', default='5432'),
+            conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+            pool=config('DB_POOL', default=False, cast=bool),
+            pool_min=config('DB_POOL_MIN', default=2, cast=int),
+            pool_max=config('DB_POOL_MAX', default=10, cast=int),
+        )
+    raise ValueError(f"DB_ENGINE noto'g'ri: {engine!r} (sqlite yoki postgres)")
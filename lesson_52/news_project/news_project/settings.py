@@ -3,8 +3,11 @@ Django settings for news_project project.
 Optimized for both development and production environments.
 """
 
+import tempfile
 from pathlib import Path
-from decouple import Config, RepositoryEnv
+from decouple import Config, Csv, RepositoryEnv
+
+from news_project.database import database_from_env, replica_databases
 
 # === BASE DIRECTORY ===
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,12 +53,16 @@ MIDDLEWARE = [
     # Whitenoise staticlarni xizmat qiladi (DEBUG=False bo‘lsa ham)
     "whitenoise.middleware.WhiteNoiseMiddleware",
 
+    # Qobiq sahifalarga ochiq kesh sarlavhalari (Session va Messages dan keyin ishlaydi)
+    "news_app.page_shell.PageShellMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    # Ochiq sahifalar o'qishlarini replikaga yo'naltiradi (DB_REPLICAS bo'lsa)
+    "news_app.routers.ReplicaMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -89,12 +96,111 @@ WSGI_APPLICATION = "news_project.wsgi.application"
 
 
 # === DATABASE ===
+# DB_ENGINE=sqlite (WAL rejimida) yoki postgres - batafsil: news_project/database.py
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_from_env(config, BASE_DIR),
 }
+# O'qish replikalari: ochiq sahifalar o'qishlari replikadan, yozuvlar primary'ga
+DATABASES.update(replica_databases(DATABASES["default"], config('DB_REPLICAS', default='', cast=Csv()), BASE_DIR))
+DATABASE_ROUTERS = ["news_app.routers.ReplicaRouter"] if len(DATABASES) > 1 else []
+# POST dan keyin shuncha soniya o'qishlar ham primary'dan (read-your-writes)
+NEWS_REPLICA_STICKY_SECONDS = config('NEWS_REPLICA_STICKY_SECONDS', default=15, cast=int)
+
+
+# === CACHE ===
+# Redis shart emas: default LocMem (bitta process), bir nechta worker
+# bo'lsa CACHE_BACKEND=file qilib fayl asosidagi keshdan foydalaning.
+# Kesh versiyalari (kontent, ommabop) keshda emas, bazada (CacheVersion) -
+# translation_worker, cron va buyruqlardagi o'zgarishlar ham web processlarga yetadi
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": config('CACHE_LOCATION', default=str(Path(tempfile.gettempdir()) / 'news_project_cache')),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "news-project",
+        }
+    }
+
+# Sahifa keshi kontent versiyasi bilan tozalanadi, TTL faqat zaxira uchun
+NEWS_PAGE_CACHE_TIMEOUT = config('NEWS_PAGE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+# Har bir process kesh versiyasini bazadan necha soniyada bir marta tekshiradi
+NEWS_VERSION_CHECK_INTERVAL = config('NEWS_VERSION_CHECK_INTERVAL', default=2, cast=float)
+# base.html dagi kategoriyalar va so'nggi yangiliklar keshi (ham versiya bilan tozalanadi)
+NEWS_CONTEXT_CACHE_TIMEOUT = config('NEWS_CONTEXT_CACHE_TIMEOUT', default=60 * 10, cast=int)
+
+# Ko'rishlar buferi necha soniyada bazaga yoziladi
+NEWS_VIEW_FLUSH_INTERVAL = config('NEWS_VIEW_FLUSH_INTERVAL', default=10, cast=int)
+# Bir foydalanuvchining takroriy ko'rishi qancha vaqt hisobga olinmaydi
+NEWS_VIEW_DEDUP_TIMEOUT = config('NEWS_VIEW_DEDUP_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+
+# === SESSIONS ===
+# Anonim o'quvchilar sessiya yaratmaydi (ko'rishlar news_seen cookie'sida).
+# cached_db - kirgan foydalanuvchilar sessiyasi keshdan o'qiladi, bazaga faqat
+# o'zgarganda yoziladi; signed_cookies - bazasiz (lekin logout eski cookie'ni
+# bekor qilmaydi); cache - faqat umumiy kesh (CACHE_BACKEND=file) bilan.
+SESSION_ENGINE = "django.contrib.sessions.backends." + config('SESSION_BACKEND', default='cached_db')
+
+
+# === POPULAR NEWS ===
+# Ball necha soatda ikki marta kamayadi va necha soatlik tarix hisobga olinadi
+NEWS_POPULAR_HALF_LIFE_HOURS = config('NEWS_POPULAR_HALF_LIFE_HOURS', default=24, cast=float)
+NEWS_POPULAR_WINDOW_HOURS = config('NEWS_POPULAR_WINDOW_HOURS', default=24 * 7, cast=int)
+# PopularNews jadvali necha soniyada qayta hisoblanadi (rebuild_popular cron oralig'i)
+# va ommabop ro'yxat keshining muddati
+NEWS_POPULAR_REFRESH_INTERVAL = config('NEWS_POPULAR_REFRESH_INTERVAL', default=60 * 15, cast=int)
+
+
+# === COMMENTS ===
+# Cheklov: (izohlar soni, necha soniyada) - foydalanuvchi va IP bo'yicha
+NEWS_COMMENT_USER_RATE = (config('NEWS_COMMENT_USER_BURST', default=5, cast=int), 60)
+NEWS_COMMENT_IP_RATE = (config('NEWS_COMMENT_IP_BURST', default=20, cast=int), 60)
+# Moderatsiya navbati (PendingComment) necha soniyada Comment ga ko'chiriladi;
+# 0 - web processlarda fon oqimi yo'q, `manage.py flush_comments --loop` ishlating
+NEWS_COMMENT_FLUSH_INTERVAL = config('NEWS_COMMENT_FLUSH_INTERVAL', default=2, cast=float)
+
+# === IMAGES ===
+# Rasm nusxalari (srcset) fonda yaratilsinmi; False - tranzaksiyadan keyin shu so'rovda
+NEWS_IMAGE_ASYNC = config('NEWS_IMAGE_ASYNC', default=True, cast=bool)
+# /media/thumb/<w>x<h>/... uchun ruxsat etilgan o'lchamlar (h=0 - nisbat saqlanadi)
+NEWS_THUMB_SIZES = ('100x80', '200x160', '320x0', '640x0', '1024x0')
+NEWS_THUMB_CACHE_MAX_BYTES = config('NEWS_THUMB_CACHE_MAX_MB', default=512, cast=int) * 1024 * 1024
+NEWS_THUMB_MAX_AGE = 60 * 60 * 24 * 30
+
+# === STATIC SNAPSHOTS ===
+# Anonimlar uchun oldindan render qilingan sahifalar papkasi (bo'sh - o'chirilgan),
+# Nginx sozlamasi: news_app/snapshots.py
+NEWS_SNAPSHOT_ROOT = config('NEWS_SNAPSHOT_ROOT', default='')
+
+# === EDGE CACHE ===
+# Ochiq sahifalar foydalanuvchidan mustaqil "qobiq" bo'lib render qilinadi va
+# reverse proxy keshlay oladi (Nginx sozlamasi: news_app/page_shell.py)
+NEWS_PAGE_SHELL = config('NEWS_PAGE_SHELL', default=True, cast=bool)
+# Proxy keshida saqlash muddati (s-maxage), soniya
+NEWS_SHELL_S_MAXAGE = config('NEWS_SHELL_S_MAXAGE', default=60, cast=int)
+
+# === SEARCH ===
+# auto - baza turiga qarab (SQLite FTS5 / Postgres tsvector), simple - eski icontains
+NEWS_SEARCH_BACKEND = config('NEWS_SEARCH_BACKEND', default='auto')
+
+
+# === TRANSLATION ===
+# Tarjima backendi (lokal/test uchun: news_app.translators.FakeTranslator)
+NEWS_TRANSLATOR = config('NEWS_TRANSLATOR', default='news_app.translators.GoogleTranslatorBackend')
+NEWS_TRANSLATION_MAX_ATTEMPTS = config('NEWS_TRANSLATION_MAX_ATTEMPTS', default=5, cast=int)
+# Takroriy gaplar tarjima xotirasidan olinadi (TranslationMemory)
+NEWS_TRANSLATION_MEMORY = config('NEWS_TRANSLATION_MEMORY', default=True, cast=bool)
+# Buyruqlarning ish fayllari (masalan translate_backfill checkpointi) - manba
+# kodidan tashqarida saqlash uchun NEWS_DATA_DIR=/var/lib/news qo'ying
+NEWS_DATA_DIR = Path(config('NEWS_DATA_DIR', default=str(BASE_DIR / 'var')))
 
 
 # === PASSWORD VALIDATION ===
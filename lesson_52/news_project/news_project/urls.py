@@ -21,9 +21,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls import handler404
 from django.conf.urls.i18n import i18n_patterns
+from news_app.thumbnails import thumbnail
 
 urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
+    # Talab bo'yicha kichraytirilgan rasmlar (static() dagi /media/ dan oldin turishi kerak)
+    path(f"{settings.MEDIA_URL.lstrip('/')}thumb/<int:width>x<int:height>/<path:path>", thumbnail, name='thumbnail'),
 ]
 
 urlpatterns += i18n_patterns(